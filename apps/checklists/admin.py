@@ -1,5 +1,7 @@
 from django.contrib import admin
 from django.utils.html import format_html
+from apps.core.admin import AutocompleteFilter, AutocompleteFilterMixin, ImportAdminMixin
+from .importers import ChecklistImporter
 from .models import Checklist, ChecklistItem
 
 
@@ -20,7 +22,7 @@ class ChecklistItemInline(admin.TabularInline):
 # ============================================================
 
 @admin.register(Checklist)
-class ChecklistAdmin(admin.ModelAdmin):
+class ChecklistAdmin(ImportAdminMixin, admin.ModelAdmin):
 
     list_display = ("name", "description_short", "created_at")
     search_fields = ("name", "description")
@@ -29,6 +31,9 @@ class ChecklistAdmin(admin.ModelAdmin):
 
     inlines = [ChecklistItemInline]
 
+    # Bulk onboarding: "Import from file" on the changelist
+    importer_class = ChecklistImporter
+
     readonly_fields = ("created_at",)
 
     fieldsets = (
@@ -57,10 +62,11 @@ class ChecklistAdmin(admin.ModelAdmin):
 # ============================================================
 
 @admin.register(ChecklistItem)
-class ChecklistItemAdmin(admin.ModelAdmin):
+class ChecklistItemAdmin(AutocompleteFilterMixin, admin.ModelAdmin):
 
     list_display = ("checklist", "order", "text")
-    list_filter = ("checklist",)
+    list_select_related = ("checklist",)
+    list_filter = (("checklist", AutocompleteFilter),)
     search_fields = ("text", "checklist__name")
     ordering = ("checklist__name", "order")
     autocomplete_fields = ("checklist",)
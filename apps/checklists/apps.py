@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class ChecklistsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.checklists'
+
+    def ready(self):
+        import apps.checklists.signals  # noqa
@@ -0,0 +1,44 @@
+import functools
+
+from django.core.cache import cache
+
+from .models import ChecklistVersion
+
+
+# ============================================================
+#   COMPILED CHECKLIST VERSIONS
+# ============================================================
+#
+# A ChecklistVersion is keyed by the hash of its content and never changes,
+# so its compiled form is cached without invalidation: per process
+# (lru_cache) in front of the shared cache in front of one SELECT. Editing
+# a checklist produces a new hash, never a stale entry.
+
+PREFIX = "checklist-version"
+
+
+class CompiledChecklist:
+    """A version's items in checklist order, plus a text lookup by item id."""
+
+    __slots__ = ("content_hash", "items", "texts")
+
+    def __init__(self, content_hash, items):
+        self.content_hash = content_hash
+        self.items = tuple((item_id, order, text) for item_id, order, text in items)
+        self.texts = {item_id: text for item_id, _, text in self.items}
+
+    @property
+    def item_ids(self):
+        return [item_id for item_id, _, _ in self.items]
+
+
+@functools.lru_cache(maxsize=256)
+def compiled(content_hash):
+    key = f"{PREFIX}:{content_hash}"
+
+    items = cache.get(key)
+    if items is None:
+        items = ChecklistVersion.objects.values_list("items", flat=True).get(pk=content_hash)
+        cache.set(key, items, timeout=None)
+
+    return CompiledChecklist(content_hash, items)
@@ -0,0 +1,137 @@
+from django.core.exceptions import ValidationError
+
+from apps.core.imports import Importer
+from apps.search import index as search_index
+from .models import Checklist, ChecklistItem
+
+
+TEXT_MAX_LENGTH = ChecklistItem._meta.get_field("text").max_length
+NAME_MAX_LENGTH = Checklist._meta.get_field("name").max_length
+
+
+class ChecklistImporter(Importer):
+    """Upsert checklists and their items.
+
+    CSV: one row per item with columns checklist, description, order, text.
+    JSON: ``{"name", "description", "items": [{"order", "text"} | "text"]}``.
+    Checklists are matched by name and items by (checklist, order); an item
+    without an order goes after the previous one of its checklist.
+    """
+
+    label = "checklist items"
+
+    def __init__(self, dry_run=False):
+        super().__init__(dry_run)
+        self.last_order = {}
+        self.checklists = {}   # name -> Checklist, across batches
+
+    def clean(self, line, record):
+        if "items" in record:
+            name = record.get("name")
+            entries = record["items"] if isinstance(record["items"], list) else None
+            if entries is None:
+                raise ValidationError("items: expected a list.")
+        else:
+            name = record.get("checklist")
+            entries = [record]
+
+        name = str(name or "").strip()
+        if not name:
+            raise ValidationError("checklist: this field is required.")
+        if len(name) > NAME_MAX_LENGTH:
+            raise ValidationError(f"checklist: longer than {NAME_MAX_LENGTH} characters.")
+        description = str(record.get("description") or "").strip() or None
+
+        rows = []
+        for entry in entries:
+            if not isinstance(entry, dict):
+                entry = {"text": entry}
+
+            text = str(entry.get("text") or "").strip()
+            if not text:
+                raise ValidationError("text: this field is required.")
+            if len(text) > TEXT_MAX_LENGTH:
+                raise ValidationError(f"text: longer than {TEXT_MAX_LENGTH} characters.")
+
+            order = entry.get("order")
+            if order in (None, ""):
+                order = self.last_order.get(name, 0) + 1
+            else:
+                try:
+                    order = int(order)
+                except (TypeError, ValueError):
+                    raise ValidationError(f"order: '{order}' is not a whole number.")
+                if order < 0:
+                    raise ValidationError("order: must not be negative.")
+            self.last_order[name] = order
+
+            rows.append({
+                "line": line,
+                "checklist": name,
+                "description": description,
+                "order": order,
+                "text": text,
+            })
+        return rows
+
+    def resolve(self, rows):
+        # A later row for the same checklist position replaces an earlier one
+        return list({(row["checklist"], row["order"]): row for row in rows}.values())
+
+    def load_checklists(self, rows):
+        names = {row["checklist"] for row in rows} - set(self.checklists)
+        for checklist in Checklist.objects.filter(name__in=names).order_by("-pk"):
+            self.checklists[checklist.name] = checklist   # oldest wins on duplicates
+
+        descriptions = {row["checklist"]: row["description"] for row in rows}
+        created = [
+            Checklist(name=name, description=descriptions[name])
+            for name in names if name not in self.checklists
+        ]
+        Checklist.objects.bulk_create(created)
+        self.checklists.update((checklist.name, checklist) for checklist in created)
+
+        changed = []
+        for name, description in descriptions.items():
+            checklist = self.checklists[name]
+            if description and checklist.description != description:
+                checklist.description = description
+                changed.append(checklist)
+        Checklist.objects.bulk_update(changed, ["description"])
+
+    def save_batch(self, rows):
+        self.load_checklists(rows)
+
+        existing = {
+            (item.checklist_id, item.order): item
+            for item in ChecklistItem.objects.filter(
+                checklist__in=[self.checklists[row["checklist"]] for row in rows],
+                order__in={row["order"] for row in rows},
+            )
+        }
+
+        created, updated = [], []
+        for row in rows:
+            checklist = self.checklists[row["checklist"]]
+            item = existing.get((checklist.pk, row["order"]))
+            if item is None:
+                created.append(ChecklistItem(checklist=checklist, order=row["order"], text=row["text"]))
+            elif item.text != row["text"]:
+                item.text = row["text"]
+                updated.append(item)
+
+        ChecklistItem.objects.bulk_create(created)
+        ChecklistItem.objects.bulk_update(updated, ["text"])
+        self.report.created += len(created)
+        self.report.updated += len(updated)
+
+    def finish(self):
+        # Bulk writes skip the item signals: the next inspection of each
+        # checklist snapshots its new content, and the items are re-indexed
+        checklists = Checklist.objects.filter(
+            pk__in=[checklist.pk for checklist in self.checklists.values()]
+        )
+        checklists.update(current_version=None)
+        search_index.index_checklist_items(
+            ChecklistItem.objects.filter(checklist__in=checklists).values_list("pk", flat=True)
+        )
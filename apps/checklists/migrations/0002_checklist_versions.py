@@ -0,0 +1,33 @@
+# Generated by Django 5.2.8 on 2026-10-18 12:16
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('checklists', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChecklistVersion',
+            fields=[
+                ('content_hash', models.CharField(editable=False, max_length=64, primary_key=True, serialize=False)),
+                ('items', models.JSONField(editable=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('checklist', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='versions', to='checklists.checklist')),
+            ],
+            options={
+                'verbose_name': 'Checklist Version',
+                'verbose_name_plural': 'Checklist Versions',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddField(
+            model_name='checklist',
+            name='current_version',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='checklists.checklistversion'),
+        ),
+    ]
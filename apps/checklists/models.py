@@ -1,10 +1,34 @@
-from django.db import models
+import hashlib
+import json
+
+from django.db import models, transaction
+
+
+def version_hash(checklist_id, items):
+    """SHA-256 of a checklist's ordered ``(item_id, order, text)`` rows."""
+    content = json.dumps(
+        {"checklist": checklist_id, "items": [list(item) for item in items]},
+        separators=(",", ":"), ensure_ascii=False,
+    )
+    return hashlib.sha256(content.encode()).hexdigest()
+
 
 class Checklist(models.Model):
     name = models.CharField(max_length=255)
     description = models.TextField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    # Version matching the current items; cleared whenever an item changes
+    # and set again by ChecklistVersion.objects.current()
+    current_version = models.ForeignKey(
+        "ChecklistVersion",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name="+",
+    )
+
     class Meta:
         verbose_name = "Checklist"
         verbose_name_plural = "Checklists"
@@ -12,6 +36,16 @@ class Checklist(models.Model):
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        # current_version is only moved by queryset updates; a full save of
+        # an instance loaded before an item edit must not write it back
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            kwargs["update_fields"] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != "current_version"
+            ]
+        super().save(*args, **kwargs)
+
 
 class ChecklistItem(models.Model):
     checklist = models.ForeignKey(Checklist, on_delete=models.CASCADE, related_name="items")
@@ -24,4 +58,76 @@ class ChecklistItem(models.Model):
         verbose_name_plural = "Checklist Items"
 
     def __str__(self):
-        return f"{self.checklist.name}: {self.text}"
\ No newline at end of file
+        return f"{self.checklist.name}: {self.text}"
+
+
+class ChecklistVersionManager(models.Manager):
+    def current(self, checklist_id):
+        """Content hash of the checklist's current version.
+
+        Returns the checklist's current_version when it is set; otherwise
+        reads the items once, hashes them and points the checklist at the
+        matching version, creating it if this content is new.
+        """
+        checklists = Checklist.objects.filter(pk=checklist_id)
+        current = checklists.values_list("current_version_id", flat=True).first()
+        if current:
+            return current
+
+        with transaction.atomic():
+            # The row lock keeps an item edit from landing between reading
+            # the items and pointing the checklist at them
+            current = (
+                checklists.select_for_update()
+                .values_list("current_version_id", flat=True)
+                .first()
+            )
+            if current:
+                return current
+
+            items = list(
+                ChecklistItem.objects.filter(checklist_id=checklist_id)
+                .order_by("order", "pk")
+                .values_list("pk", "order", "text")
+            )
+            content_hash = version_hash(checklist_id, items)
+            self.get_or_create(
+                content_hash=content_hash,
+                defaults={"checklist_id": checklist_id, "items": items},
+            )
+            checklists.update(current_version_id=content_hash)
+            return content_hash
+
+
+class ChecklistVersion(models.Model):
+    """An immutable snapshot of a checklist's items, keyed by their hash.
+
+    ``items`` holds ``[item_id, order, text]`` rows in checklist order.
+    Inspections pin the version they were created from, so later edits to
+    the checklist don't change what past inspections show.
+    """
+
+    content_hash = models.CharField(max_length=64, primary_key=True, editable=False)
+    checklist = models.ForeignKey(
+        Checklist,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name="versions",
+    )
+    items = models.JSONField(editable=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = ChecklistVersionManager()
+
+    class Meta:
+        ordering = ["-created_at"]
+        verbose_name = "Checklist Version"
+        verbose_name_plural = "Checklist Versions"
+
+    def __str__(self):
+        return f"{self.checklist or 'Deleted checklist'} @ {self.content_hash[:12]}"
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise ValueError("Checklist versions are immutable.")
+        super().save(*args, **kwargs)
@@ -0,0 +1,12 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from .models import Checklist, ChecklistItem
+
+
+@receiver([post_save, post_delete], sender=ChecklistItem)
+def clear_current_version(sender, instance, **kwargs):
+    # The next inspection snapshots the edited items. Bulk paths (the
+    # importer) clear current_version themselves.
+    Checklist.objects.filter(pk=instance.checklist_id).exclude(
+        current_version=None
+    ).update(current_version=None)
@@ -1,3 +1,107 @@
+import json
+from io import BytesIO
+
+from django.core.cache import cache
 from django.test import TestCase
 
-# Create your tests here.
+from . import cache as checklist_cache
+from .importers import ChecklistImporter
+from .models import Checklist, ChecklistItem, ChecklistVersion
+
+
+class ChecklistImportTests(TestCase):
+
+    def run_import(self, data, fmt="json"):
+        content = json.dumps(data).encode() if fmt == "json" else data
+        return ChecklistImporter().run(BytesIO(content), fmt)
+
+    def test_json_checklists_with_items(self):
+        report = self.run_import([
+            {"name": "Kitchen", "description": "Daily", "items": ["Sink", "Fridge", {"order": 10, "text": "Oven"}]},
+        ])
+
+        self.assertEqual(report.created, 3)
+        checklist = Checklist.objects.get(name="Kitchen")
+        self.assertEqual(
+            list(checklist.items.values_list("order", "text")),
+            [(1, "Sink"), (2, "Fridge"), (10, "Oven")],
+        )
+
+    def test_csv_upserts_by_checklist_and_order(self):
+        self.run_import(b"checklist,order,text\nKitchen,1,Sink\nKitchen,2,Fridge\n", "csv")
+        report = self.run_import(b"checklist,order,text\nKitchen,2,Freezer\nKitchen,3,Oven\nKitchen,x,Bad\n", "csv")
+
+        self.assertEqual((report.created, report.updated), (1, 1))
+        self.assertEqual(report.errors, [(4, "order: 'x' is not a whole number.")])
+        self.assertEqual(Checklist.objects.count(), 1)
+        self.assertEqual(
+            list(ChecklistItem.objects.values_list("order", "text")),
+            [(1, "Sink"), (2, "Freezer"), (3, "Oven")],
+        )
+
+
+class ChecklistVersionTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.checklist = Checklist.objects.create(name="Kitchen")
+        cls.sink = ChecklistItem.objects.create(checklist=cls.checklist, text="Sink", order=1)
+        ChecklistItem.objects.create(checklist=cls.checklist, text="Fridge", order=2)
+
+    def setUp(self):
+        cache.clear()
+        checklist_cache.compiled.cache_clear()
+
+    def test_current_version_is_created_once_and_reused(self):
+        first = ChecklistVersion.objects.current(self.checklist.pk)
+        with self.assertNumQueries(1):   # current_version is set: no item read
+            self.assertEqual(ChecklistVersion.objects.current(self.checklist.pk), first)
+
+        version = ChecklistVersion.objects.get()
+        self.assertEqual(version.items, [[self.sink.pk, 1, "Sink"], [self.sink.pk + 1, 2, "Fridge"]])
+        with self.assertRaises(ValueError):
+            version.save()
+
+    def test_item_edit_makes_a_new_version_and_revert_reuses_the_old(self):
+        first = ChecklistVersion.objects.current(self.checklist.pk)
+
+        self.sink.text = "Hand sink"
+        self.sink.save()
+        second = ChecklistVersion.objects.current(self.checklist.pk)
+        self.assertNotEqual(second, first)
+
+        self.sink.text = "Sink"
+        self.sink.save()
+        self.assertEqual(ChecklistVersion.objects.current(self.checklist.pk), first)
+        self.assertEqual(ChecklistVersion.objects.count(), 2)
+
+    def test_full_save_keeps_current_version(self):
+        checklist = Checklist.objects.get(pk=self.checklist.pk)   # loaded before versioning
+        version = ChecklistVersion.objects.current(self.checklist.pk)
+
+        checklist.description = "Daily"
+        checklist.save()
+
+        checklist.refresh_from_db()
+        self.assertEqual(checklist.current_version_id, version)
+
+    def test_compiled_version_is_read_once(self):
+        version = ChecklistVersion.objects.current(self.checklist.pk)
+
+        with self.assertNumQueries(1):
+            compiled = checklist_cache.compiled(version)
+            checklist_cache.compiled(version)
+        self.assertEqual(compiled.texts[self.sink.pk], "Sink")
+
+        # Another process: empty local cache, warm shared cache
+        checklist_cache.compiled.cache_clear()
+        with self.assertNumQueries(0):
+            checklist_cache.compiled(version)
+
+    def test_import_clears_current_version(self):
+        ChecklistVersion.objects.current(self.checklist.pk)
+
+        ChecklistImporter().run(BytesIO(b"checklist,order,text\nKitchen,1,Basin\n"), "csv")
+
+        self.checklist.refresh_from_db()
+        self.assertIsNone(self.checklist.current_version_id)
@@ -1,3 +1,123 @@
-from django.contrib import admin
+from django import forms
+from django.contrib import admin, messages
+from django.contrib.admin.widgets import AutocompleteSelect
+from django.core.exceptions import PermissionDenied
+from django.template.response import TemplateResponse
+from django.urls import path
 
-# Register your models here.
+from .imports import detect_format
+
+
+# ============================================================
+#   IMPORT FROM FILE (changelist tool)
+# ============================================================
+
+class ImportForm(forms.Form):
+    file = forms.FileField(help_text="CSV or JSON")
+    dry_run = forms.BooleanField(
+        required=False, help_text="Only validate the file; nothing is saved."
+    )
+
+    def clean_file(self):
+        upload = self.cleaned_data["file"]
+        try:
+            self.cleaned_data["format"] = detect_format(upload.name)
+        except ValueError as e:
+            raise forms.ValidationError(str(e))
+        return upload
+
+
+class ImportAdminMixin:
+    """Adds an "Import" button to the changelist that runs ``importer_class``."""
+
+    importer_class = None
+    change_list_template = "admin/import_change_list.html"
+
+    def get_urls(self):
+        opts = self.model._meta
+        return [
+            path(
+                "import/",
+                self.admin_site.admin_view(self.import_view),
+                name=f"{opts.app_label}_{opts.model_name}_import",
+            ),
+        ] + super().get_urls()
+
+    def import_view(self, request):
+        if not self.has_add_permission(request):
+            raise PermissionDenied
+
+        report = None
+        form = ImportForm(request.POST or None, request.FILES or None)
+        if request.method == "POST" and form.is_valid():
+            importer = self.importer_class(dry_run=form.cleaned_data["dry_run"])
+            report = importer.run(form.cleaned_data["file"], form.cleaned_data["format"])
+
+            prefix = "Dry run: " if importer.dry_run else ""
+            level = messages.SUCCESS if report.ok else messages.WARNING
+            self.message_user(request, f"{prefix}{importer.label}: {report.summary()}", level)
+
+        return TemplateResponse(request, "admin/import_form.html", {
+            **self.admin_site.each_context(request),
+            "opts": self.model._meta,
+            "title": f"Import {self.model._meta.verbose_name_plural}",
+            "form": form,
+            "report": report,
+            "help": self.importer_class.__doc__,
+        })
+
+
+# ============================================================
+#   AUTOCOMPLETE LIST FILTER
+# ============================================================
+
+class AutocompleteFilter(admin.RelatedFieldListFilter):
+    """Related-field filter picked from an autocomplete box.
+
+    The stock filter loads every related row into the sidebar; this one only
+    asks the admin autocomplete view as the user types. Use it as
+    ``("school", AutocompleteFilter)`` in list_filter; the related model's
+    admin needs search_fields, and this admin AutocompleteFilterMixin.
+    """
+
+    template = "admin/autocomplete_filter.html"
+
+    def __init__(self, field, request, params, model, model_admin, field_path):
+        self.admin_site = model_admin.admin_site
+        super().__init__(field, request, params, model, model_admin, field_path)
+
+    def field_choices(self, field, request, model_admin):
+        # Nothing up front; the selected row is fetched by the widget
+        return []
+
+    def has_output(self):
+        return True
+
+    def choices(self, changelist):
+        self.base_query_string = changelist.get_query_string(
+            remove=[self.lookup_kwarg, self.lookup_kwarg_isnull]
+        )
+        return super().choices(changelist)
+
+    def widget(self):
+        """The autocomplete <select>, showing the current value."""
+        form_field = self.field.formfield(
+            widget=AutocompleteSelect(self.field, self.admin_site), required=False
+        )
+        return form_field.widget.render(self.lookup_kwarg, self.lookup_val, attrs={
+            "id": f"autocomplete_filter_{self.field_path}",
+            "style": "width: 100%",
+            "data-filter-url": self.base_query_string,
+        })
+
+
+class AutocompleteFilterMixin:
+    """Loads the autocomplete assets on the changelist for AutocompleteFilter."""
+
+    @property
+    def media(self):
+        return (
+            super().media
+            + AutocompleteSelect(None, self.admin_site).media
+            + forms.Media(js=["admin/js/jquery.init.js", "js/autocomplete_filter.js"])
+        )
@@ -0,0 +1,141 @@
+import csv
+import io
+import json
+from itertools import islice
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+
+# ============================================================
+#   BULK IMPORT
+# ============================================================
+#
+# An Importer runs in two passes:
+#
+#   1. validate: read the file record by record, clean each one and keep
+#      only the normalized rows; bad records go into the report with their
+#      line number and are skipped.
+#   2. write: inside one transaction, upsert the rows in batches with
+#      bulk_create / bulk_update and bulk-insert M2M through rows.
+#
+# Subclasses implement clean() and save_batch() (and optionally resolve()).
+
+FORMATS = ("csv", "json")
+
+
+class ImportReport:
+    def __init__(self):
+        self.created = 0
+        self.updated = 0
+        self.linked = 0
+        self.errors = []    # [(line, message)]
+
+    def error(self, line, message):
+        self.errors.append((line, message))
+
+    @property
+    def ok(self):
+        return not self.errors
+
+    def summary(self):
+        parts = [f"{self.created} created", f"{self.updated} updated"]
+        if self.linked:
+            parts.append(f"{self.linked} links written")
+        parts.append(f"{len(self.errors)} error(s)")
+        return ", ".join(parts)
+
+
+def detect_format(filename):
+    extension = filename.rsplit(".", 1)[-1].lower()
+    if extension not in FORMATS:
+        raise ValueError(f"Unsupported file type '.{extension}' (use .csv or .json).")
+    return extension
+
+
+def read_records(fh, fmt):
+    """Yield ``(line, record)`` pairs from a binary or text file.
+
+    CSV is read row by row; JSON must be a list of objects (the line is its
+    1-based position in the list).
+    """
+    if isinstance(fh.read(0), bytes):
+        fh = io.TextIOWrapper(fh, encoding="utf-8-sig", newline="")
+
+    if fmt == "csv":
+        reader = csv.DictReader(fh)
+        for record in reader:
+            yield reader.line_num, {
+                key.strip(): (value or "").strip()
+                for key, value in record.items() if key
+            }
+        return
+
+    data = json.load(fh)
+    if not isinstance(data, list):
+        raise ValueError("JSON imports must be a list of objects.")
+    for n, record in enumerate(data, start=1):
+        yield n, record
+
+
+def split_list(value, separator=";"):
+    """A CSV cell ("a; b") or JSON list as a list of non-empty strings."""
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.split(separator)
+    return [str(v).strip() for v in value if str(v).strip()]
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+class Importer:
+    batch_size = 1000
+    label = "rows"
+
+    def __init__(self, dry_run=False):
+        self.dry_run = dry_run
+        self.report = ImportReport()
+
+    def clean(self, line, record):
+        """Return a list of normalized rows for ``record``; raise ValidationError."""
+        raise NotImplementedError
+
+    def resolve(self, rows):
+        """Cross-row validation and lookups after the read pass."""
+        return rows
+
+    def save_batch(self, rows):
+        raise NotImplementedError
+
+    def finish(self):
+        """Called once after every batch is written (same transaction)."""
+
+    def run(self, fh, fmt):
+        rows = []
+        try:
+            for line, record in read_records(fh, fmt):
+                if not isinstance(record, dict):
+                    self.report.error(line, "Expected an object.")
+                    continue
+                try:
+                    rows.extend(self.clean(line, record))
+                except ValidationError as e:
+                    self.report.error(line, "; ".join(e.messages))
+        except (ValueError, csv.Error, UnicodeDecodeError) as e:
+            self.report.error(0, f"Could not read file: {e}")
+            return self.report
+
+        rows = self.resolve(rows)
+
+        if not self.dry_run and rows:
+            with transaction.atomic():
+                for batch in batched(rows, self.batch_size):
+                    self.save_batch(batch)
+                self.finish()
+
+        return self.report
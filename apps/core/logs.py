@@ -0,0 +1,145 @@
+import copy
+import datetime
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
+
+
+# ============================================================
+#   JSON FORMATTER
+# ============================================================
+
+# Attributes every LogRecord has; anything else came in through ``extra``
+_RESERVED = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per line, keeping ``extra`` fields (url, user, ...)."""
+
+    def format(self, record):
+        data = {
+            "time": datetime.datetime.fromtimestamp(record.created, datetime.timezone.utc)
+                    .isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        data.update(
+            (key, value) for key, value in vars(record).items()
+            if key not in _RESERVED and not key.startswith("_")
+        )
+
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            data["exception"] = record.exc_text
+
+        return json.dumps(data, default=str)
+
+
+# ============================================================
+#   RATE LIMIT
+# ============================================================
+
+class RateLimitFilter(logging.Filter):
+    """Pass at most ``rate`` records per ``period`` seconds for each logger.
+
+    Dropped records are counted; the next record let through from that
+    logger carries the count as ``suppressed``.
+    """
+
+    def __init__(self, rate=50, period=10.0):
+        super().__init__()
+        self.rate = rate
+        self.period = period
+        self.windows = {}   # logger name -> [window start, passed, dropped]
+        self.lock = threading.Lock()
+
+    def filter(self, record):
+        now = time.monotonic()
+        with self.lock:
+            window = self.windows.get(record.name)
+            if window is None or now - window[0] >= self.period:
+                dropped = window[2] if window else 0
+                window = self.windows[record.name] = [now, 0, dropped]
+
+            if window[1] >= self.rate:
+                window[2] += 1
+                return False
+
+            window[1] += 1
+            if window[2]:
+                record.suppressed = window[2]
+                window[2] = 0
+        return True
+
+
+# ============================================================
+#   QUEUE HANDLER
+# ============================================================
+
+def _handler_by_name(name):
+    lookup = getattr(logging, "getHandlerByName", None)   # Python 3.12+
+    return lookup(name) if lookup else logging._handlers.get(name)
+
+
+class QueueListenerHandler(QueueHandler):
+    """Put records on a bounded queue; a background thread writes them.
+
+    ``handlers`` are names of other handlers in the LOGGING config. The
+    listener thread starts on the first record (so it lives in the worker
+    process, not a pre-fork parent). When the queue is full, records are
+    dropped rather than blocking the request thread.
+    """
+
+    def __init__(self, handlers, maxsize=10000):
+        super().__init__(queue.Queue(maxsize))
+        self.target_names = handlers
+        self.listener = None
+        self.pid = None
+        self.dropped = 0
+        self.start_lock = threading.Lock()
+
+    def start(self):
+        with self.start_lock:
+            if self.listener is not None and self.pid == os.getpid():
+                return
+            targets = [_handler_by_name(name) for name in self.target_names]
+            self.listener = QueueListener(
+                self.queue, *filter(None, targets), respect_handler_level=True
+            )
+            self.listener.start()
+            self.pid = os.getpid()
+
+    def prepare(self, record):
+        # Unlike QueueHandler.prepare, don't fold the traceback into the
+        # message: the target formatters decide how to render it.
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg, record.args = record.message, None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def emit(self, record):
+        if self.listener is None or self.pid != os.getpid():
+            self.start()
+        super().emit(record)
+
+    def close(self):
+        # Drain what's queued before the target handlers are closed
+        if self.listener is not None and self.pid == os.getpid():
+            self.listener.stop()
+            self.listener = None
+        super().close()
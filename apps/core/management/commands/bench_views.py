@@ -0,0 +1,275 @@
+import datetime
+import json
+import logging
+import math
+import time
+from importlib import import_module
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import (
+    CaptureQueriesContext, setup_test_environment, teardown_test_environment,
+)
+from django.urls import reverse
+
+from apps.checklists.models import Checklist, ChecklistItem
+from apps.inspections.models import CorrectiveAction, Inspection
+from apps.schools.models import School
+from apps.users.models import AppUser
+
+
+# URLconfs whose every route is benchmarked
+URL_MODULES = ("apps.inspections.urls", "apps.users.urls", "apps.schools.urls")
+
+# Which sample object fills each route's path argument
+ROUTE_OBJECTS = {
+    "inspection_detail": "inspection",
+    "inspection_perform": "inspection",
+    "corrective_action_list_by_inspection": "inspection",
+    "corrective_action_detail": "action",
+    "corrective_action_assign": "action",
+    "reinspect_action": "action",
+    "school_detail": "school",
+    "inspection_export": "export",
+}
+
+ROLES = (
+    AppUser.Role.ADMIN,
+    AppUser.Role.MANAGER,
+    AppUser.Role.INSPECTOR,
+    AppUser.Role.KITCHEN,
+)
+
+
+def percentile(values, p):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a dataset, log in as each role and GET every inspections/users/"
+        "schools URL through the test client, reporting p50/p95/p99 latency, "
+        "SQL query count and bytes rendered. Everything runs in a transaction "
+        "that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--schools", type=int, default=5)
+        parser.add_argument("--inspections", type=int, default=20,
+                            help="Inspections per school (default: 20).")
+        parser.add_argument("--items", type=int, default=25,
+                            help="Checklist items per inspection (default: 25).")
+        parser.add_argument("--fail-rate", type=float, default=0.1,
+                            help="Share of items that fail (default: 0.1).")
+        parser.add_argument("--iterations", type=int, default=20,
+                            help="Requests per endpoint and role (default: 20).")
+        parser.add_argument("--use-existing", action="store_true",
+                            help="Skip seeding; benchmark the data already in the database.")
+        parser.add_argument("--save", metavar="PATH",
+                            help="Write the results as a JSON baseline.")
+        parser.add_argument("--compare", metavar="PATH",
+                            help="Compare against a saved JSON baseline.")
+        parser.add_argument("--threshold", type=float, default=20.0,
+                            help="Percent p95 slowdown reported as a regression (default: 20).")
+
+    def handle(self, *args, **options):
+        # 5xx responses are part of the report; keep their tracebacks out of
+        # the error log while benchmarking
+        request_logger = logging.getLogger("django.request")
+        previous_level = request_logger.level
+        request_logger.setLevel(logging.CRITICAL)
+
+        setup_test_environment()
+        try:
+            with transaction.atomic():
+                samples = self.use_existing() if options["use_existing"] else self.seed(options)
+                results = self.run(samples, options["iterations"])
+                transaction.set_rollback(True)
+        finally:
+            teardown_test_environment()
+            request_logger.setLevel(previous_level)
+
+        self.report(results)
+
+        baseline = {
+            "created_at": datetime.datetime.now().isoformat(timespec="seconds"),
+            "database": connection.vendor,
+            "options": {
+                key: options[key]
+                for key in ("schools", "inspections", "items", "fail_rate", "iterations", "use_existing")
+            },
+            "results": results,
+        }
+
+        if options["save"]:
+            with open(options["save"], "w") as fh:
+                json.dump(baseline, fh, indent=2, sort_keys=True)
+            self.stdout.write(self.style.SUCCESS(f"Baseline written to {options['save']}"))
+
+        if options["compare"]:
+            regressions = self.compare(options["compare"], results, options["threshold"])
+            if regressions:
+                raise CommandError(f"{regressions} endpoint(s) regressed against {options['compare']}")
+
+    # ------------------------------------------------------------
+    #   Dataset
+    # ------------------------------------------------------------
+
+    def seed(self, options):
+        self.stdout.write("Seeding benchmark dataset...")
+
+        users = {}
+        for role in ROLES:
+            user = User.objects.create_user(
+                f"bench_{role.lower()}", password="bench",
+                first_name="Bench", last_name=role.label,
+            )
+            user.appuser.role = role
+            user.appuser.save()
+            users[role] = user
+
+        checklist = Checklist.objects.create(name="Bench Checklist")
+        ChecklistItem.objects.bulk_create(
+            ChecklistItem(checklist=checklist, text=f"Check #{n}", order=n)
+            for n in range(options["items"])
+        )
+        fail_every = round(1 / options["fail_rate"]) if options["fail_rate"] else 0
+
+        inspector = users[AppUser.Role.INSPECTOR].appuser
+        for s in range(options["schools"]):
+            school = School.objects.create(name=f"Bench School {s}")
+            school.managers.add(users[AppUser.Role.MANAGER].appuser)
+            school.kitchen_staff.add(users[AppUser.Role.KITCHEN].appuser)
+            school.inspectors.add(inspector)
+
+            for n in range(options["inspections"]):
+                inspection = Inspection.objects.create(
+                    school=school,
+                    inspector=inspector,
+                    checklist=checklist,
+                    date=datetime.date.today() - datetime.timedelta(days=n),
+                )
+                inspection.initialize_items()
+                items = inspection.inspection_items.order_by("pk").values_list("pk", flat=True)
+                failed = [pk for i, pk in enumerate(items) if fail_every and i % fail_every == 0]
+                inspection.inspection_items.update(passed=True)
+                inspection.inspection_items.filter(pk__in=failed).update(passed=False)
+                inspection.complete()
+
+        return self.samples(users)
+
+    def use_existing(self):
+        users = {}
+        for role in ROLES:
+            appuser = AppUser.objects.filter(role=role, is_active=True).select_related("user").first()
+            if appuser is None:
+                raise CommandError(f"--use-existing needs at least one active {role} user.")
+            users[role] = appuser.user
+        return self.samples(users)
+
+    def samples(self, users):
+        inspection = Inspection.objects.filter(inspection_items__corrective_actions__isnull=False).first()
+        action = CorrectiveAction.objects.order_by("pk").first()
+        school = School.objects.order_by("pk").first()
+        if not (inspection and action and school):
+            raise CommandError("Need at least one school, inspection and corrective action.")
+        return {
+            "users": users,
+            "inspection": inspection.pk,
+            "action": action.pk,
+            "school": school.pk,
+            "export": "items",
+        }
+
+    # ------------------------------------------------------------
+    #   Endpoints
+    # ------------------------------------------------------------
+
+    def endpoints(self, samples):
+        """(label, url) for every route in URL_MODULES."""
+        for module_path in URL_MODULES:
+            module = import_module(module_path)
+            for pattern in module.urlpatterns:
+                name = f"{module.app_name}:{pattern.name}"
+                converters = pattern.pattern.converters
+                if not converters:
+                    yield name, reverse(name)
+                elif pattern.name in ROUTE_OBJECTS:
+                    pk = samples[ROUTE_OBJECTS[pattern.name]]
+                    yield name, reverse(name, args=[pk] * len(converters))
+                else:
+                    self.stderr.write(f"Skipping {name}: no sample object for its arguments.")
+
+    def run(self, samples, iterations):
+        results = {}
+        endpoints = list(self.endpoints(samples))
+
+        for role, user in samples["users"].items():
+            client = Client(raise_request_exception=False)
+            client.force_login(user)
+
+            for name, url in endpoints:
+                timings, queries, size, status = [], 0, 0, None
+                for _ in range(iterations):
+                    with CaptureQueriesContext(connection) as ctx:
+                        start = time.perf_counter()
+                        response = client.get(url)
+                        content = (
+                            b"".join(response.streaming_content)
+                            if response.streaming else response.content
+                        )
+                        timings.append((time.perf_counter() - start) * 1000)
+                    queries, size, status = len(ctx.captured_queries), len(content), response.status_code
+
+                results[f"{role} {name}"] = {
+                    "url": url,
+                    "status": status,
+                    "p50_ms": round(percentile(timings, 50), 2),
+                    "p95_ms": round(percentile(timings, 95), 2),
+                    "p99_ms": round(percentile(timings, 99), 2),
+                    "queries": queries,
+                    "bytes": size,
+                }
+        return results
+
+    # ------------------------------------------------------------
+    #   Output
+    # ------------------------------------------------------------
+
+    def report(self, results):
+        header = f"{'endpoint':<58} {'status':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'queries':>7} {'bytes':>8}"
+        self.stdout.write(header)
+        self.stdout.write("-" * len(header))
+        for key, r in results.items():
+            self.stdout.write(
+                f"{key:<58} {r['status']:>6} {r['p50_ms']:>8.2f} {r['p95_ms']:>8.2f} "
+                f"{r['p99_ms']:>8.2f} {r['queries']:>7} {r['bytes']:>8}"
+            )
+
+    def compare(self, path, results, threshold):
+        with open(path) as fh:
+            baseline = json.load(fh)["results"]
+
+        self.stdout.write(f"\nCompared with {path}:")
+        regressions = 0
+        for key, r in results.items():
+            old = baseline.get(key)
+            if old is None:
+                self.stdout.write(f"  {key}: new endpoint")
+                continue
+
+            slower = (r["p95_ms"] - old["p95_ms"]) / old["p95_ms"] * 100 if old["p95_ms"] else 0
+            more_queries = r["queries"] - old["queries"]
+            regressed = slower > threshold or more_queries > 0 or r["status"] != old["status"]
+            regressions += regressed
+
+            line = (
+                f"  {key}: p95 {old['p95_ms']:.2f} -> {r['p95_ms']:.2f} ms ({slower:+.0f}%), "
+                f"queries {old['queries']} -> {r['queries']}, status {old['status']} -> {r['status']}"
+            )
+            self.stdout.write(self.style.ERROR(line) if regressed else line)
+        return regressions
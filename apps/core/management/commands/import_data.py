@@ -0,0 +1,65 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.checklists.importers import ChecklistImporter
+from apps.core.imports import FORMATS, detect_format
+from apps.schools.importers import SchoolImporter
+
+
+IMPORTERS = {
+    "schools": SchoolImporter,
+    "checklists": ChecklistImporter,
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk-import schools (with manager / kitchen / inspector links) or "
+        "checklists and their items from CSV or JSON. Rows are validated "
+        "first, then upserted in batches inside one transaction; invalid rows "
+        "are reported and skipped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("kind", choices=sorted(IMPORTERS))
+        parser.add_argument("path")
+        parser.add_argument("--format", choices=FORMATS,
+                            help="File format (default: from the file extension).")
+        parser.add_argument("--dry-run", action="store_true",
+                            help="Validate only; don't write anything.")
+        parser.add_argument("--strict", action="store_true",
+                            help="Import nothing if any row is invalid.")
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        try:
+            fmt = options["format"] or detect_format(options["path"])
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        importer = IMPORTERS[options["kind"]](dry_run=options["dry_run"])
+        importer.batch_size = options["batch_size"]
+
+        if options["strict"] and not options["dry_run"]:
+            # Validate everything first; only then write
+            check = IMPORTERS[options["kind"]](dry_run=True)
+            with open(options["path"], "rb") as fh:
+                if not self.print_errors(check.run(fh, fmt)):
+                    raise CommandError("Invalid rows found; nothing was imported (--strict).")
+
+        started = time.perf_counter()
+        with open(options["path"], "rb") as fh:
+            report = importer.run(fh, fmt)
+        elapsed = time.perf_counter() - started
+
+        self.print_errors(report)
+        prefix = "Dry run: " if options["dry_run"] else ""
+        self.stdout.write(f"{prefix}{importer.label}: {report.summary()} in {elapsed:.2f}s")
+
+    def print_errors(self, report):
+        for line, message in report.errors[:200]:
+            self.stderr.write(f"line {line}: {message}")
+        if len(report.errors) > 200:
+            self.stderr.write(f"... and {len(report.errors) - 200} more")
+        return report.ok
@@ -0,0 +1,380 @@
+import datetime
+import random
+import time
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import Max
+
+from apps.checklists.models import Checklist, ChecklistItem, ChecklistVersion
+from apps.inspections.models import (
+    CorrectiveAction, Inspection, InspectionItem, SchoolSummary, StatusRollup,
+)
+from apps.schools.models import School
+from apps.search import index as search_index
+from apps.users.models import AppUser
+from apps.users import cache as dashboard_cache
+
+
+CHECK_TEMPLATES = (
+    "Hand sink stocked with soap and paper towels ({})",
+    "Cold holding at or below 41°F ({})",
+    "Hot holding at or above 135°F ({})",
+    "Food contact surfaces cleaned and sanitized ({})",
+    "Date marking on ready-to-eat foods ({})",
+    "Thermometer calibrated and available ({})",
+    "No evidence of pests ({})",
+    "Allergen labeling present ({})",
+    "Staff wearing hair restraints ({})",
+    "Sanitizer concentration within range ({})",
+    "Raw meats stored below ready-to-eat foods ({})",
+    "Dish machine final rinse temperature ({})",
+)
+
+STATES = ("CA", "TX", "NY", "FL", "IL", "PA", "OH", "GA", "NC", "MI")
+
+# Inspection dates end here unless --end-date says otherwise, so a seed
+# yields the same data whichever day it's loaded
+END_DATE = datetime.date(2026, 1, 1)
+
+# Share of generated users per role
+ROLE_MIX = (
+    (AppUser.Role.KITCHEN, 0.55),
+    (AppUser.Role.MANAGER, 0.25),
+    (AppUser.Role.INSPECTOR, 0.19),
+    (AppUser.Role.ADMIN, 0.01),
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk-load a deterministic synthetic dataset (schools, users of every "
+        "role, checklists, inspections, items and corrective actions) for "
+        "scale testing. Rows are inserted in large batches with explicit "
+        "primary keys and no per-instance signals; run it on an empty database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--seed", type=int, default=42,
+                            help="Random seed; the same seed yields the same data (default: 42).")
+        parser.add_argument("--schools", type=int, default=2000)
+        parser.add_argument("--users", type=int, default=20000,
+                            help="AppUsers across all roles (default: 20000).")
+        parser.add_argument("--checklists", type=int, default=5)
+        parser.add_argument("--checklist-items", type=int, default=100,
+                            help="Items per checklist (default: 100).")
+        parser.add_argument("--inspections", type=int, default=100000,
+                            help="Inspections; items = inspections x checklist items (default: 100000).")
+        parser.add_argument("--years", type=int, default=5,
+                            help="Inspection dates span this many years back (default: 5).")
+        parser.add_argument("--end-date", type=datetime.date.fromisoformat, default=END_DATE,
+                            help=f"Latest inspection date, YYYY-MM-DD (default: {END_DATE}).")
+        parser.add_argument("--fail-rate", type=float, default=0.04,
+                            help="Mean item failure rate (default: 0.04).")
+        parser.add_argument("--pending-rate", type=float, default=0.02,
+                            help="Share of inspections still pending (default: 0.02).")
+        parser.add_argument("--batch-size", type=int, default=500,
+                            help="Inspections generated per transaction (default: 500).")
+        parser.add_argument("--prefix", default="seed",
+                            help="Username prefix, to load more than once (default: seed).")
+
+    def handle(self, *args, **options):
+        if User.objects.filter(username__startswith=f"{options['prefix']}_").exists():
+            raise CommandError(
+                f"Users with prefix '{options['prefix']}_' already exist; pass --prefix."
+            )
+
+        self.rng = random.Random(options["seed"])
+        self.options = options
+        self.pk = {}
+        started = time.perf_counter()
+
+        with transaction.atomic():
+            users = self.load_users()
+            schools = self.load_schools(users)
+            checklists = self.load_checklists()
+
+        self.load_inspections(schools, checklists)
+
+        self.stdout.write(
+            "Resetting sequences, rebuilding status rollups, school summaries, "
+            "compliance rollups and the search index..."
+        )
+        self.reset_sequences()
+        StatusRollup.objects.rebuild()
+        SchoolSummary.objects.rebuild()
+        call_command("backfill_compliance_rollups", restart=True, months=12, stdout=self.stdout)
+        search_index.rebuild()
+        dashboard_cache.bump("all")
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f"Done in {elapsed:.1f}s."))
+
+    # ------------------------------------------------------------
+    #   Helpers
+    # ------------------------------------------------------------
+
+    def next_pks(self, model, count):
+        """Reserve ``count`` explicit primary keys for ``model``."""
+        if model not in self.pk:
+            self.pk[model] = (model.objects.aggregate(m=Max("pk"))["m"] or 0) + 1
+        start = self.pk[model]
+        self.pk[model] += count
+        return range(start, start + count)
+
+    def insert(self, model, objs):
+        model.objects.bulk_create(objs, batch_size=5000)
+        return len(objs)
+
+    def reset_sequences(self):
+        models = [User, AppUser, School, Checklist, ChecklistItem,
+                  Inspection, InspectionItem, CorrectiveAction]
+        sql = connection.ops.sequence_reset_sql(no_style(), models)
+        if sql:
+            with connection.cursor() as cursor:
+                for statement in sql:
+                    cursor.execute(statement)
+
+    # ------------------------------------------------------------
+    #   Users, schools, checklists
+    # ------------------------------------------------------------
+
+    def load_users(self):
+        prefix = self.options["prefix"]
+        total = self.options["users"]
+        password = make_password("password")  # hashed once, shared by every user
+
+        roles = []
+        for role, share in ROLE_MIX:
+            roles += [role] * max(1, round(total * share))
+
+        user_pks = self.next_pks(User, len(roles))
+        appuser_pks = self.next_pks(AppUser, len(roles))
+
+        users, appusers = [], []
+        by_role = {role: [] for role, _ in ROLE_MIX}
+        for n, (role, user_pk, appuser_pk) in enumerate(zip(roles, user_pks, appuser_pks)):
+            users.append(User(
+                pk=user_pk,
+                username=f"{prefix}_{role.lower()}_{n}",
+                first_name=self.rng.choice(("Alex", "Sam", "Jordan", "Taylor", "Casey", "Riley", "Morgan")),
+                last_name=f"{role.label.split()[0]}{n}",
+                email=f"{prefix}_{n}@example.org",
+                password=password,
+                is_staff=role == AppUser.Role.ADMIN,
+            ))
+            # AppUser rows written directly: create_appuser_profile never fires
+            appusers.append(AppUser(
+                pk=appuser_pk, user_id=user_pk, role=role,
+                is_staff=role == AppUser.Role.ADMIN,
+            ))
+            by_role[role].append(appuser_pk)
+
+        self.insert(User, users)
+        self.insert(AppUser, appusers)
+        self.stdout.write(f"Users: {len(users)}")
+        return by_role
+
+    def load_schools(self, users):
+        count = self.options["schools"]
+        school_pks = list(self.next_pks(School, count))
+
+        self.insert(School, [
+            School(
+                pk=pk,
+                name=f"School {pk}",
+                city=f"City {self.rng.randint(1, 400)}",
+                state=self.rng.choice(STATES),
+                postal_code=f"{self.rng.randint(10000, 99999)}",
+            )
+            for pk in school_pks
+        ])
+
+        # M2M through rows written directly (no m2m_changed per link)
+        schools = {}
+        through_rows = {
+            School.managers.through: [],
+            School.kitchen_staff.through: [],
+            School.inspectors.through: [],
+        }
+        for n, pk in enumerate(school_pks):
+            managers = self.spread(users[AppUser.Role.MANAGER], n, count, 1)
+            kitchen = self.spread(users[AppUser.Role.KITCHEN], n, count, 2)
+            inspectors = self.spread(users[AppUser.Role.INSPECTOR], n, count, 1)
+
+            through_rows[School.managers.through] += [
+                School.managers.through(school_id=pk, appuser_id=u) for u in managers
+            ]
+            through_rows[School.kitchen_staff.through] += [
+                School.kitchen_staff.through(school_id=pk, appuser_id=u) for u in kitchen
+            ]
+            through_rows[School.inspectors.through] += [
+                School.inspectors.through(school_id=pk, appuser_id=u) for u in inspectors
+            ]
+
+            schools[pk] = {
+                "manager": managers[0] if managers else None,
+                "assignee": (kitchen or managers or [None])[0],
+                "inspectors": inspectors,
+                # Per-school compliance: most schools are good, a few struggle
+                "risk": self.rng.betavariate(2, 5) * 2,
+            }
+
+        for model, rows in through_rows.items():
+            self.insert(model, rows)
+
+        self.stdout.write(f"Schools: {count}")
+        return schools
+
+    def spread(self, pool, n, count, per_school):
+        """Deterministically give school ``n`` ``per_school`` members of ``pool``."""
+        if not pool:
+            return []
+        start = n * len(pool) // count
+        return [pool[(start + i) % len(pool)] for i in range(min(per_school, len(pool)))]
+
+    def load_checklists(self):
+        n_checklists = self.options["checklists"]
+        n_items = self.options["checklist_items"]
+
+        checklist_pks = self.next_pks(Checklist, n_checklists)
+        self.insert(Checklist, [
+            Checklist(pk=pk, name=f"Food Safety Checklist {i + 1}")
+            for i, pk in enumerate(checklist_pks)
+        ])
+
+        checklists = {}
+        items = []
+        for checklist_pk in checklist_pks:
+            item_pks = self.next_pks(ChecklistItem, n_items)
+            entries = []
+            for order, item_pk in enumerate(item_pks):
+                text = self.rng.choice(CHECK_TEMPLATES).format(f"#{order + 1}")
+                items.append(ChecklistItem(
+                    pk=item_pk, checklist_id=checklist_pk, text=text[:255], order=order,
+                ))
+                # Per-item difficulty: a handful of checks fail far more often
+                entries.append((item_pk, text, self.rng.paretovariate(3)))
+            checklists[checklist_pk] = entries
+
+        self.insert(ChecklistItem, items)
+        # Inspections are bulk-inserted (no save()), so pin versions here
+        self.versions = {pk: ChecklistVersion.objects.current(pk) for pk in checklist_pks}
+        self.stdout.write(f"Checklists: {n_checklists} x {n_items} items")
+        return checklists
+
+    # ------------------------------------------------------------
+    #   Inspections, items, corrective actions
+    # ------------------------------------------------------------
+
+    def load_inspections(self, schools, checklists):
+        total = self.options["inspections"]
+        batch_size = self.options["batch_size"]
+        end_date = self.options["end_date"]
+        span_days = 365 * self.options["years"]
+
+        school_pks = list(schools)
+        checklist_pks = list(checklists)
+        done = rows = 0
+        started = time.perf_counter()
+
+        while done < total:
+            size = min(batch_size, total - done)
+            inspections, items, actions = [], [], []
+
+            for inspection_pk in self.next_pks(Inspection, size):
+                school_pk = self.rng.choice(school_pks)
+                school = schools[school_pk]
+                checklist_pk = self.rng.choice(checklist_pks)
+                entries = checklists[checklist_pk]
+                days_ago = self.rng.randrange(span_days)
+                pending = days_ago < 30 and self.rng.random() < self.options["pending_rate"] * 15
+
+                item_pks = self.next_pks(InspectionItem, len(entries))
+                failed = unresolved = 0
+                for (checklist_item_pk, text, difficulty), item_pk in zip(entries, item_pks):
+                    if pending:
+                        passed = None
+                    else:
+                        fail_p = min(0.9, self.options["fail_rate"] * school["risk"] * difficulty)
+                        passed = self.rng.random() >= fail_p
+
+                    if passed is False:
+                        status = self.action_status(days_ago)
+                        actions.append(CorrectiveAction(
+                            inspection_item_id=item_pk,
+                            assigned_to_id=school["assignee"],
+                            description=f"Correct issue: {text}",
+                            status=status,
+                        ))
+                        # A closed action's item has since passed, as a
+                        # passing reinspection records it
+                        if status in CorrectiveAction.UNRESOLVED_STATUSES:
+                            failed += 1
+                            unresolved += 1
+                        else:
+                            passed = True
+
+                    items.append(InspectionItem(
+                        pk=item_pk, inspection_id=inspection_pk,
+                        checklist_item_id=checklist_item_pk, passed=passed,
+                    ))
+
+                if pending:
+                    status = Inspection.Status.PENDING
+                elif unresolved:
+                    status = Inspection.Status.FAILED
+                else:
+                    status = Inspection.Status.PASSED
+
+                inspections.append(Inspection(
+                    pk=inspection_pk,
+                    school_id=school_pk,
+                    inspector_id=self.rng.choice(school["inspectors"]) if school["inspectors"] else None,
+                    manager_id=school["manager"],
+                    checklist_id=checklist_pk,
+                    checklist_version_id=self.versions[checklist_pk],
+                    date=end_date - datetime.timedelta(days=days_ago),
+                    status=status,
+                    total_items=len(entries),
+                    answered_items=0 if pending else len(entries),
+                    failed_items=failed,
+                    unresolved_actions=unresolved,
+                ))
+
+            for action, pk in zip(actions, self.next_pks(CorrectiveAction, len(actions))):
+                action.pk = pk
+
+            with transaction.atomic():
+                self.insert(Inspection, inspections)
+                rows += self.insert(InspectionItem, items)
+                self.insert(CorrectiveAction, actions)
+
+            done += size
+            rate = rows / (time.perf_counter() - started)
+            self.stdout.write(
+                f"Inspections: {done}/{total}  items: {rows}  ({rate:,.0f} items/s)"
+            )
+
+    def action_status(self, days_ago):
+        """Older failures are mostly closed out; recent ones mostly open."""
+        roll = self.rng.random()
+        if days_ago > 90:
+            if roll < 0.7:
+                return CorrectiveAction.Status.REINSPECTED
+            if roll < 0.97:
+                return CorrectiveAction.Status.RESOLVED
+            return CorrectiveAction.Status.OPEN
+        if roll < 0.4:
+            return CorrectiveAction.Status.OPEN
+        if roll < 0.6:
+            return CorrectiveAction.Status.IN_PROGRESS
+        if roll < 0.75:
+            return CorrectiveAction.Status.AWAITING_REINSPECTION
+        if roll < 0.9:
+            return CorrectiveAction.Status.RESOLVED
+        return CorrectiveAction.Status.REINSPECTED
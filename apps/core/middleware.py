@@ -0,0 +1,150 @@
+import contextvars
+import logging
+import random
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+from django.template.backends.django import Template as DjangoTemplate
+
+logger = logging.getLogger("core.profiling")
+
+
+# ============================================================
+#   REQUEST PROFILING
+# ============================================================
+#
+# Opt-in (REQUEST_PROFILING = True). A sampled request records:
+#
+#   - every SQL statement run on the default connection, with its time
+#   - statements whose SQL text (parameters excluded) repeats, i.e. N+1s
+#   - time spent rendering templates
+#   - the resolved view name
+#
+# The totals go out as a Server-Timing header; requests slower than
+# REQUEST_PROFILING_SLOW_MS are also logged to "core.profiling".
+
+_current = contextvars.ContextVar("request_profile", default=None)
+
+
+class RequestProfile:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = Counter()
+        self.query_count = 0
+        self.db_time = 0.0
+        self.template_time = 0.0
+
+    def execute(self, execute, sql, params, many, context):
+        """``connection.execute_wrapper`` hook."""
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - start
+            self.query_count += 1
+            self.queries[sql] += 1
+
+    def duplicates(self, threshold):
+        """``[(sql, count)]`` run at least ``threshold`` times, most repeated first."""
+        return [(sql, n) for sql, n in self.queries.most_common() if n >= threshold]
+
+    @property
+    def total_time(self):
+        return time.perf_counter() - self.started
+
+
+def _timed_render(render):
+    def wrapper(self, *args, **kwargs):
+        profile = _current.get()
+        if profile is None:
+            return render(self, *args, **kwargs)
+
+        # Only the outermost render counts; {% include %} etc. don't pass
+        # through the backend Template, so nothing is double counted.
+        start = time.perf_counter()
+        try:
+            return render(self, *args, **kwargs)
+        finally:
+            profile.template_time += time.perf_counter() - start
+
+    wrapper.profiled = True
+    return wrapper
+
+
+def _instrument_templates():
+    if not getattr(DjangoTemplate.render, "profiled", False):
+        DjangoTemplate.render = _timed_render(DjangoTemplate.render)
+
+
+class RequestProfilingMiddleware:
+    """Per-request SQL / template timing, reported via Server-Timing.
+
+    Removed from the chain at startup unless REQUEST_PROFILING is set, so
+    it costs nothing when off. When on, only REQUEST_PROFILING_SAMPLE_RATE
+    of requests are profiled.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, "REQUEST_PROFILING", False):
+            raise MiddlewareNotUsed
+
+        self.get_response = get_response
+        self.sample_rate = settings.REQUEST_PROFILING_SAMPLE_RATE
+        self.slow_ms = settings.REQUEST_PROFILING_SLOW_MS
+        self.duplicate_threshold = settings.REQUEST_PROFILING_DUPLICATE_THRESHOLD
+        _instrument_templates()
+
+    def __call__(self, request):
+        if self.sample_rate < 1 and random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        profile = RequestProfile()
+        token = _current.set(profile)
+        try:
+            with connection.execute_wrapper(profile.execute):
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+
+        total_ms = profile.total_time * 1000
+        duplicates = profile.duplicates(self.duplicate_threshold)
+        response["Server-Timing"] = self.server_timing(profile, total_ms, duplicates)
+
+        if total_ms >= self.slow_ms:
+            self.log_slow(request, response, profile, total_ms, duplicates)
+
+        return response
+
+    def server_timing(self, profile, total_ms, duplicates):
+        metrics = [
+            f'db;dur={profile.db_time * 1000:.1f};desc="{profile.query_count} queries"',
+            f"tpl;dur={profile.template_time * 1000:.1f}",
+            f"total;dur={total_ms:.1f}",
+        ]
+        if duplicates:
+            repeated = sum(n for _, n in duplicates)
+            metrics.append(f'dup;desc="{len(duplicates)} shapes, {repeated} queries"')
+        return ", ".join(metrics)
+
+    def log_slow(self, request, response, profile, total_ms, duplicates):
+        match = request.resolver_match
+        logger.warning(
+            "Slow request %s %s (%.0f ms, %d queries)",
+            request.method, request.path, total_ms, profile.query_count,
+            extra={
+                "view": match.view_name if match else None,
+                "method": request.method,
+                "path": request.path,
+                "status": response.status_code,
+                "total_ms": round(total_ms, 1),
+                "db_ms": round(profile.db_time * 1000, 1),
+                "queries": profile.query_count,
+                "template_ms": round(profile.template_time * 1000, 1),
+                "duplicate_queries": [
+                    {"sql": sql[:500], "count": n} for sql, n in duplicates[:5]
+                ],
+            },
+        )
@@ -0,0 +1,179 @@
+import hashlib
+from typing import NamedTuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import EmptyPage, Page, Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+
+# ============================================================
+#   ROW COUNTS WITHOUT A FULL COUNT(*)
+# ============================================================
+#
+# An exact COUNT(*) over a filtered join scans every matching row, which on
+# the multi-million-row item and action tables costs more than the page it
+# sits on. count_rows() never does that:
+#
+#   unfiltered  the planner's estimate for the table (PostgreSQL, MySQL),
+#               or an exact count if the table is small anyway
+#   filtered    a count that stops at COUNT_LIMIT rows, cached for
+#               COUNT_CACHE_TIMEOUT seconds under the query's SQL + params
+#
+# SQLite keeps no estimate (short of ANALYZE), so it always gets the capped
+# count.
+
+COUNT_LIMIT = 10_000
+
+ABOUT = "about"  # planner estimate
+OVER = "over"    # stopped counting at the limit
+
+ESTIMATE_SQL = {
+    # reltuples is -1 (0 before PostgreSQL 14) until the table is analyzed
+    "postgresql": "SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(%s)",
+    "mysql": (
+        "SELECT table_rows FROM information_schema.tables "
+        "WHERE table_schema = DATABASE() AND table_name = %s"
+    ),
+}
+
+
+class RowCount(NamedTuple):
+    value: int
+    qualifier: str = ""  # "", ABOUT or OVER
+
+    @property
+    def exact(self):
+        return not self.qualifier
+
+    def __str__(self):
+        if self.qualifier == ABOUT:
+            return f"about {self.value:,}"
+        if self.qualifier == OVER:
+            return f"over {self.value:,}"
+        return f"{self.value:,}"
+
+
+def estimated_rows(queryset):
+    """Planner's row estimate for the queryset's table, or None."""
+    conn = connections[queryset.db]
+    sql = ESTIMATE_SQL.get(conn.vendor)
+    if sql is None:
+        return None
+    with conn.cursor() as cursor:
+        cursor.execute(sql, [queryset.model._meta.db_table])
+        row = cursor.fetchone()
+    if not row or row[0] is None or row[0] <= 0:
+        return None
+    return int(row[0])
+
+
+def is_unfiltered(queryset):
+    """Whether the queryset counts every row of its table."""
+    query = queryset.query
+    return not (
+        query.where or query.distinct or query.combinator
+        or query.is_sliced or query.group_by is not None
+    )
+
+
+def count_key(queryset):
+    """Cache key for the queryset's count: its database, SQL and params."""
+    sql, params = queryset.query.sql_with_params()
+    digest = hashlib.sha256(repr((queryset.db, sql, params)).encode()).hexdigest()
+    return f"row-count:{digest}"
+
+
+def count_rows(queryset, limit=COUNT_LIMIT):
+    """A RowCount for ``queryset`` costing at most ``limit`` rows scanned."""
+    queryset = queryset.order_by()
+
+    if is_unfiltered(queryset):
+        estimate = estimated_rows(queryset)
+        if estimate is not None:
+            if estimate >= limit:
+                return RowCount(estimate, ABOUT)
+            return RowCount(queryset.count())
+
+    key = count_key(queryset)
+    count = cache.get(key)
+    if count is None:
+        count = queryset[: limit + 1].count()
+        cache.set(key, count, settings.COUNT_CACHE_TIMEOUT)
+
+    if count > limit:
+        return RowCount(limit, OVER)
+    return RowCount(count)
+
+
+# ============================================================
+#   PAGINATOR
+# ============================================================
+
+class OpenEndedPage(Page):
+    """A page that knows whether another follows without the total."""
+
+    def __init__(self, object_list, number, paginator, has_more):
+        super().__init__(object_list, number, paginator)
+        self.has_more = has_more
+
+    def has_next(self):
+        return self.has_more
+
+    def end_index(self):
+        return self.start_index() + len(self.object_list) - 1 if self.object_list else 0
+
+
+class CountAvoidingPaginator(Paginator):
+    """Paginator whose count comes from count_rows(), not COUNT(*).
+
+    Each page fetches one row past its end, so "next" works whether or not
+    the count is exact (or a few seconds stale); pages past the counted
+    ones are still served as long as they have rows. Set it as a
+    ModelAdmin's ``paginator`` along with ``show_full_result_count = False``.
+    """
+
+    count_limit = COUNT_LIMIT
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._has_more = {}
+
+    @cached_property
+    def row_count(self):
+        return count_rows(self.object_list, self.count_limit)
+
+    @cached_property
+    def count(self):
+        return self.row_count.value
+
+    def validate_number(self, number):
+        try:
+            return super().validate_number(number)
+        except EmptyPage:
+            # Past the counted pages; page() checks there are rows
+            if int(number) < 1:
+                raise
+            return int(number)
+
+    def page(self, number):
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom : bottom + self.per_page + 1])
+        if not rows and number > 1:
+            raise EmptyPage(self.error_messages["no_results"])
+
+        self._has_more[number] = len(rows) > self.per_page
+        return OpenEndedPage(rows[: self.per_page], number, self, self._has_more[number])
+
+    def get_elided_page_range(self, number=1, **kwargs):
+        number = self.validate_number(number)
+        pages = list(super().get_elided_page_range(number, **kwargs))
+        if number not in pages:
+            # Past the counted pages of a short range (a stale count)
+            pages += [self.ELLIPSIS, number] if number > self.num_pages + 1 else [number]
+        # At or past the last counted page, but rows continue
+        if number >= self.num_pages and self._has_more.get(number):
+            pages += [number + 1, self.ELLIPSIS]
+        return pages
@@ -1,3 +1,239 @@
-from django.test import TestCase
+import json
+import logging
+import logging.handlers
+import sys
+import tempfile
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.paginator import EmptyPage
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from apps.inspections.models import CorrectiveAction, Inspection, InspectionItem
+from apps.schools.models import School
+from . import pagination
+from .management.commands.seed_load import END_DATE
+from .logs import JSONFormatter, QueueListenerHandler, RateLimitFilter
+from .middleware import RequestProfile
+
+
+PROFILED = dict(
+    REQUEST_PROFILING=True,
+    REQUEST_PROFILING_SAMPLE_RATE=1.0,
+    REQUEST_PROFILING_SLOW_MS=60_000,
+    REQUEST_PROFILING_DUPLICATE_THRESHOLD=2,
+)
+
+
+class RequestProfilingMiddlewareTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("profiled", password="x")
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def test_disabled_by_default(self):
+        response = self.client.get(reverse("users:dashboard"))
+        self.assertNotIn("Server-Timing", response)
+
+    @override_settings(**PROFILED)
+    def test_server_timing_header(self):
+        response = self.client.get(reverse("users:dashboard"))
+        timing = response["Server-Timing"]
+        self.assertRegex(timing, r'db;dur=[\d.]+;desc="\d+ queries"')
+        self.assertRegex(timing, r"tpl;dur=[\d.]+")
+        self.assertRegex(timing, r"total;dur=[\d.]+")
+
+    @override_settings(**dict(PROFILED, REQUEST_PROFILING_SAMPLE_RATE=0.0))
+    def test_unsampled_request_is_untouched(self):
+        response = self.client.get(reverse("users:dashboard"))
+        self.assertNotIn("Server-Timing", response)
+
+    @override_settings(**dict(PROFILED, REQUEST_PROFILING_SLOW_MS=0))
+    def test_slow_request_is_logged(self):
+        with self.assertLogs("core.profiling", "WARNING") as logs:
+            self.client.get(reverse("users:dashboard"))
+
+        record = logs.records[0]
+        self.assertEqual(record.view, "users:dashboard")
+        self.assertEqual(record.status, 200)
+        self.assertGreater(record.queries, 0)
+
+    def test_repeated_query_shapes(self):
+        schools = [School.objects.create(name=f"School {n}") for n in range(3)]
+        profile = RequestProfile()
+        with connection.execute_wrapper(profile.execute):
+            for school in schools:
+                School.objects.get(pk=school.pk)   # same SQL, different params
+            School.objects.count()
+
+        self.assertEqual(profile.query_count, 4)
+        [(sql, count)] = profile.duplicates(threshold=2)
+        self.assertEqual(count, 3)
+        self.assertIn("WHERE", sql)
+
+
+def make_record(name="core.errors", msg="boom", **extra):
+    record = logging.makeLogRecord({"name": name, "msg": msg, "levelno": logging.ERROR, "levelname": "ERROR"})
+    record.__dict__.update(extra)
+    return record
+
+
+class LoggingPipelineTests(TestCase):
+
+    def test_json_formatter_keeps_extra_fields(self):
+        record = make_record(url="http://testserver/x", method="GET", user="Anonymous")
+        data = json.loads(JSONFormatter().format(record))
+
+        self.assertEqual(data["message"], "boom")
+        self.assertEqual(data["logger"], "core.errors")
+        self.assertEqual(data["url"], "http://testserver/x")
+        self.assertEqual(data["user"], "Anonymous")
+        self.assertNotIn("levelno", data)
+
+    def test_rate_limit_is_per_logger_and_reports_suppressed(self):
+        limit = RateLimitFilter(rate=2, period=60)
+        passed = [limit.filter(make_record()) for _ in range(5)]
+        self.assertEqual(passed, [True, True, False, False, False])
+        self.assertTrue(limit.filter(make_record(name="django.request")))
+
+        # New window: the next record carries the number dropped
+        limit.windows["core.errors"][0] -= 60
+        record = make_record()
+        self.assertTrue(limit.filter(record))
+        self.assertEqual(record.suppressed, 3)
+
+    def test_queue_handler_delivers_in_background(self):
+        target = logging.handlers.BufferingHandler(capacity=100)
+        target.name = "test_buffer"
+        handler = QueueListenerHandler(handlers=["test_buffer"])
+
+        try:
+            1 / 0
+        except ZeroDivisionError:
+            handler.emit(make_record(exc_info=sys.exc_info()))
+        handler.close()   # stops the listener after draining the queue
+
+        [delivered] = target.buffer
+        self.assertIsNone(delivered.exc_info)
+        self.assertIn("ZeroDivisionError", delivered.exc_text)
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        handler = QueueListenerHandler(handlers=[], maxsize=1)
+        handler.enqueue(make_record())
+        handler.enqueue(make_record())
+        self.assertEqual(handler.queue.qsize(), 1)
+        self.assertEqual(handler.dropped, 1)
+
+
+class CountAvoidingPaginatorTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        School.objects.bulk_create(School(name=f"School {n:02}") for n in range(25))
+
+    def setUp(self):
+        cache.clear()
+
+    def schools(self):
+        return School.objects.filter(name__startswith="School").order_by("name")
+
+    def test_counts_are_capped_and_cached(self):
+        self.assertEqual(pagination.count_rows(self.schools()), (25, ""))
+        self.assertEqual(pagination.count_rows(self.schools(), limit=10), (10, pagination.OVER))
+
+        # Same filters: the cached count, stale until it expires
+        School.objects.create(name="School 99")
+        with self.assertNumQueries(0):
+            self.assertEqual(pagination.count_rows(self.schools()), (25, ""))
+        self.assertEqual(str(pagination.RowCount(12000, pagination.ABOUT)), "about 12,000")
+
+    def test_unfiltered_uses_planner_estimate(self):
+        with mock.patch.object(pagination, "estimated_rows", return_value=50_000):
+            self.assertEqual(
+                pagination.count_rows(School.objects.all()), (50_000, pagination.ABOUT)
+            )
+        with mock.patch.object(pagination, "estimated_rows", return_value=30):
+            self.assertEqual(pagination.count_rows(School.objects.all()), (25, ""))
+
+    def test_pages_past_a_capped_count(self):
+        paginator = pagination.CountAvoidingPaginator(self.schools(), 10)
+        paginator.count_limit = 10
+
+        self.assertEqual(paginator.num_pages, 1)
+        page = paginator.page(2)
+        self.assertEqual([s.name for s in page], [f"School {n:02}" for n in range(10, 20)])
+        self.assertTrue(page.has_next())
+        self.assertEqual(list(paginator.get_elided_page_range(2)), [1, 2, 3, paginator.ELLIPSIS])
+
+        last = paginator.page(3)
+        self.assertEqual((len(last), last.has_next(), last.end_index()), (5, False, 25))
+        with self.assertRaises(EmptyPage):
+            paginator.page(4)
+
+
+
+class BenchViewsTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    # The test runner has already set up the test environment
+    @mock.patch("apps.core.management.commands.bench_views.teardown_test_environment")
+    @mock.patch("apps.core.management.commands.bench_views.setup_test_environment")
+    def test_smoke(self, setup, teardown):
+        options = dict(schools=1, inspections=2, items=3, fail_rate=0.5, iterations=1)
+        with tempfile.NamedTemporaryFile(suffix=".json") as baseline:
+            call_command("bench_views", save=baseline.name, stdout=StringIO(), stderr=StringIO(), **options)
+            with open(baseline.name) as fh:
+                results = json.load(fh)["results"]
+
+            # Same data again: only a timing slowdown could differ, so none counts
+            out = StringIO()
+            call_command("bench_views", compare=baseline.name, threshold=float("inf"),
+                         stdout=out, stderr=StringIO(), **options)
+
+        self.assertIn("ADMIN users:dashboard", results)
+        self.assertEqual({key.split()[0] for key in results}, {"ADMIN", "MANAGER", "INSPECTOR", "KITCHEN"})
+        errors = {key: r["status"] for key, r in results.items() if r["status"] >= 500}
+        self.assertEqual(errors, {})
+        self.assertIn(f"Compared with {baseline.name}", out.getvalue())
+        # The whole run is rolled back
+        self.assertFalse(User.objects.filter(username__startswith="bench_").exists())
+
+
+class SeedLoadTests(TestCase):
+
+    def seed(self, prefix):
+        call_command(
+            "seed_load", prefix=prefix, schools=2, users=20, checklists=1,
+            checklist_items=4, inspections=12, years=1, fail_rate=0.5,
+            batch_size=5, stdout=StringIO(),
+        )
+        return Inspection.objects.filter(inspector__user__username__startswith=f"{prefix}_")
+
+    def test_smoke(self):
+        first = self.seed("one")
+        self.assertEqual(InspectionItem.objects.count(), 12 * 4)
+        self.assertTrue(CorrectiveAction.objects.exists())
+
+        # Dates come from the fixed end date, so the same seed repeats exactly
+        second = self.seed("two")
+        dates = list(first.order_by("pk").values_list("date", flat=True))
+        self.assertEqual(dates, list(second.order_by("pk").values_list("date", flat=True)))
+        self.assertLessEqual(max(dates), END_DATE)
+
+        # A closed action's item passed; only open failures count as failed
+        closed = CorrectiveAction.objects.exclude(status__in=CorrectiveAction.UNRESOLVED_STATUSES)
+        self.assertFalse(closed.filter(inspection_item__passed=False).exists())
+        for inspection in Inspection.objects.all():
+            counted = (inspection.failed_items, inspection.unresolved_actions)
+            inspection.refresh_counters()
+            self.assertEqual(counted, (inspection.failed_items, inspection.unresolved_actions))
@@ -1,5 +1,8 @@
 from django.contrib import admin
 from django.utils.html import format_html
+from apps.core.admin import AutocompleteFilter, AutocompleteFilterMixin
+from apps.core.pagination import CountAvoidingPaginator
+from apps.search.admin import IndexedSearchAdminMixin
 from .models import Inspection, InspectionItem, CorrectiveAction
 
 
@@ -46,7 +49,7 @@ class InspectionItemInline(admin.TabularInline):
 # ============================================================
 
 @admin.register(CorrectiveAction)
-class CorrectiveActionAdmin(admin.ModelAdmin):
+class CorrectiveActionAdmin(AutocompleteFilterMixin, IndexedSearchAdminMixin, admin.ModelAdmin):
 
     list_display = (
         "id",
@@ -56,21 +59,29 @@ class CorrectiveActionAdmin(admin.ModelAdmin):
         "created_at",
     )
 
-    list_filter = (
-        "status",
-        "assigned_to",
+    # inspection_item's __str__ reaches the school and checklist item
+    list_select_related = (
         "inspection_item__inspection__school",
-        "inspection_item__inspection__inspector",
+        "inspection_item__checklist_item",
+        "assigned_to__user",
     )
 
-    search_fields = (
-        "description",
-        "inspection_item__checklist_item__text",
-        "assigned_to__user__first_name",
-        "assigned_to__user__last_name",
-        "inspection_item__inspection__school__name",
+    list_filter = (
+        "status",
+        ("assigned_to", AutocompleteFilter),
+        ("inspection_item__inspection__school", AutocompleteFilter),
+        ("inspection_item__inspection__inspector", AutocompleteFilter),
     )
 
+    # Estimated / capped counts instead of COUNT(*) on every page
+    paginator = CountAvoidingPaginator
+    show_full_result_count = False
+
+    # Searched through the full-text index, not icontains joins
+    search_fields = ("description",)
+    search_index_fields = {"action": "pk"}
+    search_help_text = "Words in the description, checklist item, assignee or school name."
+
     autocomplete_fields = ("assigned_to", "inspection_item")
 
     ordering = ("-created_at",)
@@ -98,7 +109,7 @@ class CorrectiveActionAdmin(admin.ModelAdmin):
 # ============================================================
 
 @admin.register(Inspection)
-class InspectionAdmin(admin.ModelAdmin):
+class InspectionAdmin(AutocompleteFilterMixin, IndexedSearchAdminMixin, admin.ModelAdmin):
 
     list_display = (
         "school",
@@ -108,21 +119,24 @@ class InspectionAdmin(admin.ModelAdmin):
         "status",
     )
 
+    list_select_related = ("school", "inspector__user", "manager__user")
+
     list_filter = (
         "status",
         "date",
-        "school",
-        "inspector",
-        "manager",
+        ("school", AutocompleteFilter),
+        ("inspector", AutocompleteFilter),
+        ("manager", AutocompleteFilter),
     )
 
-    search_fields = (
-        "school__name",
-        "inspector__user__first_name",
-        "inspector__user__last_name",
-        "manager__user__first_name",
-        "manager__user__last_name",
-    )
+    # Estimated / capped counts instead of COUNT(*) on every page
+    paginator = CountAvoidingPaginator
+    show_full_result_count = False
+
+    # Searched through the full-text index, not icontains joins
+    search_fields = ("school__name",)
+    search_index_fields = {"inspection": "pk"}
+    search_help_text = "Words in the school, checklist, inspector or manager name, or the notes."
 
     date_hierarchy = "date"
 
@@ -163,7 +177,7 @@ class InspectionAdmin(admin.ModelAdmin):
 # ============================================================
 
 @admin.register(InspectionItem)
-class InspectionItemAdmin(admin.ModelAdmin):
+class InspectionItemAdmin(AutocompleteFilterMixin, IndexedSearchAdminMixin, admin.ModelAdmin):
 
     list_display = (
         "inspection",
@@ -172,16 +186,21 @@ class InspectionItemAdmin(admin.ModelAdmin):
         "notes"
     )
 
+    list_select_related = ("inspection__school", "checklist_item__checklist")
+
     list_filter = (
         "passed",
-        "inspection__school",
+        ("inspection__school", AutocompleteFilter),
         "inspection__status"
     )
 
-    search_fields = (
-        "inspection__school__name",
-        "checklist_item__text",
-        "notes"
-    )
+    # Estimated / capped counts instead of COUNT(*) on every page
+    paginator = CountAvoidingPaginator
+    show_full_result_count = False
+
+    # Searched through the full-text index, not icontains joins
+    search_fields = ("notes",)
+    search_index_fields = {"item": "pk", "checklist_item": "checklist_item_id"}
+    search_help_text = "Words in the checklist item text or the item notes."
 
     autocomplete_fields = ("inspection", "checklist_item")
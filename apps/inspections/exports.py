@@ -0,0 +1,248 @@
+import csv
+import datetime
+import re
+import zipfile
+from xml.sax.saxutils import escape
+
+from .models import CorrectiveAction, Inspection, InspectionItem
+
+
+# Rows fetched per round trip; on PostgreSQL this is a server-side cursor
+CHUNK_SIZE = 2000
+
+
+# ============================================================
+#   EXPORT DEFINITIONS
+# ============================================================
+#
+# Each export is a list of (header, field path) columns read with
+# values_list(), so no model instances are built while streaming.
+
+EXPORTS = {
+    "inspections": (Inspection, "pk", [
+        ("Inspection ID", "pk"),
+        ("School", "school__name"),
+        ("Date", "date"),
+        ("Status", "status"),
+        ("Inspector", "inspector__user__username"),
+        ("Manager", "manager__user__username"),
+        ("Checklist", "checklist__name"),
+        ("Total Items", "total_items"),
+        ("Answered Items", "answered_items"),
+        ("Failed Items", "failed_items"),
+        ("Unresolved Actions", "unresolved_actions"),
+        ("Notes", "notes"),
+    ]),
+    "items": (InspectionItem, "inspection", [
+        ("Inspection ID", "inspection_id"),
+        ("School", "inspection__school__name"),
+        ("Date", "inspection__date"),
+        ("Item ID", "pk"),
+        ("Checklist Item", "checklist_item__text"),
+        ("Passed", "passed"),
+        ("Notes", "notes"),
+    ]),
+    "actions": (CorrectiveAction, "inspection_item__inspection", [
+        ("Inspection ID", "inspection_item__inspection_id"),
+        ("School", "inspection_item__inspection__school__name"),
+        ("Date", "inspection_item__inspection__date"),
+        ("Action ID", "pk"),
+        ("Checklist Item", "inspection_item__checklist_item__text"),
+        ("Status", "status"),
+        ("Assigned To", "assigned_to__user__username"),
+        ("Description", "description"),
+        ("Created", "created_at"),
+        ("Updated", "updated_at"),
+    ]),
+}
+
+FORMATS = ("csv", "xlsx")
+
+
+def export_rows(kind, inspections, appuser=None):
+    """Yield the header and then one tuple per row of ``kind``.
+
+    ``inspections`` is an (already filtered) Inspection queryset; it is used
+    as a subquery, never evaluated. ``appuser`` scopes the rows with their
+    own model's visible_to(): corrective actions by CorrectiveAction's (which
+    adds actions assigned to a manager elsewhere), the rest by Inspection's.
+    """
+    model, inspection_path, columns = EXPORTS[kind]
+
+    rows = model.objects.all()
+    if appuser is not None:
+        if model is CorrectiveAction:
+            rows = rows.visible_to(appuser)
+        else:
+            inspections = inspections.visible_to(appuser)
+
+    if inspection_path == "pk":
+        rows = inspections
+    else:
+        rows = rows.filter(**{f"{inspection_path}__in": inspections.values("pk")})
+
+    yield [header for header, _ in columns]
+    yield from (
+        rows.order_by("pk")
+        .values_list(*[field for _, field in columns])
+        .iterator(chunk_size=CHUNK_SIZE)
+    )
+
+
+# Leading characters that make a spreadsheet evaluate a cell as a formula
+_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def _text(value):
+    """Quote text a spreadsheet would otherwise run as a formula."""
+    if isinstance(value, str) and value.startswith(_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+# ============================================================
+#   CSV
+# ============================================================
+
+class _Echo:
+    """File-like object whose write() returns what it was given."""
+
+    def write(self, value):
+        return value
+
+
+def stream_csv(rows):
+    writer = csv.writer(_Echo())
+    for row in rows:
+        yield writer.writerow([_text(value) for value in row])
+
+
+# ============================================================
+#   XLSX
+# ============================================================
+#
+# A minimal single-sheet workbook written straight into a streamed zip:
+# strings are stored inline, so no shared-string table has to be held in
+# memory, and the sheet XML is compressed as it is produced.
+
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '</Types>'
+)
+
+_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+
+_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="{name}" sheetId="1" r:id="rId1"/></sheets>'
+    '</workbook>'
+)
+
+_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+    'Target="worksheets/sheet1.xml"/>'
+    '</Relationships>'
+)
+
+_SHEET_START = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<sheetData>'
+)
+
+_SHEET_END = '</sheetData></worksheet>'
+
+# Characters XML 1.0 does not allow, even escaped
+_ILLEGAL_XML = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+
+class _Buffer:
+    """Write-only, non-seekable sink that zipfile streams into."""
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def _cell(value):
+    if value is None:
+        return "<c/>"
+    if isinstance(value, bool):
+        return f'<c t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, (int, float)):
+        return f'<c t="n"><v>{value}</v></c>'
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        value = value.isoformat(sep=" ") if isinstance(value, datetime.datetime) else value.isoformat()
+    text = escape(_text(_ILLEGAL_XML.sub("", str(value))))
+    return f'<c t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+def stream_xlsx(rows, sheet_name="Export", rows_per_chunk=500):
+    buffer = _Buffer()
+
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("[Content_Types].xml", _CONTENT_TYPES)
+        zf.writestr("_rels/.rels", _ROOT_RELS)
+        zf.writestr("xl/workbook.xml", _WORKBOOK.format(name=escape(sheet_name[:31])))
+        zf.writestr("xl/_rels/workbook.xml.rels", _WORKBOOK_RELS)
+
+        with zf.open("xl/worksheets/sheet1.xml", "w", force_zip64=True) as sheet:
+            sheet.write(_SHEET_START.encode())
+            pending = []
+            for row in rows:
+                pending.append("<row>" + "".join(_cell(value) for value in row) + "</row>")
+                if len(pending) >= rows_per_chunk:
+                    sheet.write("".join(pending).encode())
+                    pending = []
+                    yield buffer.drain()
+            sheet.write(("".join(pending) + _SHEET_END).encode())
+
+    yield buffer.drain()
+
+
+# ============================================================
+#   ENTRY POINT
+# ============================================================
+
+def stream_export(kind, inspections, fmt, appuser=None):
+    """Byte/str chunks of the ``kind`` export of ``inspections`` as ``fmt``."""
+    rows = export_rows(kind, inspections, appuser)
+    if fmt == "xlsx":
+        return stream_xlsx(rows, sheet_name=kind.title())
+    return stream_csv(rows)
+
+
+def content_type(fmt):
+    if fmt == "xlsx":
+        return "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    return "text/csv"
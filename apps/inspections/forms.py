@@ -2,7 +2,8 @@ from django import forms
 from .models import Inspection
 from apps.users.models import AppUser
 from apps.schools.models import School
-from django.forms import modelformset_factory
+from apps.search import index as search_index
+from django.forms import BaseModelFormSet, modelformset_factory
 from .models import InspectionItem, Inspection
 
 class InspectionForm(forms.ModelForm):
@@ -44,8 +45,62 @@ class InspectionItemForm(forms.ModelForm):
             "notes": forms.Textarea(attrs={"class": "form-control", "rows": 2}),
         }
 
+class FetchedItemField(forms.ModelChoiceField):
+    """The formset's hidden pk field, resolved against rows it already fetched.
+
+    The stock field runs one ``queryset.get()`` per form; this one looks the
+    pk up in the formset's own rows, so pks outside its queryset are invalid.
+    """
+
+    def __init__(self, lookup, *args, **kwargs):
+        self.lookup = lookup
+        super().__init__(*args, **kwargs)
+
+    def to_python(self, value):
+        if value in self.empty_values:
+            return None
+        try:
+            obj = self.lookup(int(value))
+        except (TypeError, ValueError):
+            obj = None
+        if obj is None:
+            raise forms.ValidationError(
+                self.error_messages["invalid_choice"], code="invalid_choice"
+            )
+        return obj
+
+
+class BaseInspectionItemFormSet(BaseModelFormSet):
+    def add_fields(self, form, index):
+        super().add_fields(form, index)
+        field = form.fields[self._pk_field.name]
+        form.fields[self._pk_field.name] = FetchedItemField(
+            self._existing_object, field.queryset,
+            initial=field.initial, required=False, widget=field.widget,
+        )
+
+    def save_changed(self):
+        """Write the changed rows with one bulk UPDATE; return how many.
+
+        ``formset.save()`` issues one UPDATE per changed form. After
+        ``is_valid()`` each form's instance already holds its cleaned values,
+        so only the changed columns of the changed rows are sent.
+        """
+        changed = [form for form in self.forms if form.has_changed()]
+        fields = sorted({name for form in changed for name in form.changed_data})
+        if changed:
+            InspectionItem.objects.bulk_update(
+                [form.instance for form in changed], fields, batch_size=500
+            )
+        if "notes" in fields:
+            # Bulk UPDATE skips the search signals
+            search_index.index_items([form.instance.pk for form in changed])
+        return len(changed)
+
+
 InspectionItemFormSet = modelformset_factory(
     InspectionItem,
     form=InspectionItemForm,
+    formset=BaseInspectionItemFormSet,
     extra=0
 )
\ No newline at end of file
@@ -0,0 +1,73 @@
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Max, Min
+from django.utils import timezone
+
+from apps.inspections.models import (
+    ComplianceRollup, Inspection, RollupBackfill, period_end,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the day / week / month compliance rollups from the item "
+        "table, oldest inspections first, a chunk of months per transaction. "
+        "An interrupted run resumes after the last chunk it committed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--months", type=int, default=1,
+            help="Months of inspections rolled up per transaction (default: 1).",
+        )
+        parser.add_argument(
+            "--restart", action="store_true",
+            help="Start over from the oldest inspection instead of resuming.",
+        )
+
+    def handle(self, *args, **options):
+        if options["months"] < 1:
+            raise CommandError("--months must be at least 1.")
+
+        # Existing rows count too, so rollups of deleted history are cleared
+        inspections = Inspection.objects.filter(
+            status__in=Inspection.FINISHED_STATUSES
+        ).aggregate(first=Min("date"), last=Max("date"))
+        rollups = ComplianceRollup.objects.filter(
+            period=ComplianceRollup.Period.DAY
+        ).aggregate(first=Min("period_start"), last=Max("period_start"))
+        dates = [d for d in (*inspections.values(), *rollups.values()) if d]
+        if not dates:
+            self.stdout.write("No finished inspections to roll up.")
+            return
+        first, last = min(dates), max(dates)
+
+        run = None
+        if not options["restart"]:
+            run = RollupBackfill.objects.filter(finished_at__isnull=True).order_by("-pk").first()
+        if run is None:
+            run = RollupBackfill.objects.create()
+        elif run.through_date:
+            self.stdout.write(f"Resuming after {run.through_date}.")
+
+        one_day = datetime.timedelta(days=1)
+        start = run.through_date + one_day if run.through_date else first
+        while start <= last:
+            end = start
+            for _ in range(options["months"]):
+                end = period_end(ComplianceRollup.Period.MONTH, end) + one_day
+            end = min(end - one_day, last)
+
+            with transaction.atomic():
+                ComplianceRollup.objects.refresh(start, end)
+                run.through_date = end
+                run.save(update_fields=["through_date"])
+
+            self.stdout.write(f"Rolled up {start} to {end}")
+            start = end + one_day
+
+        run.finished_at = timezone.now()
+        run.save(update_fields=["finished_at"])
+        self.stdout.write(self.style.SUCCESS(f"Done: rollups current through {last}."))
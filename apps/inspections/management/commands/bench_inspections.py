@@ -0,0 +1,144 @@
+import datetime
+import json
+import statistics
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+from apps.checklists.models import Checklist, ChecklistItem
+from apps.schools.models import School
+from apps.inspections.models import Inspection
+from apps.inspections.views import exceeds_field_limit, inspection_perform, inspection_submit
+from apps.users.models import AppUser
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark inspection workflows against checklists of increasing size. "
+        "Runs inside a transaction that is rolled back, so no data is kept."
+    )
+
+    # Scenario -> default checklist sizes
+    SCENARIOS = {
+        "create": [10, 100, 1000],
+        "perform": [50, 200, 1000],
+    }
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scenario", choices=list(self.SCENARIOS), default="create",
+            help="Workflow to benchmark (default: create).",
+        )
+        parser.add_argument(
+            "--sizes", type=int, nargs="+",
+            help="Checklist sizes to benchmark (default: per scenario).",
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=5,
+            help="Runs per size; the median is reported (default: 5).",
+        )
+
+    def handle(self, *args, **options):
+        name = options["scenario"]
+        scenario = getattr(self, f"bench_{name}")
+        # Optional untimed setup; its result is passed to the scenario
+        prepare = getattr(self, f"prepare_{name}", lambda school, checklist: None)
+
+        self.stdout.write(f"{'items':>6}  {'median ms':>10}  {'queries':>7}")
+        for size in options["sizes"] or self.SCENARIOS[name]:
+            with transaction.atomic():
+                checklist = self.make_checklist(size)
+                school = School.objects.create(name=f"Bench School {size}")
+
+                timings, queries = [], 0
+                for _ in range(options["repeat"]):
+                    state = prepare(school, checklist)
+                    with CaptureQueriesContext(connection) as ctx:
+                        start = time.perf_counter()
+                        scenario(school, checklist, state)
+                        timings.append(time.perf_counter() - start)
+                    queries = len(ctx.captured_queries)
+
+                transaction.set_rollback(True)
+
+            median_ms = statistics.median(timings) * 1000
+            self.stdout.write(f"{size:>6}  {median_ms:>10.2f}  {queries:>7}")
+
+    # ------------------------------------------------------------
+    #   Fixtures
+    # ------------------------------------------------------------
+
+    def make_checklist(self, size):
+        checklist = Checklist.objects.create(name=f"Bench Checklist ({size} items)")
+        ChecklistItem.objects.bulk_create(
+            ChecklistItem(checklist=checklist, text=f"Check #{n}", order=n)
+            for n in range(size)
+        )
+        return checklist
+
+    # ------------------------------------------------------------
+    #   Scenarios
+    # ------------------------------------------------------------
+
+    def bench_create(self, school, checklist, state):
+        inspection = Inspection.objects.create(
+            school=school, checklist=checklist, date=datetime.date.today()
+        )
+        inspection.initialize_items()
+
+    def prepare_perform(self, school, checklist):
+        """A fresh inspection and the POST of its results, every 10th item failed.
+
+        Like the perform page, checklists over the form field limit are sent
+        to inspection_submit as JSON instead of the formset.
+        """
+        admin = User.objects.filter(username="bench_admin").first()
+        if admin is None:
+            admin = User.objects.create_user("bench_admin", password="bench")
+            admin.appuser.role = AppUser.Role.ADMIN
+            admin.appuser.save()
+
+        inspection = Inspection.objects.create(
+            school=school, checklist=checklist, date=datetime.date.today()
+        )
+        inspection.initialize_items()
+
+        item_pks = list(inspection.inspection_items.order_by("pk").values_list("pk", flat=True))
+        if exceeds_field_limit(len(item_pks)):
+            payload = {
+                "idempotency_key": f"bench-{inspection.pk}",
+                "action": "complete",
+                "results": [
+                    {"id": pk, "passed": bool(n % 10), "notes": ""} for n, pk in enumerate(item_pks)
+                ],
+            }
+            request = RequestFactory().post(
+                f"/inspections/{inspection.pk}/submit/", json.dumps(payload),
+                content_type="application/json",
+            )
+            request.user = admin
+            return inspection_submit, 200, inspection, request
+
+        data = {
+            "form-TOTAL_FORMS": str(len(item_pks)),
+            "form-INITIAL_FORMS": str(len(item_pks)),
+            "complete_inspection": "1",
+        }
+        for n, pk in enumerate(item_pks):
+            data[f"form-{n}-id"] = str(pk)
+            data[f"form-{n}-notes"] = ""
+            if n % 10:
+                data[f"form-{n}-passed"] = "on"
+
+        request = RequestFactory().post(f"/inspections/{inspection.pk}/perform/", data)
+        request.user = admin
+        return inspection_perform, 302, inspection, request
+
+    def bench_perform(self, school, checklist, state):
+        view, expected, inspection, request = state
+        response = view(request, pk=inspection.pk)
+        assert response.status_code == expected, response.status_code
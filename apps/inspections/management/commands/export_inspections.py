@@ -0,0 +1,53 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.inspections import exports
+from apps.inspections.models import Inspection
+from apps.users.models import AppUser
+
+
+class Command(BaseCommand):
+    help = (
+        "Export inspections, inspection items or corrective actions as CSV or "
+        "XLSX, streamed with a chunked cursor. Accepts the inspection list "
+        "filters and, optionally, a user whose visibility scopes the export."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("kind", choices=sorted(exports.EXPORTS))
+        parser.add_argument("--format", choices=exports.FORMATS, default="csv")
+        parser.add_argument("--output", "-o",
+                            help="File to write (default: stdout, CSV only).")
+        parser.add_argument("--school", help="School id.")
+        parser.add_argument("--status", choices=Inspection.Status.values)
+        parser.add_argument("--date", help="Inspection date (YYYY-MM-DD).")
+        parser.add_argument("--as-user", metavar="USERNAME",
+                            help="Only export what this user can see.")
+
+    def handle(self, *args, **options):
+        if options["format"] == "xlsx" and not options["output"]:
+            raise CommandError("--output is required for XLSX exports.")
+
+        appuser = None
+        if options["as_user"]:
+            try:
+                appuser = AppUser.objects.get(user__username=options["as_user"])
+            except AppUser.DoesNotExist:
+                raise CommandError(f"No user '{options['as_user']}'.")
+        inspections = Inspection.objects.filtered(options)
+
+        chunks = exports.stream_export(options["kind"], inspections, options["format"], appuser)
+
+        if not options["output"]:
+            for chunk in chunks:
+                sys.stdout.write(chunk)
+            return
+
+        mode = "wb" if options["format"] == "xlsx" else "w"
+        newline = None if mode == "wb" else ""
+        with open(options["output"], mode, newline=newline) as fh:
+            for chunk in chunks:
+                fh.write(chunk)
+
+        self.stdout.write(self.style.SUCCESS(f"Wrote {options['output']}"))
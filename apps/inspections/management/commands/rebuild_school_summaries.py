@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from apps.inspections.models import SchoolSummary
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute every school's SchoolSummary (pass rate, open actions, last "
+        "inspection date) from the inspection and action tables. Run after "
+        "bulk loads that bypass signals."
+    )
+
+    def handle(self, *args, **options):
+        count = SchoolSummary.objects.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {count} school summaries."))
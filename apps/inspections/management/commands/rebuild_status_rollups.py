@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from apps.inspections.models import StatusRollup
+
+
+class Command(BaseCommand):
+    help = (
+        "Recount the StatusRollup table from Inspection and CorrectiveAction. "
+        "Run once before enabling DASHBOARD_USE_ROLLUPS, and after bulk loads."
+    )
+
+    def handle(self, *args, **options):
+        StatusRollup.objects.rebuild()
+
+        for kind in StatusRollup.Kind:
+            totals = StatusRollup.objects.totals(kind)
+            self.stdout.write(f"{kind.label}: {totals['total']} rows")
+            for status, count in sorted(totals.items()):
+                if status != "total":
+                    self.stdout.write(f"  {status:<24} {count}")
+
+        self.stdout.write(self.style.SUCCESS("Status rollups rebuilt."))
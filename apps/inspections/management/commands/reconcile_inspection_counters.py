@@ -0,0 +1,58 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.inspections.models import Inspection, counter_expressions
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute Inspection's denormalized counters (total/answered/failed "
+        "items, unresolved actions) from the item and action tables."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=1000,
+            help="Inspections updated per transaction (default: 1000).",
+        )
+        parser.add_argument(
+            "--check", action="store_true",
+            help="Only report drifted inspections; don't write anything.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+
+        if options["check"]:
+            drifted = self.find_drifted()
+            self.stdout.write(f"{len(drifted)} inspection(s) with drifted counters.")
+            for pk in drifted[:50]:
+                self.stdout.write(f"  #{pk}")
+            return
+
+        updated, last_pk = 0, 0
+        while True:
+            pks = list(
+                Inspection.objects.filter(pk__gt=last_pk)
+                .order_by("pk")
+                .values_list("pk", flat=True)[:batch_size]
+            )
+            if not pks:
+                break
+
+            with transaction.atomic():
+                updated += Inspection.objects.filter(pk__in=pks).refresh_counters()
+
+            last_pk = pks[-1]
+            self.stdout.write(f"Reconciled {updated} inspections (up to #{last_pk})")
+
+        self.stdout.write(self.style.SUCCESS(f"Done: {updated} inspections reconciled."))
+
+    def find_drifted(self):
+        expected = {f"expected_{name}": expr for name, expr in counter_expressions().items()}
+        rows = Inspection.objects.annotate(**expected).values_list(
+            "pk", *Inspection.COUNTER_FIELDS, *expected
+        )
+
+        n = len(Inspection.COUNTER_FIELDS)
+        return [row[0] for row in rows.iterator() if row[1:n + 1] != row[n + 1:]]
@@ -0,0 +1,52 @@
+from django.db import migrations, models
+
+from apps.core.operations import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction on PostgreSQL
+    atomic = False
+
+    dependencies = [
+        ('inspections', '0006_auto_20251114_1553'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='correctiveaction',
+            index=models.Index(fields=['status', 'created_at'], name='ca_status_created_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='correctiveaction',
+            index=models.Index(fields=['inspection_item', 'status'], name='ca_item_status_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='correctiveaction',
+            index=models.Index(fields=['assigned_to', 'status'], name='ca_assignee_status_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='correctiveaction',
+            index=models.Index(condition=models.Q(('status__in', ['OPEN', 'IN_PROGRESS', 'AWAITING_REINSPECTION'])), fields=['inspection_item'], name='ca_unresolved_item_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='inspection',
+            index=models.Index(fields=['school', '-date'], name='insp_school_date_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='inspection',
+            index=models.Index(fields=['inspector', '-date'], name='insp_inspector_date_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='inspection',
+            index=models.Index(fields=['status', 'id'], name='insp_status_id_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='inspection',
+            index=models.Index(fields=['date', 'id'], name='insp_date_id_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='inspectionitem',
+            index=models.Index(fields=['inspection', 'passed'], name='inspitem_insp_passed_idx'),
+        ),
+    ]
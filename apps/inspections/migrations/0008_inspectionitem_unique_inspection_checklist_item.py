@@ -0,0 +1,40 @@
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+def merge_duplicate_items(apps, schema_editor):
+    """Collapse duplicate (inspection, checklist_item) rows onto the oldest one."""
+    InspectionItem = apps.get_model('inspections', 'InspectionItem')
+    CorrectiveAction = apps.get_model('inspections', 'CorrectiveAction')
+
+    duplicates = (
+        InspectionItem.objects.values('inspection_id', 'checklist_item_id')
+        .annotate(keep_id=Min('id'), n=Count('id'))
+        .filter(n__gt=1)
+    )
+
+    for dup in duplicates:
+        extra = InspectionItem.objects.filter(
+            inspection_id=dup['inspection_id'],
+            checklist_item_id=dup['checklist_item_id'],
+        ).exclude(id=dup['keep_id'])
+
+        CorrectiveAction.objects.filter(inspection_item__in=extra).update(
+            inspection_item_id=dup['keep_id']
+        )
+        extra.delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inspections', '0007_composite_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_items, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='inspectionitem',
+            constraint=models.UniqueConstraint(fields=('inspection', 'checklist_item'), name='unique_inspection_checklist_item'),
+        ),
+    ]
@@ -0,0 +1,64 @@
+from django.db import migrations, models
+from django.db.models import F, Func, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def _count(queryset):
+    return Coalesce(
+        Subquery(
+            queryset.order_by()
+            .annotate(n=Func(F('pk'), function='COUNT'))
+            .values('n')
+        ),
+        0,
+    )
+
+
+def backfill_counters(apps, schema_editor):
+    Inspection = apps.get_model('inspections', 'Inspection')
+    InspectionItem = apps.get_model('inspections', 'InspectionItem')
+    CorrectiveAction = apps.get_model('inspections', 'CorrectiveAction')
+
+    items = InspectionItem.objects.filter(inspection=OuterRef('pk'))
+    Inspection.objects.update(
+        total_items=_count(items),
+        answered_items=_count(items.filter(passed__isnull=False)),
+        failed_items=_count(items.filter(passed=False)),
+        unresolved_actions=_count(
+            CorrectiveAction.objects.filter(
+                inspection_item__inspection=OuterRef('pk'),
+                status__in=['OPEN', 'IN_PROGRESS', 'AWAITING_REINSPECTION'],
+            )
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inspections', '0008_inspectionitem_unique_inspection_checklist_item'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='inspection',
+            name='answered_items',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='inspection',
+            name='failed_items',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='inspection',
+            name='total_items',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='inspection',
+            name='unresolved_actions',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.8 on 2026-10-18 11:53
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def populate_rollups(apps, schema_editor):
+    StatusRollup = apps.get_model('inspections', 'StatusRollup')
+    sources = {
+        'INSPECTION': apps.get_model('inspections', 'Inspection'),
+        'CORRECTIVE_ACTION': apps.get_model('inspections', 'CorrectiveAction'),
+    }
+    for kind, model in sources.items():
+        rows = model.objects.order_by().values('status').annotate(n=Count('pk'))
+        StatusRollup.objects.bulk_create(
+            StatusRollup(kind=kind, status=row['status'], count=row['n']) for row in rows
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inspections', '0009_inspection_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StatusRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('INSPECTION', 'Inspection'), ('CORRECTIVE_ACTION', 'Corrective Action')], max_length=20)),
+                ('status', models.CharField(max_length=50)),
+                ('count', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Status Rollup',
+                'verbose_name_plural': 'Status Rollups',
+                'constraints': [models.UniqueConstraint(fields=('kind', 'status'), name='unique_rollup_kind_status')],
+            },
+        ),
+        migrations.RunPython(populate_rollups, migrations.RunPython.noop),
+    ]
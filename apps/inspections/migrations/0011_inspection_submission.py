@@ -0,0 +1,32 @@
+# Generated by Django 5.2.8 on 2026-10-18 12:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inspections', '0010_status_rollup'),
+        ('users', '0004_alter_appuser_options'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InspectionSubmission',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=100)),
+                ('payload_hash', models.CharField(max_length=64)),
+                ('response', models.JSONField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('inspection', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='submissions', to='inspections.inspection')),
+                ('submitted_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='users.appuser')),
+            ],
+            options={
+                'verbose_name': 'Inspection Submission',
+                'verbose_name_plural': 'Inspection Submissions',
+                'constraints': [models.UniqueConstraint(fields=('inspection', 'key'), name='unique_submission_key')],
+            },
+        ),
+    ]
@@ -0,0 +1,53 @@
+import hashlib
+import json
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def _version_hash(checklist_id, items):
+    # Same as apps.checklists.models.version_hash
+    content = json.dumps(
+        {'checklist': checklist_id, 'items': [list(item) for item in items]},
+        separators=(',', ':'), ensure_ascii=False,
+    )
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+def pin_current_versions(apps, schema_editor):
+    # Earlier content is gone, so existing inspections pin the checklist as it is now
+    Checklist = apps.get_model('checklists', 'Checklist')
+    ChecklistItem = apps.get_model('checklists', 'ChecklistItem')
+    ChecklistVersion = apps.get_model('checklists', 'ChecklistVersion')
+    Inspection = apps.get_model('inspections', 'Inspection')
+
+    for checklist_id in Checklist.objects.values_list('pk', flat=True):
+        items = list(
+            ChecklistItem.objects.filter(checklist_id=checklist_id)
+            .order_by('order', 'pk')
+            .values_list('pk', 'order', 'text')
+        )
+        content_hash = _version_hash(checklist_id, items)
+        ChecklistVersion.objects.get_or_create(
+            content_hash=content_hash,
+            defaults={'checklist_id': checklist_id, 'items': items},
+        )
+        Checklist.objects.filter(pk=checklist_id).update(current_version_id=content_hash)
+        Inspection.objects.filter(checklist_id=checklist_id).update(checklist_version_id=content_hash)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('checklists', '0002_checklist_versions'),
+        ('inspections', '0011_inspection_submission'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='inspection',
+            name='checklist_version',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='inspections', to='checklists.checklistversion'),
+        ),
+        migrations.RunPython(pin_current_versions, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 5.2.8 on 2026-10-18 12:31
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Max, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+
+
+def populate_summaries(apps, schema_editor):
+    # Same aggregates as apps.inspections.models.summary_aggregates
+    School = apps.get_model('schools', 'School')
+    SchoolSummary = apps.get_model('inspections', 'SchoolSummary')
+    CorrectiveAction = apps.get_model('inspections', 'CorrectiveAction')
+
+    open_actions = (
+        CorrectiveAction.objects.filter(
+            inspection_item__inspection__school=OuterRef('pk'),
+            status__in=['OPEN', 'IN_PROGRESS', 'AWAITING_REINSPECTION'],
+        )
+        .order_by().values('inspection_item__inspection__school')
+        .annotate(n=Count('pk')).values('n')
+    )
+    rows = School.objects.order_by().values('pk').annotate(
+        passed_inspections=Count('inspections', filter=Q(inspections__status__in=['PASSED', 'COMPLETED'])),
+        failed_inspections=Count('inspections', filter=Q(inspections__status='FAILED')),
+        last_inspection_date=Max(
+            'inspections__date', filter=Q(inspections__status__in=['PASSED', 'COMPLETED', 'FAILED'])
+        ),
+        open_actions=Coalesce(Subquery(open_actions), 0),
+    )
+    SchoolSummary.objects.bulk_create(
+        (SchoolSummary(school_id=row.pop('pk'), **row) for row in rows.iterator()),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inspections', '0012_inspection_checklist_version'),
+        ('schools', '0005_alter_school_address_alter_school_phone_number_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SchoolSummary',
+            fields=[
+                ('school', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='summary', serialize=False, to='schools.school')),
+                ('passed_inspections', models.PositiveIntegerField(default=0)),
+                ('failed_inspections', models.PositiveIntegerField(default=0)),
+                ('open_actions', models.PositiveIntegerField(default=0)),
+                ('last_inspection_date', models.DateField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'School Summary',
+                'verbose_name_plural': 'School Summaries',
+            },
+        ),
+        migrations.RunPython(populate_summaries, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.8 on 2026-10-18 12:37
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('checklists', '0002_checklist_versions'),
+        ('inspections', '0013_school_summary'),
+        ('schools', '0005_alter_school_address_alter_school_phone_number_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RollupBackfill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('started_at', models.DateTimeField(auto_now_add=True)),
+                ('through_date', models.DateField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Rollup Backfill',
+                'verbose_name_plural': 'Rollup Backfills',
+            },
+        ),
+        migrations.CreateModel(
+            name='ComplianceRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.CharField(choices=[('DAY', 'Day'), ('WEEK', 'Week'), ('MONTH', 'Month')], max_length=5)),
+                ('period_start', models.DateField()),
+                ('passed_items', models.PositiveIntegerField(default=0)),
+                ('failed_items', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('checklist', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='checklists.checklist')),
+                ('checklist_item', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='checklists.checklistitem')),
+                ('school', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='schools.school')),
+            ],
+            options={
+                'verbose_name': 'Compliance Rollup',
+                'verbose_name_plural': 'Compliance Rollups',
+                'indexes': [models.Index(fields=['period', 'school', 'period_start'], name='compliance_school_idx'), models.Index(fields=['period', 'checklist', 'period_start'], name='compliance_checklist_idx'), models.Index(fields=['period', 'checklist_item', 'period_start'], name='compliance_item_idx')],
+                'constraints': [models.UniqueConstraint(fields=('period', 'period_start', 'school', 'checklist_item'), name='unique_compliance_rollup')],
+            },
+        ),
+    ]
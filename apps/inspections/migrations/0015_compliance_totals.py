@@ -0,0 +1,65 @@
+# Generated by Django 5.2.8 on 2026-10-18 12:51
+
+from django.db import migrations, models
+from django.db.models import Sum
+
+
+# Level -> rollup column summed over (None: the whole district)
+LEVELS = {
+    'SCHOOL': 'school_id',
+    'ITEM': 'checklist_item_id',
+    'CHECKLIST': 'checklist_id',
+    'DISTRICT': None,
+}
+
+
+def populate_totals(apps, schema_editor):
+    # Same sums as ComplianceTotal.objects.refresh, over the existing rollups
+    ComplianceRollup = apps.get_model('inspections', 'ComplianceRollup')
+    ComplianceTotal = apps.get_model('inspections', 'ComplianceTotal')
+
+    for level, column in LEVELS.items():
+        group = ['period', 'period_start'] + ([column] if column else [])
+        rows = ComplianceRollup.objects.order_by().values(*group).annotate(
+            passed=Sum('passed_items'), failed=Sum('failed_items'),
+        )
+        ComplianceTotal.objects.bulk_create(
+            (
+                ComplianceTotal(
+                    period=row['period'], period_start=row['period_start'], level=level,
+                    object_id=row[column] if column else 0,
+                    passed_items=row['passed'], failed_items=row['failed'],
+                )
+                for row in rows.iterator()
+            ),
+            batch_size=1000,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inspections', '0014_compliance_rollups'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ComplianceTotal',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.CharField(choices=[('DAY', 'Day'), ('WEEK', 'Week'), ('MONTH', 'Month')], max_length=5)),
+                ('period_start', models.DateField()),
+                ('level', models.CharField(choices=[('SCHOOL', 'School'), ('ITEM', 'Checklist item'), ('CHECKLIST', 'Checklist'), ('DISTRICT', 'District')], max_length=10)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('passed_items', models.PositiveIntegerField(default=0)),
+                ('failed_items', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Compliance Total',
+                'verbose_name_plural': 'Compliance Totals',
+                'constraints': [models.UniqueConstraint(fields=('period', 'level', 'object_id', 'period_start'), name='unique_compliance_total')],
+            },
+        ),
+        migrations.RunPython(populate_totals, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.8 on 2026-10-18 12:53
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('checklists', '0002_checklist_versions'),
+        ('inspections', '0015_compliance_totals'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='inspectionitem',
+            name='checklist_item',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, to='checklists.checklistitem'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+from django.db import migrations, models
+
+from apps.core.operations import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction on PostgreSQL
+    atomic = False
+
+    dependencies = [
+        ('inspections', '0016_protect_checklist_item_history'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='correctiveaction',
+            index=models.Index(fields=['created_at', 'id'], name='ca_created_id_idx'),
+        ),
+    ]
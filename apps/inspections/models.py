@@ -1,7 +1,223 @@
-from django.db import models
+import datetime
+from collections import defaultdict
+from functools import reduce
+from operator import or_
+
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, models, transaction
+from django.db.models import (
+    Case, Count, Exists, F, Func, Max, OuterRef, Q, Subquery, Sum, Value, When,
+)
+from django.db.models.functions import Coalesce, Now, TruncMonth, TruncWeek
 from apps.users.models import AppUser
 from apps.schools.models import School
-from apps.checklists.models import Checklist, ChecklistItem
+from apps.checklists import cache as checklist_cache
+from apps.checklists.models import Checklist, ChecklistItem, ChecklistVersion
+
+
+# ============================================================
+#   ROLE SCOPING
+# ============================================================
+
+def _school_member(appuser, school_ref):
+    """EXISTS over the school membership table matching the user's role.
+
+    ``school_ref`` is the outer query's path to the school id.
+    Returns None for roles that aren't scoped by school membership.
+    """
+    through = {
+        AppUser.Role.MANAGER: School.managers.through,
+        AppUser.Role.KITCHEN: School.kitchen_staff.through,
+    }.get(appuser.role)
+
+    if through is None:
+        return None
+
+    return Exists(
+        through.objects.filter(school_id=OuterRef(school_ref), appuser_id=appuser.pk)
+    )
+
+
+def _param(value, field):
+    """``value`` converted by the model ``field``, or None if empty or invalid.
+
+    List filters come straight from request.GET; a malformed id or date is
+    ignored rather than reaching the database.
+    """
+    if not value:
+        return None
+    try:
+        return field.to_python(value)
+    except ValidationError:
+        return None
+
+
+def search_index():
+    # apps.search.index imports these models, so it can't be imported at the top
+    from apps.search import index
+    return index
+
+
+# ============================================================
+#   DENORMALIZED COUNTERS
+# ============================================================
+
+def _count(queryset):
+    """Correlated ``(SELECT COUNT(*) ...)`` usable inside an UPDATE."""
+    return Coalesce(
+        Subquery(
+            queryset.order_by()
+            .annotate(n=Func(F("pk"), function="COUNT"))
+            .values("n")
+        ),
+        0,
+    )
+
+
+def counter_expressions():
+    """SET clauses that recompute Inspection's counter columns."""
+    items = InspectionItem.objects.filter(inspection=OuterRef("pk"))
+    return {
+        "total_items": _count(items),
+        "answered_items": _count(items.filter(passed__isnull=False)),
+        "failed_items": _count(items.filter(passed=False)),
+        "unresolved_actions": _count(
+            CorrectiveAction.objects.filter(
+                inspection_item__inspection=OuterRef("pk"),
+                status__in=CorrectiveAction.UNRESOLVED_STATUSES,
+            )
+        ),
+    }
+
+
+class UnknownItemsError(ValueError):
+    """Item ids that don't belong to the inspection being updated."""
+
+    def __init__(self, ids):
+        super().__init__(f"Unknown item ids: {ids}")
+        self.ids = ids
+
+
+class _TableCount(Subquery):
+    """Uncorrelated ``(SELECT COUNT(*) ...)`` accepted by aggregate().
+
+    One value for the whole query, so it can share a SELECT with real
+    aggregates over another table.
+    """
+
+    contains_aggregate = True
+
+    def __init__(self, queryset):
+        super().__init__(
+            queryset.order_by().annotate(n=Func(F("pk"), function="COUNT")).values("n")
+        )
+
+
+class StatusCountsMixin:
+
+    def status_counts(self, **extra):
+        """Row count per status plus ``total`` in one conditional aggregate.
+
+        ``extra`` aggregates are computed in the same query.
+        """
+        statuses = self.model.Status.values
+        return self.order_by().aggregate(
+            total=Count("pk"),
+            **{status: Count("pk", filter=Q(status=status)) for status in statuses},
+            **extra,
+        )
+
+
+class InspectionQuerySet(StatusCountsMixin, models.QuerySet):
+
+    def visible_to(self, appuser):
+        """Inspections the given AppUser may see.
+
+        Admin: all. Manager / Kitchen: their schools. Inspector: their own.
+        """
+        if appuser.role == AppUser.Role.ADMIN:
+            return self
+
+        if appuser.role == AppUser.Role.INSPECTOR:
+            return self.filter(inspector=appuser)
+
+        membership = _school_member(appuser, "school_id")
+        if membership is None:
+            return self.none()
+        return self.filter(membership)
+
+    def filtered(self, params):
+        """Apply the inspection list filters (``school``, ``status``, ``date``).
+
+        ``params`` is request.GET or any mapping; empty or malformed values
+        are ignored.
+        """
+        qs = self
+        school = _param(params.get("school"), Inspection.school.field)
+        if school is not None:
+            qs = qs.filter(school_id=school)
+        if params.get("status"):
+            qs = qs.filter(status=params["status"])
+        date = _param(params.get("date"), Inspection.date.field)
+        if date is not None:
+            qs = qs.filter(date=date)
+        return qs
+
+    def refresh_counters(self):
+        """Recompute the counter columns of every matched row in one UPDATE."""
+        return self.update(**counter_expressions())
+
+
+class CorrectiveActionQuerySet(StatusCountsMixin, models.QuerySet):
+
+    def visible_to(self, appuser):
+        """Corrective actions the given AppUser may see.
+
+        Admin: all. Manager: their schools or assigned to them.
+        Inspector: from inspections they performed. Kitchen: their schools.
+        """
+        if appuser.role == AppUser.Role.ADMIN:
+            return self
+
+        if appuser.role == AppUser.Role.INSPECTOR:
+            return self.filter(inspection_item__inspection__inspector=appuser)
+
+        membership = _school_member(appuser, "inspection_item__inspection__school_id")
+        if membership is None:
+            return self.none()
+
+        if appuser.role == AppUser.Role.MANAGER:
+            return self.filter(Q(assigned_to=appuser) | Q(membership))
+        return self.filter(membership)
+
+    def filtered(self, params, appuser):
+        """Apply the action list filters (``school``, ``status``, ``assignee``).
+
+        ``assignee`` is ``me`` (``appuser``), ``none`` or an AppUser id;
+        malformed ids are ignored.
+        """
+        qs = self
+        school = _param(params.get("school"), Inspection.school.field)
+        if school is not None:
+            qs = qs.filter(inspection_item__inspection__school_id=school)
+        if params.get("status"):
+            qs = qs.filter(status=params["status"])
+
+        assignee = params.get("assignee")
+        if assignee == "me":
+            qs = qs.filter(assigned_to=appuser)
+        elif assignee == "none":
+            qs = qs.filter(assigned_to__isnull=True)
+        elif _param(assignee, CorrectiveAction.assigned_to.field) is not None:
+            qs = qs.filter(assigned_to_id=assignee)
+        return qs
+
+    def latest_per_item(self):
+        """Only the newest corrective action of each inspection item."""
+        newer = CorrectiveAction.objects.filter(
+            inspection_item=OuterRef("inspection_item"), pk__gt=OuterRef("pk")
+        )
+        return self.exclude(Exists(newer))
 
 
 class Inspection(models.Model):
@@ -11,6 +227,10 @@ class Inspection(models.Model):
         FAILED = "FAILED", "Failed"
         PASSED = "PASSED", "Passed"
 
+    # Outcomes counted by the school summary (COMPLETED is a pass, as in the views)
+    PASSING_STATUSES = (Status.PASSED, Status.COMPLETED)
+    FINISHED_STATUSES = (*PASSING_STATUSES, Status.FAILED)
+
     school = models.ForeignKey(School, on_delete=models.CASCADE, related_name="inspections")
     inspector = models.ForeignKey(
         AppUser,
@@ -35,38 +255,295 @@ class Inspection(models.Model):
         blank=True,
         related_name="inspections"
     )
+    # Checklist content the inspection was created from (see initialize_items)
+    checklist_version = models.ForeignKey(
+        ChecklistVersion,
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name="inspections",
+    )
     date = models.DateField()
     status = models.CharField(max_length=50, choices=Status.choices, default=Status.PENDING)
     notes = models.TextField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Denormalized counters, maintained by refresh_counters()
+    total_items = models.PositiveIntegerField(default=0, editable=False)
+    answered_items = models.PositiveIntegerField(default=0, editable=False)
+    failed_items = models.PositiveIntegerField(default=0, editable=False)
+    unresolved_actions = models.PositiveIntegerField(default=0, editable=False)
+
+    COUNTER_FIELDS = ("total_items", "answered_items", "failed_items", "unresolved_actions")
+
+    objects = InspectionQuerySet.as_manager()
+
     class Meta:
         ordering = ['-date']
         verbose_name = "Inspection"
         verbose_name_plural = "Inspections"
+        indexes = [
+            # Role-scoped lists: school / inspector filter, newest first
+            models.Index(fields=["school", "-date"], name="insp_school_date_idx"),
+            models.Index(fields=["inspector", "-date"], name="insp_inspector_date_idx"),
+            # Status filter and keyset pagination (sort column + pk)
+            models.Index(fields=["status", "id"], name="insp_status_id_idx"),
+            models.Index(fields=["date", "id"], name="insp_date_id_idx"),
+        ]
 
     def __str__(self):
         return f"{self.school.name} - {self.date} ({self.get_status_display()})"
     
+    @property
+    def progress_percent(self):
+        if not self.total_items:
+            return 0
+        return round(100 * self.answered_items / self.total_items)
+
+    def refresh_counters(self):
+        """Recompute this inspection's counters in the database and reload them.
+
+        Call it last in any transaction that changes items or actions; a later
+        full save() of a stale instance would otherwise write old values back.
+        """
+        Inspection.objects.filter(pk=self.pk).refresh_counters()
+        self.refresh_from_db(fields=self.COUNTER_FIELDS)
+
+    def refresh_compliance(self):
+        """Recompute the compliance rollups of this inspection's school and day."""
+        ComplianceRollup.objects.refresh(self.date, school_ids=[self.school_id])
+
+    def save(self, *args, **kwargs):
+        # Pin the checklist version the inspection is created from
+        if self._state.adding and self.checklist_id and not self.checklist_version_id:
+            self.checklist_version_id = ChecklistVersion.objects.current(self.checklist_id)
+        super().save(*args, **kwargs)
+
     def initialize_items(self):
-        for checklist_item in self.checklist.items.all():
-            InspectionItem.objects.get_or_create(
-                inspection=self,
-                checklist_item=checklist_item,
-                defaults=None  # or None if you want blank
+        """Materialize one InspectionItem per item of the pinned checklist version.
+
+        The items come from the compiled version (process / shared cache, so
+        the checklist is read once per version, not per inspection) and go in
+        with one batched INSERT that skips rows already present, so calling
+        it again is a no-op. The counters are refreshed in the same transaction.
+        """
+        if not self.checklist_id:
+            return
+
+        with transaction.atomic():
+            if not self.checklist_version_id:
+                self.checklist_version_id = ChecklistVersion.objects.current(self.checklist_id)
+                Inspection.objects.filter(pk=self.pk).update(
+                    checklist_version_id=self.checklist_version_id
+                )
+
+            checklist = checklist_cache.compiled(self.checklist_version_id)
+            InspectionItem.objects.bulk_create(
+                [
+                    InspectionItem(inspection=self, checklist_item_id=item_id, passed=None)
+                    for item_id in checklist.item_ids
+                ],
+                ignore_conflicts=True,
             )
+            self.refresh_counters()
+
+    def item_texts(self, checklist_item_ids):
+        """``{checklist_item_id: text}`` as of the pinned checklist version.
+
+        Ids the version doesn't know (no version pinned, or items added to
+        the inspection by hand) fall back to the live text in one query.
+        """
+        texts = {}
+        if self.checklist_version_id:
+            texts = checklist_cache.compiled(self.checklist_version_id).texts
+
+        missing = set(checklist_item_ids) - texts.keys()
+        if missing:
+            texts = {
+                **texts,
+                **dict(ChecklistItem.objects.filter(pk__in=missing).values_list("pk", "text")),
+            }
+        return texts
+
+    def attach_texts(self, items):
+        """Set ``text`` on each of ``items`` from item_texts(); returns them as a list."""
+        items = list(items)
+        texts = self.item_texts({item.checklist_item_id for item in items})
+        for item in items:
+            item.text = texts.get(item.checklist_item_id, "")
+        return items
+
+    def apply_results(self, results):
+        """Write item results given as ``{item_pk: {"passed": ..., "notes": ...}}``.
 
+        The items are read in one query and only those whose values actually
+        change are written, with one bulk_update. A field left out of a
+        result keeps its current value. Returns the number of items written;
+        raises UnknownItemsError for ids that aren't items of this inspection.
+        """
+        # Not self.inspection_items: the related manager would read the
+        # deferred inspection_id of every row to attach ``self``
+        items = list(
+            InspectionItem.objects.filter(inspection=self, pk__in=list(results))
+            .only(*InspectionItem.RESULT_FIELDS)
+        )
+        unknown = set(results) - {item.pk for item in items}
+        if unknown:
+            raise UnknownItemsError(sorted(unknown))
+
+        changed = []
+        for item in items:
+            result = results[item.pk]
+            updates = {
+                name: result[name] for name in InspectionItem.RESULT_FIELDS
+                if name in result and getattr(item, name) != result[name]
+            }
+            if updates:
+                for name, value in updates.items():
+                    setattr(item, name, value)
+                changed.append(item)
+
+        InspectionItem.objects.bulk_update(changed, InspectionItem.RESULT_FIELDS)
+        # Bulk UPDATE skips the search signals
+        search_index().index_items([item.pk for item in changed])
+        return len(changed)
+
+    def default_assignee(self):
+        """Who corrective actions go to: first kitchen staff, else first manager."""
+        return (
+            self.school.kitchen_staff.first()
+            or self.school.managers.first()
+        )
+
+    def complete(self):
+        """Mark the inspection FAILED or PASSED from its item results.
+
+        Every failed item gets a corrective action. The failed items come from
+        one query and their text from the pinned checklist version, the
+        assignee is resolved once, and all actions are written with a single
+        bulk INSERT.
+        """
+        previous_status = self.status
+        with transaction.atomic():
+            failed_items = list(
+                self.inspection_items.filter(passed=False)
+                .values_list("pk", "checklist_item_id")
+            )
+
+            if failed_items:
+                texts = self.item_texts(item_id for _, item_id in failed_items)
+                assignee = self.default_assignee()
+                actions = CorrectiveAction.objects.bulk_create([
+                    CorrectiveAction(
+                        inspection_item_id=item_id,
+                        assigned_to=assignee,
+                        description=f"Correct issue: {texts[checklist_item_id]}",
+                    )
+                    for item_id, checklist_item_id in failed_items
+                ])
+                # Bulk INSERT skips the search signals
+                search_index().index_actions([action.pk for action in actions])
+                StatusRollup.objects.adjust(
+                    StatusRollup.Kind.CORRECTIVE_ACTION,
+                    {CorrectiveAction.Status.OPEN: len(failed_items)},
+                )
+                SchoolSummary.objects.adjust_open_actions([self.school_id], len(failed_items))
+                self.status = self.Status.FAILED
+            else:
+                self.status = self.Status.PASSED
+
+            self.save()
+            self.refresh_counters()
+            if self.status == previous_status:
+                # Re-completed: the save signal only refreshes on a status change
+                self.refresh_compliance()
+
+    def apply_reinspection(self, inspection_items):
+        """Record reinspection results for ``inspection_items``.
+
+        One conditional UPDATE moves their corrective actions to REINSPECTED
+        (item passed) or OPEN (item failed), then the counter refresh decides
+        whether the inspection is still FAILED.
+        """
+        previous_status = self.status
+        with transaction.atomic():
+            item_passed = InspectionItem.objects.filter(
+                pk=OuterRef("inspection_item_id"), passed=True
+            )
+
+            # Pinned: a queryset filtered on action status would match other
+            # rows once the UPDATE moves them, skewing the before/after counts
+            pks = list(inspection_items.values_list("pk", flat=True))
+            actions = CorrectiveAction.objects.filter(inspection_item__in=pks)
+            before = actions.status_counts()
+
+            actions.update(
+                status=Case(
+                    When(
+                        Exists(item_passed),
+                        then=Value(CorrectiveAction.Status.REINSPECTED),
+                    ),
+                    default=Value(CorrectiveAction.Status.OPEN),
+                ),
+                updated_at=Now(),
+            )
+
+            # Bulk UPDATE skips signals; move the rollup by the net change
+            after = actions.status_counts()
+            StatusRollup.objects.adjust(
+                StatusRollup.Kind.CORRECTIVE_ACTION,
+                {status: after[status] - before[status] for status in CorrectiveAction.Status.values},
+            )
+            SchoolSummary.objects.adjust_open_actions([self.school_id], sum(
+                after[status] - before[status] for status in CorrectiveAction.UNRESOLVED_STATUSES
+            ))
+
+            # Counter refresh doubles as the unresolved-actions aggregate
+            self.refresh_counters()
+            self.status = self.Status.FAILED if self.unresolved_actions else self.Status.PASSED
+            self.save()
+            if self.status == previous_status:
+                # Results changed under the same status, so no signal refresh
+                self.refresh_compliance()
 
 
 class InspectionItem(models.Model):
     inspection = models.ForeignKey(Inspection, on_delete=models.CASCADE, related_name="inspection_items")
-    checklist_item = models.ForeignKey(ChecklistItem, on_delete=models.CASCADE)
+    # PROTECT: past inspections keep their items (text comes from the pinned
+    # version); a checklist item with results can't be deleted
+    checklist_item = models.ForeignKey(ChecklistItem, on_delete=models.PROTECT)
     passed = models.BooleanField(null=True, blank=True)
     notes = models.TextField(blank=True, null=True)
 
+    # What performing an inspection writes
+    RESULT_FIELDS = ("passed", "notes")
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["inspection", "checklist_item"],
+                name="unique_inspection_checklist_item",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["inspection", "passed"], name="inspitem_insp_passed_idx"),
+        ]
+
     def __str__(self):
-        return f"{self.inspection} - {self.checklist_item.text}"
+        return f"{self.inspection} - {self.text}"
+
+    @property
+    def text(self):
+        """Checklist text; Inspection.attach_texts() sets the pinned version's."""
+        if "_text" in self.__dict__:
+            return self._text
+        return self.checklist_item.text
+
+    @text.setter
+    def text(self, value):
+        self._text = value
     
 
 class CorrectiveAction(models.Model):
@@ -77,6 +554,13 @@ class CorrectiveAction(models.Model):
         AWAITING_REINSPECTION = "AWAITING_REINSPECTION", "Awaiting Reinspection"
         REINSPECTED = "REINSPECTED", "Reinspected"
 
+    # Statuses that still need work (and keep an inspection FAILED)
+    UNRESOLVED_STATUSES = (
+        Status.OPEN,
+        Status.IN_PROGRESS,
+        Status.AWAITING_REINSPECTION,
+    )
+
     inspection_item = models.ForeignKey(
         InspectionItem,
         on_delete=models.CASCADE,
@@ -98,9 +582,654 @@ class CorrectiveAction(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = CorrectiveActionQuerySet.as_manager()
+
     def __str__(self):
         return f"Action for {self.inspection_item.checklist_item.text}"
     
     class Meta:
         verbose_name = "Corrective Action"
-        verbose_name_plural = "Corrective Actions"
\ No newline at end of file
+        verbose_name_plural = "Corrective Actions"
+        indexes = [
+            models.Index(fields=["status", "created_at"], name="ca_status_created_idx"),
+            # Default action list order (keyset pages on created_at, id)
+            models.Index(fields=["created_at", "id"], name="ca_created_id_idx"),
+            models.Index(fields=["inspection_item", "status"], name="ca_item_status_idx"),
+            models.Index(fields=["assigned_to", "status"], name="ca_assignee_status_idx"),
+            # Partial index: only the (small) unresolved slice of the table
+            models.Index(
+                fields=["inspection_item"],
+                name="ca_unresolved_item_idx",
+                condition=models.Q(status__in=[
+                    "OPEN", "IN_PROGRESS", "AWAITING_REINSPECTION",
+                ]),
+            ),
+        ]
+
+
+# ============================================================
+#   STATUS ROLLUP (admin dashboard)
+# ============================================================
+
+class StatusRollupQuerySet(models.QuerySet):
+
+    def adjust(self, kind, deltas):
+        """Apply ``{status: delta}`` to the running counts for ``kind``."""
+        for status, delta in deltas.items():
+            if not delta:
+                continue
+            row = self.filter(kind=kind, status=status)
+            if row.update(count=F("count") + delta):
+                continue
+            # First row for this status; a concurrent creator wins the race
+            # and we fall back to incrementing its row.
+            try:
+                with transaction.atomic():
+                    self.create(kind=kind, status=status, count=delta)
+            except IntegrityError:
+                row.update(count=F("count") + delta)
+
+    def totals(self, kind):
+        """``{status: count, ..., "total": n}`` for ``kind``, like status_counts()."""
+        counts = dict(self.filter(kind=kind).values_list("status", "count"))
+        counts["total"] = sum(counts.values())
+        return counts
+
+    def rebuild(self):
+        """Recount every status from the source tables."""
+        with transaction.atomic():
+            self.all().delete()
+            for kind, model in StatusRollup.SOURCES.items():
+                counts = model.objects.status_counts()
+                self.bulk_create(
+                    StatusRollup(kind=kind, status=status, count=counts[status])
+                    for status in model.Status.values
+                )
+
+
+class StatusRollup(models.Model):
+    """Running row count per status, so the admin dashboard never scans.
+
+    Kept current by signals for single-row saves and by explicit adjust()
+    calls on bulk paths; ``rebuild_status_rollups`` recounts from scratch.
+    """
+
+    class Kind(models.TextChoices):
+        INSPECTION = "INSPECTION", "Inspection"
+        CORRECTIVE_ACTION = "CORRECTIVE_ACTION", "Corrective Action"
+
+    SOURCES = {
+        Kind.INSPECTION: Inspection,
+        Kind.CORRECTIVE_ACTION: CorrectiveAction,
+    }
+
+    kind = models.CharField(max_length=20, choices=Kind.choices)
+    status = models.CharField(max_length=50)
+    count = models.BigIntegerField(default=0)
+
+    objects = StatusRollupQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = "Status Rollup"
+        verbose_name_plural = "Status Rollups"
+        constraints = [
+            models.UniqueConstraint(fields=["kind", "status"], name="unique_rollup_kind_status"),
+        ]
+
+    def __str__(self):
+        return f"{self.get_kind_display()} {self.status}: {self.count}"
+
+
+def admin_totals(use_rollups=False):
+    """School, user, inspection and per-status action counts in one query.
+
+    One conditional aggregate over the action table (or, with
+    ``use_rollups``, over the StatusRollup rows), with the school, user and
+    inspection table counts in the same SELECT.
+    """
+    tables = {
+        "total_schools": _TableCount(School.objects.all()),
+        "total_users": _TableCount(AppUser.objects.all()),
+    }
+
+    if not use_rollups:
+        counts = CorrectiveAction.objects.status_counts(
+            total_inspections=_TableCount(Inspection.objects.all()), **tables,
+        )
+        counts["total_actions"] = counts.pop("total")
+        return counts
+
+    Kind = StatusRollup.Kind
+
+    def rollup(kind, **filters):
+        return Coalesce(Sum("count", filter=Q(kind=kind, **filters)), 0)
+
+    return StatusRollup.objects.order_by().aggregate(
+        total_inspections=rollup(Kind.INSPECTION),
+        total_actions=rollup(Kind.CORRECTIVE_ACTION),
+        **{
+            status: rollup(Kind.CORRECTIVE_ACTION, status=status)
+            for status in CorrectiveAction.Status.values
+        },
+        **tables,
+    )
+
+
+# ============================================================
+#   SCHOOL SUMMARY (school detail header)
+# ============================================================
+
+def summary_aggregates():
+    """Per-school aggregates for SchoolSummary, over School rows."""
+    inspections = "inspections__status"
+    return {
+        "passed_inspections": Count("inspections", filter=Q(**{f"{inspections}__in": Inspection.PASSING_STATUSES})),
+        "failed_inspections": Count("inspections", filter=Q(**{inspections: Inspection.Status.FAILED})),
+        "last_inspection_date": Max("inspections__date", filter=Q(**{f"{inspections}__in": Inspection.FINISHED_STATUSES})),
+        "open_actions": _count(
+            CorrectiveAction.objects.filter(
+                inspection_item__inspection__school=OuterRef("pk"),
+                status__in=CorrectiveAction.UNRESOLVED_STATUSES,
+            )
+        ),
+    }
+
+
+class SchoolSummaryQuerySet(models.QuerySet):
+
+    def refresh(self, school_ids):
+        """Recompute the rows of ``school_ids`` (ids or a values() queryset).
+
+        One grouped SELECT and one upsert; schools without a row get one.
+        """
+        rows = (
+            School.objects.filter(pk__in=school_ids).order_by()
+            .values("pk").annotate(**summary_aggregates())
+        )
+        return len(self.bulk_create(
+            [SchoolSummary(school_id=row.pop("pk"), **row) for row in rows],
+            update_conflicts=True,
+            unique_fields=["school"],
+            update_fields=[*SchoolSummary.SUMMARY_FIELDS, "updated_at"],
+        ))
+
+    def adjust_open_actions(self, school_ids, delta):
+        """Move ``open_actions`` of ``school_ids`` (ids or a values() queryset) by ``delta``."""
+        if not delta:
+            return
+        if not self.filter(school__in=school_ids).update(
+            open_actions=F("open_actions") + delta, updated_at=Now()
+        ):
+            # No row yet for the school: build it from the source tables
+            self.refresh(school_ids)
+
+    def rebuild(self):
+        """Recompute every school's row."""
+        with transaction.atomic():
+            self.all().delete()
+            return self.refresh(School.objects.values("pk"))
+
+
+class SchoolSummary(models.Model):
+    """Compliance header of one school, so the school page never aggregates.
+
+    Recomputed by signals when an inspection is created, deleted or changes
+    school, date or status; corrective action status changes move
+    ``open_actions`` by a delta (signals, and explicit calls on bulk paths).
+    ``rebuild_school_summaries`` recomputes every school.
+    """
+
+    school = models.OneToOneField(
+        School, on_delete=models.CASCADE, primary_key=True, related_name="summary"
+    )
+    passed_inspections = models.PositiveIntegerField(default=0)
+    failed_inspections = models.PositiveIntegerField(default=0)
+    open_actions = models.PositiveIntegerField(default=0)
+    last_inspection_date = models.DateField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    SUMMARY_FIELDS = (
+        "passed_inspections", "failed_inspections", "open_actions", "last_inspection_date",
+    )
+
+    objects = SchoolSummaryQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = "School Summary"
+        verbose_name_plural = "School Summaries"
+
+    def __str__(self):
+        return f"Summary for school #{self.school_id}"
+
+    @property
+    def pass_rate(self):
+        """Percent of finished inspections that passed, or None if none."""
+        finished = self.passed_inspections + self.failed_inspections
+        if not finished:
+            return None
+        return round(100 * self.passed_inspections / finished)
+
+
+# ============================================================
+#   COMPLIANCE ROLLUPS (trend endpoints)
+# ============================================================
+#
+# Item pass / fail counts for each day, week (starting Monday) and month
+# that has finished inspections, so trends never scan the item table:
+#
+#   ComplianceRollup  per school and checklist item
+#   ComplianceTotal   summed per school, per checklist item, per checklist
+#                     and for the whole district
+#
+# A trend reads one total row per period (about 60 for five years of
+# months) unless it combines a school with a checklist or item, or covers
+# a manager's schools with one; those read that school's rollups only.
+#
+#   day rollups   recomputed from the items of that school's inspections
+#   week, month   re-summed from the day rollups they contain
+#   totals        re-summed from the rollups of the periods refreshed
+#
+# A refresh replaces every row in its range, so it is idempotent: signals
+# and Inspection.complete() / apply_reinspection() refresh the day an
+# inspection changes, ``backfill_compliance_rollups`` walks all history.
+
+def period_start(period, date):
+    """First day of the day / week / month ``period`` containing ``date``."""
+    if period == ComplianceRollup.Period.WEEK:
+        return date - datetime.timedelta(days=date.weekday())
+    if period == ComplianceRollup.Period.MONTH:
+        return date.replace(day=1)
+    return date
+
+
+def period_end(period, date):
+    """Last day of the ``period`` containing ``date``."""
+    if period == ComplianceRollup.Period.WEEK:
+        return period_start(period, date) + datetime.timedelta(days=6)
+    if period == ComplianceRollup.Period.MONTH:
+        next_month = date.replace(day=28) + datetime.timedelta(days=4)
+        return next_month.replace(day=1) - datetime.timedelta(days=1)
+    return date
+
+
+# A rollup row's key, in the order ComplianceTotal.adjust() takes it
+ROLLUP_KEY = ("school_id", "checklist_id", "checklist_item_id", "period_start")
+
+
+class TrendMixin:
+
+    def trend(self, period, start, end):
+        """``[{period_start, passed, failed}, ...]`` summed over the matched rows."""
+        return list(
+            self.filter(period=period, period_start__range=(start, end))
+            .order_by("period_start")
+            .values("period_start")
+            .annotate(passed=Sum("passed_items"), failed=Sum("failed_items"))
+        )
+
+
+class ComplianceRollupQuerySet(TrendMixin, models.QuerySet):
+
+    BATCH_SIZE = 1000
+
+    def visible_to(self, appuser):
+        """Rows the given AppUser may see: Manager / Kitchen their schools.
+
+        Inspectors see every school, unlike Inspection.visible_to: they can
+        inspect any school (InspectionForm offers them all), and rows hold
+        only pass / fail counts, not who inspected or what was noted.
+        """
+        if appuser.role in (AppUser.Role.ADMIN, AppUser.Role.INSPECTOR):
+            return self
+
+        membership = _school_member(appuser, "school_id")
+        if membership is None:
+            return self.none()
+        return self.filter(membership)
+
+    def refresh(self, start, end=None, school_ids=None):
+        """Recompute the rows of inspections dated ``start`` to ``end``.
+
+        ``school_ids`` limits the work to those schools, and their old-vs-new
+        difference is added to the totals; without it the totals of every
+        period refreshed are re-summed. The weeks and months the range
+        touches are re-summed whole, from their day rows.
+        """
+        end = end or start
+        Period = ComplianceRollup.Period
+
+        with transaction.atomic(savepoint=False):
+            items = InspectionItem.objects.filter(
+                inspection__date__range=(start, end),
+                inspection__status__in=Inspection.FINISHED_STATUSES,
+                passed__isnull=False,
+            )
+            if school_ids is not None:
+                items = items.filter(inspection__school__in=school_ids)
+            days = items.order_by().values(
+                "checklist_item_id",
+                bucket=F("inspection__date"),
+                school_id=F("inspection__school_id"),
+                checklist_id=F("checklist_item__checklist_id"),
+            ).annotate(
+                passed_count=Count("pk", filter=Q(passed=True)),
+                failed_count=Count("pk", filter=Q(passed=False)),
+            )
+            self._replace(Period.DAY, start, end, school_ids, days)
+
+            for period, trunc in ((Period.WEEK, TruncWeek), (Period.MONTH, TruncMonth)):
+                first, last = period_start(period, start), period_end(period, end)
+                rows = self.filter(period=Period.DAY, period_start__range=(first, last))
+                if school_ids is not None:
+                    rows = rows.filter(school__in=school_ids)
+                rows = rows.order_by().values(
+                    "school_id", "checklist_id", "checklist_item_id",
+                    bucket=trunc("period_start", output_field=models.DateField()),
+                ).annotate(passed_count=Sum("passed_items"), failed_count=Sum("failed_items"))
+                self._replace(period, first, last, school_ids, rows)
+
+    def _replace(self, period, first, last, school_ids, rows):
+        scope = self.filter(period=period, period_start__range=(first, last))
+        rows = list(rows)
+
+        if school_ids is None:
+            scope.delete()
+        else:
+            # Locked: a concurrent refresh of the same school waits, so the
+            # old counts subtracted from the totals are the ones replaced
+            scope = scope.filter(school__in=school_ids)
+            changes = defaultdict(lambda: [0, 0])
+            for row in scope.select_for_update().values(*ROLLUP_KEY, "passed_items", "failed_items"):
+                counts = changes[tuple(row[name] for name in ROLLUP_KEY)]
+                counts[0] -= row["passed_items"]
+                counts[1] -= row["failed_items"]
+            scope.delete()
+            for row in rows:
+                counts = changes[row["school_id"], row["checklist_id"], row["checklist_item_id"], row["bucket"]]
+                counts[0] += row["passed_count"]
+                counts[1] += row["failed_count"]
+
+        # Upsert: a concurrent refresh of the same range may insert first
+        self.bulk_create(
+            [
+                ComplianceRollup(
+                    period=period, period_start=row["bucket"],
+                    school_id=row["school_id"], checklist_id=row["checklist_id"],
+                    checklist_item_id=row["checklist_item_id"],
+                    passed_items=row["passed_count"], failed_items=row["failed_count"],
+                )
+                for row in rows
+            ],
+            batch_size=self.BATCH_SIZE,
+            update_conflicts=True,
+            unique_fields=["period", "period_start", "school", "checklist_item"],
+            update_fields=["checklist", "passed_items", "failed_items", "updated_at"],
+        )
+
+        if school_ids is None:
+            ComplianceTotal.objects.refresh(period, first, last)
+        else:
+            ComplianceTotal.objects.adjust(period, changes)
+
+
+class ComplianceRollup(models.Model):
+    """Passed / failed item counts of one school and checklist item in one period."""
+
+    class Period(models.TextChoices):
+        DAY = "DAY", "Day"
+        WEEK = "WEEK", "Week"
+        MONTH = "MONTH", "Month"
+
+    period = models.CharField(max_length=5, choices=Period.choices)
+    period_start = models.DateField()
+    school = models.ForeignKey(School, on_delete=models.CASCADE, related_name="+")
+    checklist = models.ForeignKey(Checklist, on_delete=models.CASCADE, related_name="+")
+    checklist_item = models.ForeignKey(ChecklistItem, on_delete=models.CASCADE, related_name="+")
+    passed_items = models.PositiveIntegerField(default=0)
+    failed_items = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = ComplianceRollupQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = "Compliance Rollup"
+        verbose_name_plural = "Compliance Rollups"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["period", "period_start", "school", "checklist_item"],
+                name="unique_compliance_rollup",
+            ),
+        ]
+        indexes = [
+            # Trends read a school's rows, or a manager's schools' rows for a
+            # checklist / item; the unique constraint serves the totals refresh
+            models.Index(fields=["period", "school", "period_start"], name="compliance_school_idx"),
+            models.Index(fields=["period", "checklist", "period_start"], name="compliance_checklist_idx"),
+            models.Index(fields=["period", "checklist_item", "period_start"], name="compliance_item_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.get_period_display()} of {self.period_start}: school #{self.school_id}, item #{self.checklist_item_id}"
+
+
+class ComplianceTotalQuerySet(TrendMixin, models.QuerySet):
+
+    BATCH_SIZE = 1000
+    # Keys OR-ed into one adjust() UPDATE (SQLite caps expression depth)
+    KEYS_PER_UPDATE = 100
+
+    def visible_to(self, appuser):
+        """Rows the given AppUser may see, as for ComplianceRollup.visible_to.
+
+        Manager / Kitchen get only their schools' school-level totals.
+        """
+        if appuser.role in (AppUser.Role.ADMIN, AppUser.Role.INSPECTOR):
+            return self
+
+        membership = _school_member(appuser, "object_id")
+        if membership is None:
+            return self.none()
+        return self.filter(membership, level=ComplianceTotal.Level.SCHOOL)
+
+    def refresh(self, period, first, last):
+        """Re-sum the ``period`` totals starting ``first`` to ``last`` from the rollups."""
+        Level = ComplianceTotal.Level
+        rollups = ComplianceRollup.objects.filter(
+            period=period, period_start__range=(first, last)
+        ).order_by()
+        sums = {"passed_count": Sum("passed_items"), "failed_count": Sum("failed_items")}
+
+        totals = [
+            (Level.SCHOOL, row["school_id"], row["period_start"], row["passed_count"], row["failed_count"])
+            for row in rollups.values("school_id", "period_start").annotate(**sums)
+        ]
+
+        # Checklist and district sums are added up from the item sums
+        coarser = defaultdict(lambda: [0, 0])
+        items = rollups.values("checklist_id", "checklist_item_id", "period_start").annotate(**sums)
+        for row in items:
+            passed, failed = row["passed_count"], row["failed_count"]
+            totals.append((Level.ITEM, row["checklist_item_id"], row["period_start"], passed, failed))
+            for level, object_id in ((Level.CHECKLIST, row["checklist_id"]), (Level.DISTRICT, 0)):
+                counts = coarser[level, object_id, row["period_start"]]
+                counts[0] += passed
+                counts[1] += failed
+        totals += [(*key, passed, failed) for key, (passed, failed) in coarser.items()]
+
+        self.filter(period=period, period_start__range=(first, last)).delete()
+        self.bulk_create(
+            [
+                ComplianceTotal(
+                    period=period, level=level, object_id=object_id, period_start=day,
+                    passed_items=passed, failed_items=failed,
+                )
+                for level, object_id, day, passed, failed in totals
+            ],
+            batch_size=self.BATCH_SIZE,
+            update_conflicts=True,
+            unique_fields=["period", "level", "object_id", "period_start"],
+            update_fields=["passed_items", "failed_items", "updated_at"],
+        )
+
+    def adjust(self, period, changes):
+        """Add rollup count changes to every ``period`` total they count towards.
+
+        ``changes`` is ``{(school_id, checklist_id, checklist_item_id,
+        period_start): (passed, failed)}``. Totals are incremented in place,
+        so refreshes of different schools in one period don't overwrite
+        each other.
+        """
+        Level = ComplianceTotal.Level
+        deltas = defaultdict(lambda: [0, 0])
+        for (school_id, checklist_id, item_id, day), (passed, failed) in changes.items():
+            for level, object_id in (
+                (Level.SCHOOL, school_id), (Level.ITEM, item_id),
+                (Level.CHECKLIST, checklist_id), (Level.DISTRICT, 0),
+            ):
+                counts = deltas[level, object_id, day]
+                counts[0] += passed
+                counts[1] += failed
+        deltas = {key: tuple(counts) for key, counts in deltas.items() if any(counts)}
+        if not deltas:
+            return
+
+        # Missing rows first (a concurrent refresh may insert them too), so
+        # every change is an UPDATE; one per distinct (passed, failed) delta
+        self.bulk_create(
+            [
+                ComplianceTotal(period=period, level=level, object_id=object_id, period_start=day)
+                for level, object_id, day in deltas
+            ],
+            batch_size=self.BATCH_SIZE,
+            ignore_conflicts=True,
+        )
+        keys_by_delta = defaultdict(list)
+        for (level, object_id, day), delta in deltas.items():
+            keys_by_delta[delta].append(Q(level=level, object_id=object_id, period_start=day))
+        for (passed, failed), keys in keys_by_delta.items():
+            for n in range(0, len(keys), self.KEYS_PER_UPDATE):
+                self.filter(reduce(or_, keys[n:n + self.KEYS_PER_UPDATE]), period=period).update(
+                    passed_items=F("passed_items") + passed,
+                    failed_items=F("failed_items") + failed,
+                    updated_at=Now(),
+                )
+
+        # A total whose rollups are all gone has no row, as after refresh()
+        if any(passed < 0 or failed < 0 for passed, failed in deltas.values()):
+            days = [day for _, _, day in deltas]
+            self.filter(
+                period=period, period_start__range=(min(days), max(days)),
+                passed_items=0, failed_items=0,
+            ).delete()
+
+
+class ComplianceTotal(models.Model):
+    """ComplianceRollup counts summed per school, checklist item or checklist, or district-wide."""
+
+    class Level(models.TextChoices):
+        SCHOOL = "SCHOOL", "School"
+        ITEM = "ITEM", "Checklist item"
+        CHECKLIST = "CHECKLIST", "Checklist"
+        DISTRICT = "DISTRICT", "District"
+
+    period = models.CharField(max_length=5, choices=ComplianceRollup.Period.choices)
+    period_start = models.DateField()
+    level = models.CharField(max_length=10, choices=Level.choices)
+    # School, checklist item or checklist id; 0 for the district
+    object_id = models.PositiveBigIntegerField()
+    passed_items = models.PositiveIntegerField(default=0)
+    failed_items = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = ComplianceTotalQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = "Compliance Total"
+        verbose_name_plural = "Compliance Totals"
+        constraints = [
+            # Also the index every trend reads: period + level + id, in date order
+            models.UniqueConstraint(
+                fields=["period", "level", "object_id", "period_start"],
+                name="unique_compliance_total",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.get_period_display()} of {self.period_start}: {self.get_level_display()} #{self.object_id}"
+
+
+def compliance_trend(appuser, period, start, end, school=None, checklist=None, item=None):
+    """Item pass / fail sums per period for the filters, as trend() rows.
+
+    Reads the totals of the narrowest filter, or the school's rollups when
+    a school (or a manager's set of schools) is combined with a checklist
+    or item. Filters are ids; ``item`` takes precedence over ``checklist``.
+    """
+    Level = ComplianceTotal.Level
+    scoped = appuser.role not in (AppUser.Role.ADMIN, AppUser.Role.INSPECTOR)
+
+    if (school or scoped) and (checklist or item):
+        rows = ComplianceRollup.objects.visible_to(appuser)
+        if school:
+            rows = rows.filter(school_id=school)
+        if item:
+            rows = rows.filter(checklist_item_id=item)
+        else:
+            rows = rows.filter(checklist_id=checklist)
+    elif school or scoped:
+        rows = ComplianceTotal.objects.visible_to(appuser).filter(level=Level.SCHOOL)
+        if school:
+            rows = rows.filter(object_id=school)
+    elif item:
+        rows = ComplianceTotal.objects.filter(level=Level.ITEM, object_id=item)
+    elif checklist:
+        rows = ComplianceTotal.objects.filter(level=Level.CHECKLIST, object_id=checklist)
+    else:
+        rows = ComplianceTotal.objects.filter(level=Level.DISTRICT, object_id=0)
+    return rows.trend(period, start, end)
+
+
+class RollupBackfill(models.Model):
+    """Progress of a ``backfill_compliance_rollups`` run, so it can resume."""
+
+    started_at = models.DateTimeField(auto_now_add=True)
+    # Inspection dates up to here are rolled up
+    through_date = models.DateField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Rollup Backfill"
+        verbose_name_plural = "Rollup Backfills"
+
+    def __str__(self):
+        state = "finished" if self.finished_at else f"through {self.through_date or '-'}"
+        return f"Backfill started {self.started_at:%Y-%m-%d %H:%M} ({state})"
+
+
+# ============================================================
+#   IDEMPOTENT SUBMISSIONS (JSON perform endpoint)
+# ============================================================
+
+class InspectionSubmission(models.Model):
+    """Receipt for one client-keyed submission of item results.
+
+    Written in the same transaction as the results, so a retried request
+    with the same key replays ``response`` instead of applying twice.
+    """
+
+    inspection = models.ForeignKey(Inspection, on_delete=models.CASCADE, related_name="submissions")
+    key = models.CharField(max_length=100)
+    submitted_by = models.ForeignKey(AppUser, on_delete=models.SET_NULL, null=True, blank=True)
+    payload_hash = models.CharField(max_length=64)
+    response = models.JSONField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Inspection Submission"
+        verbose_name_plural = "Inspection Submissions"
+        constraints = [
+            models.UniqueConstraint(fields=["inspection", "key"], name="unique_submission_key"),
+        ]
+
+    def __str__(self):
+        return f"Submission {self.key} for inspection #{self.inspection_id}"
@@ -0,0 +1,166 @@
+import base64
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+from apps.core.pagination import count_rows
+
+
+class KeysetPage:
+    """One page of a keyset-paginated queryset.
+
+    Mirrors the parts of Django's ``Page`` the templates use, but navigates
+    with opaque cursors instead of page numbers.
+    """
+
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class KeysetPaginator:
+    """Seek-based pagination ordered by ``field`` with ``pk`` as tie-breaker.
+
+    Each page is fetched with a ``WHERE (field, pk) > (value, pk)`` style
+    predicate and ``LIMIT per_page + 1``, so page 1000 costs the same as
+    page 1 (given an index on the sort column). Navigation needs no count;
+    ``row_count`` is there for showing a total.
+    """
+
+    def __init__(self, queryset, field, descending=False, per_page=25):
+        self.queryset = queryset
+        self.field = field
+        self.descending = descending
+        self.per_page = per_page
+
+    # ------------------------------------------------------------
+    #   Cursor encoding
+    # ------------------------------------------------------------
+
+    @staticmethod
+    def encode_cursor(value, pk):
+        if hasattr(value, "isoformat"):
+            value = value.isoformat()
+        raw = json.dumps([value, pk]).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    @staticmethod
+    def decode_cursor(cursor):
+        if not cursor:
+            return None
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            value, pk = json.loads(base64.urlsafe_b64decode(padded))
+            return value, int(pk)
+        except (ValueError, TypeError):
+            return None
+
+    @cached_property
+    def sort_field(self):
+        """Model field at the end of ``field`` (which may span relations)."""
+        model, parts = self.queryset.model, self.field.split("__")
+        for part in parts[:-1]:
+            model = model._meta.get_field(part).related_model
+        return model._meta.get_field(parts[-1])
+
+    def parse_cursor(self, cursor):
+        """``(value, pk)`` with the value typed for the sort field, or None.
+
+        A cursor that decodes but doesn't fit the sort column (tampered, or
+        left over from another sort) counts as no cursor.
+        """
+        cursor = self.decode_cursor(cursor)
+        if cursor is None:
+            return None
+        try:
+            value = self.sort_field.to_python(cursor[0])
+        except (ValidationError, TypeError, ValueError):
+            return None
+        if value is None:
+            return None
+        return value, cursor[1]
+
+    # ------------------------------------------------------------
+    #   Query helpers
+    # ------------------------------------------------------------
+
+    def _ordering(self, reverse=False):
+        descending = self.descending != reverse
+        prefix = "-" if descending else ""
+        return (f"{prefix}{self.field}", f"{prefix}pk")
+
+    def _seek(self, cursor, reverse=False):
+        value, pk = cursor
+        op = "lt" if self.descending != reverse else "gt"
+        return Q(**{f"{self.field}__{op}": value}) | Q(
+            **{self.field: value, f"pk__{op}": pk}
+        )
+
+    def _cursor_for(self, obj):
+        value = obj
+        for part in self.field.split("__"):
+            value = getattr(value, part)
+        return self.encode_cursor(value, obj.pk)
+
+    # ------------------------------------------------------------
+    #   Public API
+    # ------------------------------------------------------------
+
+    @cached_property
+    def row_count(self):
+        """Estimated / capped total (apps.core.pagination.count_rows)."""
+        return count_rows(self.queryset)
+
+    def page_queryset(self, after=None, before=None):
+        """The (sliced) queryset page() evaluates for these cursors."""
+        after = self.parse_cursor(after)
+        before = self.parse_cursor(before) if not after else None
+
+        qs = self.queryset
+        if before:
+            qs = qs.filter(self._seek(before, reverse=True)).order_by(
+                *self._ordering(reverse=True)
+            )
+        else:
+            if after:
+                qs = qs.filter(self._seek(after))
+            qs = qs.order_by(*self._ordering())
+        return qs[: self.per_page + 1]
+
+    def page(self, after=None, before=None):
+        rows = list(self.page_queryset(after, before))
+        after = self.parse_cursor(after)
+        before = self.parse_cursor(before) if not after else None
+
+        has_more = len(rows) > self.per_page
+        rows = rows[: self.per_page]
+
+        if before:
+            rows.reverse()
+            has_next, has_previous = True, has_more
+        else:
+            has_next, has_previous = has_more, bool(after)
+
+        next_cursor = self._cursor_for(rows[-1]) if rows and has_next else None
+        previous_cursor = (
+            self._cursor_for(rows[0]) if rows and has_previous else None
+        )
+        return KeysetPage(rows, next_cursor, previous_cursor)
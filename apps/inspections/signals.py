@@ -0,0 +1,177 @@
+from collections import defaultdict
+
+from django.db.models.signals import post_delete, post_init, post_save, pre_delete
+from django.dispatch import receiver
+from apps.schools.models import School
+from .models import (
+    ROLLUP_KEY, ComplianceRollup, ComplianceTotal, CorrectiveAction, Inspection, InspectionItem,
+    SchoolSummary, StatusRollup,
+)
+
+
+def _deleting(origin, *models):
+    """Whether a delete cascades from an instance or queryset of ``models``."""
+    return isinstance(origin, models) or getattr(origin, "model", None) in models
+
+
+@receiver([post_save, post_delete], sender=CorrectiveAction)
+def refresh_inspection_counters(sender, instance, **kwargs):
+    # Single-row saves (detail/assign/reinspect views, admin). Bulk paths
+    # bypass signals and call Inspection.refresh_counters() themselves.
+    Inspection.objects.filter(
+        inspection_items=instance.inspection_item_id
+    ).refresh_counters()
+
+
+@receiver([post_save, post_delete], sender=InspectionItem)
+def refresh_counters_for_item(sender, instance, origin=None, **kwargs):
+    # Admin item edits (change page, Inspection inline); nothing to refresh
+    # when the item goes with its inspection or school.
+    if not _deleting(origin, Inspection, School):
+        Inspection.objects.filter(pk=instance.inspection_id).refresh_counters()
+
+
+# ============================================================
+#   STATUS ROLLUP
+# ============================================================
+
+ROLLUP_KINDS = {
+    Inspection: StatusRollup.Kind.INSPECTION,
+    CorrectiveAction: StatusRollup.Kind.CORRECTIVE_ACTION,
+}
+
+
+@receiver(post_init, sender=Inspection)
+@receiver(post_init, sender=CorrectiveAction)
+def remember_status(sender, instance, **kwargs):
+    # __dict__ lookup so a deferred status field isn't fetched
+    instance._rollup_status = instance.__dict__.get("status")
+
+
+@receiver(post_save, sender=Inspection)
+@receiver(post_save, sender=CorrectiveAction)
+def rollup_status_change(sender, instance, created, **kwargs):
+    old, new = instance._rollup_status, instance.status
+
+    if created:
+        StatusRollup.objects.adjust(ROLLUP_KINDS[sender], {new: 1})
+    elif old is not None and old != new:
+        StatusRollup.objects.adjust(ROLLUP_KINDS[sender], {old: -1, new: 1})
+
+    instance._rollup_status = new
+
+
+@receiver(post_delete, sender=Inspection)
+@receiver(post_delete, sender=CorrectiveAction)
+def rollup_status_delete(sender, instance, **kwargs):
+    status = instance._rollup_status or instance.status
+    StatusRollup.objects.adjust(ROLLUP_KINDS[sender], {status: -1})
+
+
+# ============================================================
+#   SCHOOL SUMMARY AND COMPLIANCE ROLLUPS
+# ============================================================
+#
+# Both are computed from an inspection's (school, date, status), so one
+# remembered tuple drives them. Result changes that keep the status
+# (re-completing, reinspection) refresh the rollups from
+# Inspection.complete() / apply_reinspection() themselves.
+
+# Inspection fields the summary and rollups are computed from
+SUMMARY_FIELDS = ("school_id", "date", "status")
+
+
+def _summary_values(instance):
+    # __dict__ lookups so deferred fields aren't fetched
+    return tuple(instance.__dict__.get(name) for name in SUMMARY_FIELDS)
+
+
+def _rollup_days(*values):
+    """(school_id, date) of each value tuple that counts towards the rollups."""
+    return {
+        (school_id, date) for school_id, date, status in values
+        if status in Inspection.FINISHED_STATUSES
+    }
+
+
+def _is_open(status):
+    return None if status is None else status in CorrectiveAction.UNRESOLVED_STATUSES
+
+
+def _deleting_school(origin):
+    # Summary and rollups are deleted with their school; don't rebuild them mid-delete
+    return _deleting(origin, School)
+
+
+@receiver(post_init, sender=Inspection)
+def remember_summary_values(sender, instance, **kwargs):
+    instance._summary_values = _summary_values(instance)
+
+
+@receiver(post_save, sender=Inspection)
+def refresh_summary_and_rollups(sender, instance, created, **kwargs):
+    old, new = instance._summary_values, _summary_values(instance)
+    instance._summary_values = new
+
+    if created or old != new:
+        SchoolSummary.objects.refresh({old[0], new[0]} - {None})
+        for school_id, date in _rollup_days(old, new):
+            ComplianceRollup.objects.refresh(date, school_ids=[school_id])
+
+
+@receiver(post_delete, sender=Inspection)
+def refresh_summary_and_rollups_on_delete(sender, instance, origin=None, **kwargs):
+    if _deleting_school(origin):
+        return
+    SchoolSummary.objects.refresh([instance.school_id])
+    for school_id, date in _rollup_days(_summary_values(instance)):
+        ComplianceRollup.objects.refresh(date, school_ids=[school_id])
+
+
+@receiver(pre_delete, sender=School)
+def remember_rollups(sender, instance, **kwargs):
+    # The school's rollups cascade away; the totals that include them don't
+    rows = ComplianceRollup.objects.filter(school=instance).values(
+        "period", *ROLLUP_KEY, "passed_items", "failed_items"
+    )
+    instance._rollup_changes = defaultdict(dict)
+    for row in rows:
+        key = tuple(row[name] for name in ROLLUP_KEY)
+        instance._rollup_changes[row["period"]][key] = (-row["passed_items"], -row["failed_items"])
+
+
+@receiver(post_delete, sender=School)
+def subtract_school_from_totals(sender, instance, **kwargs):
+    for period, changes in instance._rollup_changes.items():
+        ComplianceTotal.objects.adjust(period, changes)
+
+
+@receiver(post_init, sender=CorrectiveAction)
+def remember_open(sender, instance, **kwargs):
+    instance._summary_open = _is_open(instance.__dict__.get("status"))
+
+
+@receiver(post_save, sender=CorrectiveAction)
+def adjust_open_actions(sender, instance, created, **kwargs):
+    old, new = instance._summary_open, _is_open(instance.status)
+    instance._summary_open = new
+
+    if created:
+        delta = int(new)
+    elif old is None:
+        return
+    else:
+        delta = int(new) - int(old)
+    SchoolSummary.objects.adjust_open_actions(
+        Inspection.objects.filter(inspection_items=instance.inspection_item_id).values("school_id"),
+        delta,
+    )
+
+
+@receiver(post_delete, sender=CorrectiveAction)
+def adjust_open_actions_on_delete(sender, instance, origin=None, **kwargs):
+    if _is_open(instance.status) and not _deleting_school(origin):
+        SchoolSummary.objects.adjust_open_actions(
+            Inspection.objects.filter(inspection_items=instance.inspection_item_id).values("school_id"),
+            -1,
+        )
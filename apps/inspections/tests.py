@@ -1,3 +1,1516 @@
-from django.test import TestCase
+import base64
+import datetime
+import re
+import zipfile
+from io import BytesIO, StringIO
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.db.models import F, ProtectedError
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.users.models import AppUser
+from apps.schools.models import School
+from apps.checklists import cache as checklist_cache
+from apps.checklists.models import Checklist, ChecklistItem
+from .pagination import KeysetPaginator
+from .models import (
+    ComplianceRollup, ComplianceTotal, CorrectiveAction, Inspection, InspectionItem, RollupBackfill,
+    SchoolSummary, StatusRollup, compliance_trend,
+)
+
+
+# Tables big enough that a full scan on a hot path is a regression
+LARGE_TABLES = (
+    Inspection._meta.db_table,
+    InspectionItem._meta.db_table,
+    CorrectiveAction._meta.db_table,
+)
+
+
+def make_appuser(username, role):
+    appuser = User.objects.create_user(username, password="x").appuser
+    appuser.role = role
+    appuser.save()
+    return appuser
+
+
+class VisibleToTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = make_appuser("admin", AppUser.Role.ADMIN)
+        cls.manager = make_appuser("manager", AppUser.Role.MANAGER)
+        cls.assignee = make_appuser("assignee", AppUser.Role.MANAGER)
+        cls.kitchen = make_appuser("kitchen", AppUser.Role.KITCHEN)
+        cls.inspector = make_appuser("inspector", AppUser.Role.INSPECTOR)
+        cls.no_role = make_appuser("no_role", "")
+
+        own = School.objects.create(name="Own School")
+        own.managers.add(cls.manager)
+        own.kitchen_staff.add(cls.kitchen)
+        other = School.objects.create(name="Other School")
+
+        checklist = Checklist.objects.create(name="Checklist")
+        ChecklistItem.objects.create(checklist=checklist, text="Sink", order=1)
+        cls.inspections, cls.actions = {}, {}
+        for name, school, inspector in (("own", own, None), ("other", other, cls.inspector)):
+            inspection = Inspection.objects.create(
+                school=school, checklist=checklist, inspector=inspector, date=datetime.date.today()
+            )
+            inspection.initialize_items()
+            inspection.inspection_items.update(passed=False)
+            inspection.complete()
+            cls.inspections[name] = inspection.pk
+            cls.actions[name] = CorrectiveAction.objects.get(inspection_item__inspection=inspection).pk
+        # The assignee is no member of either school: assignment alone grants it
+        CorrectiveAction.objects.filter(pk=cls.actions["other"]).update(assigned_to=cls.assignee)
+
+    def assertVisible(self, model, expected, ids):
+        for username, (names, queries) in expected.items():
+            appuser = AppUser.objects.get(user__username=username)
+            with self.subTest(model=model.__name__, role=username):
+                with self.assertNumQueries(queries):
+                    pks = {obj.pk for obj in model.objects.visible_to(appuser)}
+                self.assertEqual(pks, {ids[name] for name in names})
+
+    def test_inspections(self):
+        self.assertVisible(Inspection, {
+            "admin": (["own", "other"], 1),
+            "manager": (["own"], 1),
+            "assignee": ([], 1),
+            "kitchen": (["own"], 1),
+            "inspector": (["other"], 1),
+            "no_role": ([], 0),
+        }, self.inspections)
+
+    def test_corrective_actions(self):
+        self.assertVisible(CorrectiveAction, {
+            "admin": (["own", "other"], 1),
+            "manager": (["own"], 1),
+            "assignee": (["other"], 1),
+            "kitchen": (["own"], 1),
+            "inspector": (["other"], 1),
+            "no_role": ([], 0),
+        }, self.actions)
+
+
+class IndexCoverageTests(TestCase):
+    """EXPLAIN the main view queries and fail on sequential scans."""
+
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create_user("manager", password="x")
+        cls.manager = user.appuser
+        cls.manager.role = AppUser.Role.MANAGER
+        cls.manager.save()
+        cls.inspector = make_appuser("inspector", AppUser.Role.INSPECTOR)
+        cls.admin = make_appuser("admin", AppUser.Role.ADMIN)
+        cls.school = School.objects.create(name="Test School")
+        cls.school.managers.add(cls.manager)
+
+    def setUp(self):
+        if connection.vendor == "postgresql":
+            # Tiny test tables always favour a seq scan; disabling it makes
+            # the planner pick an index whenever a usable one exists.
+            with connection.cursor() as cursor:
+                cursor.execute("SET enable_seqscan = off")
+
+    def seq_scans(self, queryset, tables=LARGE_TABLES):
+        plan = queryset.explain()
+        if connection.vendor == "postgresql":
+            pattern = r"Seq Scan on (\w+)"
+        else:
+            # "SCAN t USING INDEX" is an ordered index walk; bare "SCAN t" is not
+            pattern = r"\bSCAN (\w+)\b(?! USING)"
+        return [t for t in re.findall(pattern, plan) if t in tables]
+
+    def assertNoSeqScan(self, queryset):
+        self.assertEqual(self.seq_scans(queryset), [], queryset.explain())
+
+    def assertPagesUseIndexes(self, queryset, sort_fields, cursor_value):
+        """Both the first page and a keyset seek, for each sort the list offers."""
+        for field in sort_fields:
+            for descending in (True, False):
+                paginator = KeysetPaginator(queryset, field, descending=descending)
+                for after in (None, paginator.encode_cursor(cursor_value(field), 1)):
+                    with self.subTest(field=field, descending=descending, after=after):
+                        self.assertNoSeqScan(paginator.page_queryset(after=after))
+
+    def test_inspection_list_queries(self):
+        # As inspection_list builds them (its default and indexed sorts;
+        # the school__name sort is outside this, see INSPECTION_SORT_FIELDS)
+        def cursor_value(field):
+            return datetime.date.today() if field == "date" else Inspection.Status.FAILED
+
+        for appuser, params in (
+            (self.manager, {}),
+            (self.manager, {"school": self.school.pk}),
+            (self.inspector, {}),
+            (self.admin, {"status": Inspection.Status.FAILED}),
+        ):
+            with self.subTest(role=appuser.role, params=params):
+                self.assertPagesUseIndexes(
+                    Inspection.objects.visible_to(appuser).filtered(params),
+                    ["date"], cursor_value,
+                )
+        self.assertPagesUseIndexes(Inspection.objects.visible_to(self.admin), ["date", "status"], cursor_value)
+
+    def test_inspection_item_queries(self):
+        self.assertNoSeqScan(
+            InspectionItem.objects.filter(inspection_id=1, passed=False)
+        )
+
+    def test_corrective_action_queries(self):
+        # Counter refresh: one inspection's unresolved actions
+        self.assertNoSeqScan(
+            CorrectiveAction.objects.filter(
+                inspection_item__inspection_id=1,
+                status__in=CorrectiveAction.UNRESOLVED_STATUSES,
+            )
+        )
+
+        # As corrective_action_list builds them (default sort)
+        def cursor_value(field):
+            return timezone.now()
+
+        for appuser, params in (
+            (self.admin, {}),
+            (self.admin, {"status": CorrectiveAction.Status.OPEN}),
+            (self.manager, {"assignee": "me", "status": CorrectiveAction.Status.OPEN}),
+            (self.inspector, {}),
+        ):
+            with self.subTest(role=appuser.role, params=params):
+                self.assertPagesUseIndexes(
+                    CorrectiveAction.objects.visible_to(appuser).filtered(params, appuser),
+                    ["created_at"], cursor_value,
+                )
+
+    def test_compliance_rollup_queries(self):
+        # Refreshing one school's day reads only that day's items
+        self.assertNoSeqScan(
+            InspectionItem.objects.filter(
+                inspection__school=self.school,
+                inspection__date=datetime.date.today(),
+                passed__isnull=False,
+            )
+        )
+        # Trends never touch the item table; school trends read its rollups
+        for column in ("school_id", "checklist_id", "checklist_item_id"):
+            trend = ComplianceRollup.objects.filter(
+                period=ComplianceRollup.Period.MONTH,
+                period_start__range=(datetime.date(2020, 1, 1), datetime.date.today()),
+                **{column: 1},
+            )
+            self.assertEqual(
+                self.seq_scans(trend, [ComplianceRollup._meta.db_table]), [], trend.explain()
+            )
+        # District / checklist / item trends read one total row per period
+        for level in ComplianceTotal.Level.values:
+            trend = ComplianceTotal.objects.filter(
+                period=ComplianceRollup.Period.MONTH, level=level, object_id=1,
+                period_start__range=(datetime.date(2020, 1, 1), datetime.date.today()),
+            )
+            self.assertEqual(
+                self.seq_scans(trend, [ComplianceTotal._meta.db_table]), [], trend.explain()
+            )
+
+
+class InitializeItemsTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.school = School.objects.create(name="Test School")
+        cls.checklist = Checklist.objects.create(name="HACCP")
+        ChecklistItem.objects.bulk_create(
+            ChecklistItem(checklist=cls.checklist, text=f"Check #{n}", order=n)
+            for n in range(200)
+        )
+
+    def setUp(self):
+        cache.clear()
+        checklist_cache.compiled.cache_clear()
+
+    def make_inspection(self):
+        return Inspection.objects.create(
+            school=self.school, checklist=self.checklist, date=datetime.date.today()
+        )
+
+    def test_one_select_and_one_insert(self):
+        inspection = self.make_inspection()
+        # SELECT version items, INSERT, counters UPDATE + reload (+ savepoint)
+        with self.assertNumQueries(6):
+            inspection.initialize_items()
+        self.assertEqual(inspection.inspection_items.count(), 200)
+        self.assertEqual(inspection.total_items, 200)
+
+    def test_checklist_is_read_once_per_version(self):
+        self.make_inspection().initialize_items()
+
+        inspection = self.make_inspection()
+        # Compiled version cached: INSERT, counters UPDATE + reload (+ savepoint)
+        with self.assertNumQueries(5):
+            inspection.initialize_items()
+        self.assertEqual(inspection.total_items, 200)
+
+    def test_edits_do_not_change_past_inspections(self):
+        inspection = self.make_inspection()
+        inspection.initialize_items()
+        item = self.checklist.items.get(order=0)
+        item.text = "Edited"
+        item.save()
+
+        later = self.make_inspection()
+        later.initialize_items()
+
+        self.assertNotEqual(later.checklist_version_id, inspection.checklist_version_id)
+        texts = inspection.item_texts([item.pk])
+        self.assertEqual(texts[item.pk], "Check #0")
+        self.assertEqual(later.item_texts([item.pk])[item.pk], "Edited")
+
+    def test_items_with_results_cannot_be_deleted(self):
+        inspection = self.make_inspection()
+        inspection.initialize_items()
+        item = self.checklist.items.get(order=0)
+
+        with self.assertRaises(ProtectedError):
+            item.delete()
+        self.assertEqual(inspection.item_texts([item.pk])[item.pk], "Check #0")
+        # Deleting the checklist would cascade to the item, so it's blocked too
+        with self.assertRaises(ProtectedError):
+            self.checklist.delete()
+
+        unused = ChecklistItem.objects.create(checklist=self.checklist, text="New", order=500)
+        unused.delete()
+        self.assertFalse(ChecklistItem.objects.filter(pk=unused.pk).exists())
+
+    def test_reinitializing_is_idempotent(self):
+        inspection = self.make_inspection()
+        inspection.initialize_items()
+        inspection.initialize_items()
+        self.assertEqual(inspection.inspection_items.count(), 200)
+
+
+class CompleteInspectionTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.kitchen = User.objects.create_user("kitchen", password="x").appuser
+        cls.kitchen.role = AppUser.Role.KITCHEN
+        cls.kitchen.save()
+        cls.school = School.objects.create(name="Test School")
+        cls.school.kitchen_staff.add(cls.kitchen)
+        cls.checklist = Checklist.objects.create(name="HACCP")
+        ChecklistItem.objects.bulk_create(
+            ChecklistItem(checklist=cls.checklist, text=f"Check #{n}", order=n)
+            for n in range(150)
+        )
+
+    def test_failures_create_actions_in_constant_queries(self):
+        inspection = Inspection.objects.create(
+            school=self.school, checklist=self.checklist, date=datetime.date.today()
+        )
+        inspection.initialize_items()
+        inspection.inspection_items.update(passed=False)
+        StatusRollup.objects.rebuild()
+
+        # failed items, assignee, bulk insert, search SELECT + 2 upserts
+        # (SQLite's parameter limit), inspection save, counters UPDATE +
+        # reload, 3 rollup UPDATEs (+ savepoint), school summary open-action
+        # UPDATE + recompute SELECT and upsert (status changed), compliance
+        # rollups: SELECT new + locked SELECT old, DELETE, 2 upserts for each
+        # of day, week, month, and their totals: INSERT missing rows and an
+        # UPDATE per distinct delta (item, school-wide)
+        with self.assertNumQueries(47):
+            inspection.complete()
+
+        self.assertEqual(inspection.status, Inspection.Status.FAILED)
+        actions = CorrectiveAction.objects.filter(inspection_item__inspection=inspection)
+        self.assertEqual(actions.count(), 150)
+        self.assertEqual(set(actions.values_list("assigned_to", flat=True)), {self.kitchen.pk})
+
+    def test_no_failures_passes(self):
+        inspection = Inspection.objects.create(
+            school=self.school, checklist=self.checklist, date=datetime.date.today()
+        )
+        inspection.initialize_items()
+        inspection.inspection_items.update(passed=True)
+
+        inspection.complete()
+
+        self.assertEqual(inspection.status, Inspection.Status.PASSED)
+        self.assertFalse(
+            CorrectiveAction.objects.filter(inspection_item__inspection=inspection).exists()
+        )
+
+
+class ReinspectionTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.school = School.objects.create(name="Test School")
+        cls.checklist = Checklist.objects.create(name="HACCP")
+        ChecklistItem.objects.bulk_create(
+            ChecklistItem(checklist=cls.checklist, text=f"Check #{n}", order=n)
+            for n in range(20)
+        )
+
+    def setUp(self):
+        self.inspection = Inspection.objects.create(
+            school=self.school, checklist=self.checklist, date=datetime.date.today()
+        )
+        self.inspection.initialize_items()
+        self.inspection.inspection_items.update(passed=False)
+        self.inspection.complete()
+
+    def test_all_fixed_passes_in_constant_queries(self):
+        items = self.inspection.inspection_items.all()
+        items.update(passed=True)
+        StatusRollup.objects.rebuild()
+
+        # item pks, status counts before/after, conditional UPDATE, counters UPDATE +
+        # reload, inspection save, 4 rollup UPDATEs (+ savepoint), school
+        # summary open-action UPDATE + recompute SELECT and upsert, compliance
+        # rollups: SELECT new + locked SELECT old, DELETE, upsert for each
+        # of day, week, month, and their totals: INSERT missing rows, an
+        # UPDATE per distinct delta (item, school-wide) and the empty-row DELETE
+        with self.assertNumQueries(40):
+            self.inspection.apply_reinspection(items)
+
+        self.assertEqual(self.inspection.status, Inspection.Status.PASSED)
+        statuses = CorrectiveAction.objects.filter(
+            inspection_item__inspection=self.inspection
+        ).values_list("status", flat=True)
+        self.assertEqual(set(statuses), {CorrectiveAction.Status.REINSPECTED})
+
+    def test_items_filtered_on_action_status(self):
+        self.inspection.inspection_items.update(passed=True)
+        StatusRollup.objects.rebuild()
+        open_items = InspectionItem.objects.filter(
+            corrective_actions__status=CorrectiveAction.Status.OPEN
+        )
+
+        self.inspection.apply_reinspection(open_items)
+
+        kind = StatusRollup.Kind.CORRECTIVE_ACTION
+        self.assertEqual(
+            StatusRollup.objects.totals(kind),
+            CorrectiveAction.objects.status_counts(),
+        )
+        self.assertEqual(StatusRollup.objects.totals(kind)[CorrectiveAction.Status.REINSPECTED], 20)
+
+    def test_partial_fix_stays_failed(self):
+        items = self.inspection.inspection_items.order_by("pk")
+        fixed = items[:5].values_list("pk", flat=True)
+        InspectionItem.objects.filter(pk__in=list(fixed)).update(passed=True)
+
+        self.inspection.apply_reinspection(items)
+
+        self.assertEqual(self.inspection.status, Inspection.Status.FAILED)
+        actions = CorrectiveAction.objects.filter(inspection_item__inspection=self.inspection)
+        self.assertEqual(actions.filter(status=CorrectiveAction.Status.REINSPECTED).count(), 5)
+        self.assertEqual(actions.filter(status=CorrectiveAction.Status.OPEN).count(), 15)
+        self.assertEqual(self.inspection.unresolved_actions, 15)
+
+
+class InspectionCounterTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.school = School.objects.create(name="Test School")
+        cls.checklist = Checklist.objects.create(name="HACCP")
+        ChecklistItem.objects.bulk_create(
+            ChecklistItem(checklist=cls.checklist, text=f"Check #{n}", order=n)
+            for n in range(10)
+        )
+
+    def test_counters_follow_items_and_actions(self):
+        inspection = Inspection.objects.create(
+            school=self.school, checklist=self.checklist, date=datetime.date.today()
+        )
+        inspection.initialize_items()
+        self.assertEqual((inspection.total_items, inspection.answered_items), (10, 0))
+
+        items = inspection.inspection_items.order_by("pk")
+        InspectionItem.objects.filter(pk__in=list(items.values_list("pk", flat=True)[:3])).update(passed=False)
+        items.filter(passed__isnull=True).update(passed=True)
+        inspection.complete()
+        self.assertEqual(
+            (inspection.answered_items, inspection.failed_items, inspection.unresolved_actions),
+            (10, 3, 3),
+        )
+
+        # Single-row saves go through the post_save signal
+        action = CorrectiveAction.objects.filter(inspection_item__inspection=inspection).first()
+        action.status = CorrectiveAction.Status.RESOLVED
+        action.save()
+        inspection.refresh_from_db()
+        self.assertEqual(inspection.unresolved_actions, 2)
+
+    def test_admin_item_edits_refresh_counters(self):
+        inspection = Inspection.objects.create(
+            school=self.school, checklist=self.checklist, date=datetime.date.today()
+        )
+        inspection.initialize_items()
+        items = list(inspection.inspection_items.order_by("pk"))
+        self.client.force_login(User.objects.create_superuser("root", password="x"))
+
+        # Item change page
+        self.client.post(
+            reverse("admin:inspections_inspectionitem_change", args=[items[0].pk]),
+            {"inspection": inspection.pk, "checklist_item": items[0].checklist_item_id,
+             "passed": "false", "notes": ""},
+        )
+        inspection.refresh_from_db()
+        self.assertEqual((inspection.answered_items, inspection.failed_items), (1, 1))
+
+        # Inline on the inspection change page
+        data = {
+            "school": self.school.pk, "checklist": self.checklist.pk,
+            "date": inspection.date.isoformat(), "status": inspection.status, "notes": "",
+            "inspection_items-TOTAL_FORMS": len(items), "inspection_items-INITIAL_FORMS": len(items),
+            "inspection_items-MIN_NUM_FORMS": 0, "inspection_items-MAX_NUM_FORMS": 1000,
+        }
+        for n, item in enumerate(items):
+            data.update({
+                f"inspection_items-{n}-id": item.pk,
+                f"inspection_items-{n}-inspection": inspection.pk,
+                f"inspection_items-{n}-checklist_item": item.checklist_item_id,
+                f"inspection_items-{n}-passed": "false" if n == 0 else "true" if n < 4 else "unknown",
+                f"inspection_items-{n}-notes": "",
+            })
+        data["inspection_items-9-DELETE"] = "on"
+        response = self.client.post(reverse("admin:inspections_inspection_change", args=[inspection.pk]), data)
+        self.assertEqual(response.status_code, 302)
+        inspection.refresh_from_db()
+        self.assertEqual(
+            (inspection.total_items, inspection.answered_items, inspection.failed_items), (9, 4, 1)
+        )
+
+        # Item delete page
+        self.client.post(
+            reverse("admin:inspections_inspectionitem_delete", args=[items[0].pk]), {"post": "yes"}
+        )
+        inspection.refresh_from_db()
+        self.assertEqual(
+            (inspection.total_items, inspection.answered_items, inspection.failed_items), (8, 3, 0)
+        )
+
+    def test_reconcile_command_repairs_drift(self):
+        inspection = Inspection.objects.create(
+            school=self.school, checklist=self.checklist, date=datetime.date.today()
+        )
+        inspection.initialize_items()
+        Inspection.objects.filter(pk=inspection.pk).update(total_items=0, answered_items=7)
+
+        call_command("reconcile_inspection_counters", stdout=StringIO())
+
+        inspection.refresh_from_db()
+        self.assertEqual((inspection.total_items, inspection.answered_items), (10, 0))
+
+
+class StatusRollupTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.school = School.objects.create(name="Test School")
+        cls.checklist = Checklist.objects.create(name="HACCP")
+        ChecklistItem.objects.bulk_create(
+            ChecklistItem(checklist=cls.checklist, text=f"Check #{n}", order=n)
+            for n in range(6)
+        )
+
+    def assertRollupMatches(self):
+        for kind, model in StatusRollup.SOURCES.items():
+            counts = model.objects.status_counts()
+            totals = StatusRollup.objects.totals(kind)
+            for status in model.Status.values:
+                self.assertEqual(totals.get(status, 0), counts[status], (kind, status))
+
+    def test_rollup_tracks_single_and_bulk_writes(self):
+        inspection = Inspection.objects.create(
+            school=self.school, checklist=self.checklist, date=datetime.date.today()
+        )
+        inspection.initialize_items()
+        inspection.inspection_items.update(passed=False)
+        inspection.complete()
+        self.assertRollupMatches()
+
+        items = inspection.inspection_items.order_by("pk")
+        InspectionItem.objects.filter(pk__in=list(items.values_list("pk", flat=True)[:2])).update(passed=True)
+        inspection.apply_reinspection(items)
+        self.assertRollupMatches()
+
+        action = CorrectiveAction.objects.filter(status=CorrectiveAction.Status.OPEN).first()
+        action.status = CorrectiveAction.Status.RESOLVED
+        action.save()
+        action.delete()
+        inspection.delete()
+        self.assertRollupMatches()
+
+    def test_status_counts_is_one_query(self):
+        with self.assertNumQueries(1):
+            counts = CorrectiveAction.objects.status_counts()
+        self.assertEqual(counts["total"], 0)
+
+
+class KeysetPaginatorTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = make_appuser("admin", AppUser.Role.ADMIN)
+        cls.north = School.objects.create(name="North")
+        cls.south = School.objects.create(name="South")
+        day = datetime.date(2024, 3, 1)
+        # Ties on the date, interleaved between the schools
+        for n, offset in enumerate((0, 0, 0, 1, 1, 2, 3, 3, 4)):
+            Inspection.objects.create(
+                school=cls.north if n % 3 else cls.south,
+                date=day + datetime.timedelta(days=offset),
+            )
+
+    def walk(self, paginator):
+        """Pages forward to the end, then back to the start, as pk lists."""
+        forward, page = [], paginator.page()
+        while True:
+            forward.append([i.pk for i in page])
+            if not page.has_next():
+                break
+            page = paginator.page(after=page.next_cursor)
+
+        backward = [[i.pk for i in page]]
+        while page.has_previous():
+            page = paginator.page(before=page.previous_cursor)
+            backward.append([i.pk for i in page])
+        return forward, backward[::-1]
+
+    def expected(self, queryset, ordering, per_page):
+        pks = list(queryset.order_by(*ordering).values_list("pk", flat=True))
+        return [pks[n:n + per_page] for n in range(0, len(pks), per_page)]
+
+    def test_walks_forward_and_back_through_ties(self):
+        cases = [
+            ("date", True, ("-date", "-pk")),
+            ("date", False, ("date", "pk")),
+            ("school__name", False, ("school__name", "pk")),
+        ]
+        for field, descending, ordering in cases:
+            with self.subTest(field=field, descending=descending):
+                paginator = KeysetPaginator(Inspection.objects.all(), field, descending, per_page=2)
+                forward, backward = self.walk(paginator)
+                self.assertEqual(forward, self.expected(Inspection.objects.all(), ordering, 2))
+                self.assertEqual(backward, forward)
+
+    def test_cursor_keeps_the_filter(self):
+        north = Inspection.objects.filter(school=self.north)
+        forward, backward = self.walk(KeysetPaginator(north, "date", True, per_page=2))
+        self.assertEqual(forward, self.expected(north, ("-date", "-pk"), 2))
+        self.assertEqual(backward, forward)
+
+    def test_malformed_cursors_are_ignored(self):
+        paginator = KeysetPaginator(Inspection.objects.all(), "date", True, per_page=3)
+        first = [i.pk for i in paginator.page()]
+
+        def encode(raw):
+            return base64.urlsafe_b64encode(raw.encode()).decode()
+
+        for cursor in ("!!!", encode("{}"), encode('["notadate", 1]'), encode("[[1], 1]"),
+                       encode("[null, 1]"), encode('["2024-03-01", "x"]')):
+            with self.subTest(cursor=cursor):
+                self.assertEqual([i.pk for i in paginator.page(after=cursor)], first)
+                self.assertEqual([i.pk for i in paginator.page(before=cursor)], first)
+
+    def test_views_ignore_cursors_from_another_sort(self):
+        self.client.force_login(self.admin.user)
+        url = reverse("inspections:inspection_list")
+        by_name = KeysetPaginator.encode_cursor("North", 1)
+        bad = base64.urlsafe_b64encode(b'[[1], 1]').decode()
+
+        for params in ({"sort": "-date", "after": by_name}, {"after": bad}, {"before": bad}):
+            self.assertEqual(self.client.get(url, params).status_code, 200)
+
+        school = reverse("schools:school_detail", args=[self.north.pk])
+        for name in ("inspections_after", "actions_after", "actions_before"):
+            self.assertEqual(self.client.get(school, {name: bad}).status_code, 200)
+        actions = reverse("inspections:corrective_action_list")
+        self.assertEqual(self.client.get(actions, {"after": bad}).status_code, 200)
+
+
+class InspectionDetailQueryTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user("admin", password="x")
+        cls.admin.appuser.role = AppUser.Role.ADMIN
+        cls.admin.appuser.save()
+        cls.school = School.objects.create(name="Test School")
+
+    def make_failed_inspection(self, size):
+        checklist = Checklist.objects.create(name=f"{size} items")
+        ChecklistItem.objects.bulk_create(
+            ChecklistItem(checklist=checklist, text=f"Check #{n}", order=n)
+            for n in range(size)
+        )
+        inspection = Inspection.objects.create(
+            school=self.school, checklist=checklist, date=datetime.date.today()
+        )
+        inspection.initialize_items()
+        inspection.inspection_items.update(passed=False)
+        inspection.complete()
+        # A second round of actions: only the newest one per item is shown
+        inspection.complete()
+        return inspection
+
+    def detail_queries(self, inspection):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(
+                reverse("inspections:inspection_detail", args=[inspection.pk])
+            )
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries)
+
+    def test_query_count_independent_of_item_count(self):
+        self.client.force_login(self.admin)
+        small = self.make_failed_inspection(10)
+        large = self.make_failed_inspection(500)
+
+        self.assertEqual(self.detail_queries(small), self.detail_queries(large))
+
+    def test_shows_latest_action_per_item(self):
+        self.client.force_login(self.admin)
+        inspection = self.make_failed_inspection(3)
+
+        response = self.client.get(
+            reverse("inspections:inspection_detail", args=[inspection.pk])
+        )
+        actions = CorrectiveAction.objects.filter(inspection_item__inspection=inspection)
+        latest = set(actions.latest_per_item().values_list("pk", flat=True))
+        self.assertEqual(len(latest), 3)
+
+        for pk in actions.values_list("pk", flat=True):
+            url = reverse("inspections:corrective_action_detail", args=[pk])
+            if pk in latest:
+                self.assertContains(response, url)
+            else:
+                self.assertNotContains(response, url)
+
+
+class CorrectiveActionListTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create_user("manager", password="x")
+        cls.manager = user.appuser
+        cls.manager.role = AppUser.Role.MANAGER
+        cls.manager.save()
+
+        cls.school = School.objects.create(name="Own School")
+        cls.school.managers.add(cls.manager)
+        cls.other_school = School.objects.create(name="Other School")
+
+        checklist = Checklist.objects.create(name="Checklist")
+        ChecklistItem.objects.bulk_create(
+            ChecklistItem(checklist=checklist, text=f"Check #{n}", order=n)
+            for n in range(15)
+        )
+        cls.inspections = []
+        for school in (cls.school, cls.school, cls.other_school):
+            inspection = Inspection.objects.create(
+                school=school, checklist=checklist, date=datetime.date.today()
+            )
+            inspection.initialize_items()
+            inspection.inspection_items.update(passed=False)
+            inspection.complete()
+            cls.inspections.append(inspection)
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.manager.user)
+
+    def shown(self, response):
+        return {action.pk for action in response.context["actions"]}
+
+    def test_paginates_visible_actions_in_fixed_queries(self):
+        url = reverse("inspections:corrective_action_list")
+        # The total is counted on the first visit, then cached
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as ctx:
+            first = self.client.get(url)
+        page_one = self.shown(first)
+        self.assertEqual(len(page_one), 25)
+
+        with self.assertNumQueries(len(ctx.captured_queries)):
+            second = self.client.get(url, {"after": first.context["page_obj"].next_cursor})
+        page_two = self.shown(second)
+
+        own = CorrectiveAction.objects.filter(inspection_item__inspection__school=self.school)
+        self.assertEqual(page_one | page_two, set(own.values_list("pk", flat=True)))
+
+    def test_inspection_route_filters_by_inspection(self):
+        inspection = self.inspections[0]
+        response = self.client.get(
+            reverse("inspections:corrective_action_list_by_inspection", args=[inspection.pk]),
+            {"status": CorrectiveAction.Status.OPEN},
+        )
+        self.assertEqual(response.status_code, 200)
+
+        expected = CorrectiveAction.objects.filter(inspection_item__inspection=inspection)
+        self.assertEqual(self.shown(response), set(expected.values_list("pk", flat=True)))
+
+    def test_inspection_route_hides_other_schools(self):
+        response = self.client.get(
+            reverse("inspections:corrective_action_list_by_inspection", args=[self.inspections[2].pk])
+        )
+        self.assertEqual(response.status_code, 404)
+
+
+class AdminChangelistTests(TestCase):
+
+    CHANGELISTS = (
+        "admin:inspections_inspection_changelist",
+        "admin:inspections_inspectionitem_changelist",
+        "admin:inspections_correctiveaction_changelist",
+        "admin:checklists_checklistitem_changelist",
+        "admin:users_appuser_changelist",
+    )
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.superuser = User.objects.create_superuser("root", password="x")
+        cls.checklist = Checklist.objects.create(name="Checklist")
+        ChecklistItem.objects.bulk_create(
+            ChecklistItem(checklist=cls.checklist, text=f"Check #{n}", order=n)
+            for n in range(3)
+        )
+
+    def setUp(self):
+        self.client.force_login(self.superuser)
+
+    def add_inspections(self, count):
+        for n in range(count):
+            user = User.objects.create_user(f"user{User.objects.count()}", first_name="Pat")
+            school = School.objects.create(name=f"School {School.objects.count()}")
+            inspection = Inspection.objects.create(
+                school=school, inspector=user.appuser, manager=user.appuser,
+                checklist=self.checklist, date=datetime.date.today(),
+            )
+            inspection.initialize_items()
+            inspection.inspection_items.update(passed=False)
+            inspection.complete()
+            CorrectiveAction.objects.filter(
+                inspection_item__inspection=inspection
+            ).update(assigned_to=user.appuser)
+
+    def changelist_queries(self):
+        counts = {}
+        for name in self.CHANGELISTS:
+            cache.clear()  # row counts
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.get(reverse(name))
+            self.assertEqual(response.status_code, 200)
+            counts[name] = len(ctx.captured_queries)
+        return counts
+
+    def test_query_count_independent_of_row_count(self):
+        self.add_inspections(2)
+        small = self.changelist_queries()
+        self.add_inspections(8)
+        self.assertEqual(self.changelist_queries(), small)
+
+    def test_autocomplete_filter(self):
+        self.add_inspections(2)
+        school = School.objects.get(name="School 1")
+
+        response = self.client.get(reverse("admin:inspections_inspection_changelist"))
+        # The sidebar doesn't list the schools, it has a box to pick one
+        school_filter = response.context["cl"].filter_specs[2]
+        self.assertEqual(school_filter.lookup_choices, [])
+        self.assertContains(response, 'data-field-name="school"')
+
+        response = self.client.get(
+            reverse("admin:inspections_correctiveaction_changelist"),
+            {"inspection_item__inspection__school__id__exact": school.pk},
+        )
+        actions = response.context["cl"].result_list
+        self.assertEqual({a.inspection_item.inspection.school_id for a in actions}, {school.pk})
+        # The current value is pre-selected in the box
+        self.assertContains(response, f'<option value="{school.pk}" selected>School 1</option>', html=True)
+
+        # The box's lookups go through the admin autocomplete view
+        response = self.client.get(reverse("admin:autocomplete"), {
+            "term": "School 1", "app_label": "inspections",
+            "model_name": "inspection", "field_name": "school",
+        })
+        self.assertEqual(
+            [result["id"] for result in response.json()["results"]], [str(school.pk)]
+        )
+
+
+class SchoolSummaryTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.school = School.objects.create(name="Summary School")
+        cls.checklist = Checklist.objects.create(name="Checklist")
+        ChecklistItem.objects.bulk_create(
+            ChecklistItem(checklist=cls.checklist, text=f"Check #{n}", order=n)
+            for n in range(3)
+        )
+
+    def make_inspection(self, days_ago=0, failing=0):
+        inspection = Inspection.objects.create(
+            school=self.school, checklist=self.checklist,
+            date=datetime.date.today() - datetime.timedelta(days=days_ago),
+        )
+        inspection.initialize_items()
+        items = inspection.inspection_items.order_by("pk")
+        items.update(passed=True)
+        items.filter(pk__in=items.values_list("pk", flat=True)[:failing]).update(passed=False)
+        inspection.complete()
+        return inspection
+
+    def summary(self):
+        summary = SchoolSummary.objects.get(school=self.school)
+        return (summary.pass_rate, summary.open_actions, summary.last_inspection_date)
+
+    def assertMatchesRebuild(self):
+        maintained = self.summary()
+        SchoolSummary.objects.rebuild()
+        self.assertEqual(maintained, self.summary())
+
+    def test_maintained_through_inspection_lifecycle(self):
+        today = datetime.date.today()
+        Inspection.objects.create(school=self.school, date=today + datetime.timedelta(days=7))
+        # Pending inspections aren't counted
+        self.assertEqual(self.summary(), (None, 0, None))
+
+        self.make_inspection(days_ago=10)
+        failed = self.make_inspection(days_ago=3, failing=2)
+        self.assertEqual(self.summary(), (50, 2, today - datetime.timedelta(days=3)))
+        self.assertMatchesRebuild()
+
+        action = CorrectiveAction.objects.filter(inspection_item__inspection=failed).first()
+        action.status = CorrectiveAction.Status.RESOLVED
+        action.save()
+        self.assertEqual(self.summary()[1], 1)
+
+        failed.inspection_items.update(passed=True)
+        failed.apply_reinspection(failed.inspection_items.all())
+        self.assertEqual(self.summary(), (100, 0, today - datetime.timedelta(days=3)))
+        self.assertMatchesRebuild()
+
+        failed.delete()
+        self.assertEqual(self.summary(), (100, 0, today - datetime.timedelta(days=10)))
+        self.assertMatchesRebuild()
+
+    def test_moving_an_inspection_updates_both_schools(self):
+        inspection = self.make_inspection(failing=1)
+        other = School.objects.create(name="Other School")
+
+        inspection.school = other
+        inspection.save()
+        self.assertEqual(self.summary(), (None, 0, None))
+        self.assertEqual(other.summary.open_actions, 1)
+
+    def test_deleting_a_school_drops_its_summary(self):
+        self.make_inspection(failing=1)
+        self.school.delete()
+        self.assertFalse(SchoolSummary.objects.exists())
+
+
+class ComplianceRollupTests(TestCase):
+
+    # Wednesday and Thursday of the same week, in different months
+    JAN_31 = datetime.date(2024, 1, 31)
+    FEB_1 = datetime.date(2024, 2, 1)
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = make_appuser("admin", AppUser.Role.ADMIN)
+        cls.manager = make_appuser("manager", AppUser.Role.MANAGER)
+        cls.school = School.objects.create(name="North")
+        cls.other = School.objects.create(name="South")
+        cls.school.managers.add(cls.manager)
+
+        cls.checklist = Checklist.objects.create(name="Kitchen")
+        ChecklistItem.objects.bulk_create(
+            ChecklistItem(checklist=cls.checklist, text=f"Check #{n}", order=n)
+            for n in range(4)
+        )
+        cls.first_item = cls.checklist.items.get(order=0)
+
+    def make_inspection(self, date, failing=0, school=None):
+        inspection = Inspection.objects.create(
+            school=school or self.school, checklist=self.checklist, date=date,
+        )
+        inspection.initialize_items()
+        items = inspection.inspection_items.order_by("checklist_item__order")
+        items.update(passed=True)
+        items.filter(pk__in=items.values_list("pk", flat=True)[:failing]).update(passed=False)
+        inspection.complete()
+        return inspection
+
+    def trend(self, period, **filters):
+        rows = ComplianceRollup.objects.filter(**filters).trend(
+            period, datetime.date(2020, 1, 1), datetime.date(2030, 1, 1)
+        )
+        return [(row["period_start"], row["passed"], row["failed"]) for row in rows]
+
+    def snapshot(self):
+        rollups = sorted(ComplianceRollup.objects.values_list(
+            "period", "period_start", "school_id", "checklist_id",
+            "checklist_item_id", "passed_items", "failed_items",
+        ))
+        totals = sorted(ComplianceTotal.objects.values_list(
+            "period", "period_start", "level", "object_id", "passed_items", "failed_items",
+        ))
+        return rollups, totals
+
+    def assertMatchesBackfill(self):
+        maintained = self.snapshot()
+        ComplianceRollup.objects.all().delete()
+        ComplianceTotal.objects.all().delete()
+        call_command("backfill_compliance_rollups", restart=True, stdout=StringIO())
+        self.assertEqual(self.snapshot(), maintained)
+
+    def test_completing_rolls_up_day_week_and_month(self):
+        Inspection.objects.create(school=self.school, date=self.JAN_31)  # pending: ignored
+        self.make_inspection(self.JAN_31, failing=1)
+        self.make_inspection(self.FEB_1, failing=2)
+
+        Period = ComplianceRollup.Period
+        self.assertEqual(self.trend(Period.DAY), [(self.JAN_31, 3, 1), (self.FEB_1, 2, 2)])
+        self.assertEqual(self.trend(Period.WEEK), [(datetime.date(2024, 1, 29), 5, 3)])
+        self.assertEqual(self.trend(Period.MONTH), [
+            (datetime.date(2024, 1, 1), 3, 1), (datetime.date(2024, 2, 1), 2, 2),
+        ])
+        self.assertEqual(
+            self.trend(Period.WEEK, checklist_item=self.first_item),
+            [(datetime.date(2024, 1, 29), 0, 2)],
+        )
+        self.assertEqual(self.trend(Period.WEEK, school=self.other), [])
+        self.assertMatchesBackfill()
+
+    def test_result_changes_refresh_the_rollups(self):
+        inspection = self.make_inspection(self.JAN_31, failing=2)
+
+        # Reinspection leaves the inspection FAILED: no status change to signal
+        fixed = inspection.inspection_items.filter(checklist_item=self.first_item)
+        fixed.update(passed=True)
+        inspection.apply_reinspection(fixed)
+        self.assertEqual(inspection.status, Inspection.Status.FAILED)
+        self.assertEqual(self.trend(ComplianceRollup.Period.DAY), [(self.JAN_31, 3, 1)])
+
+        # Moving the inspection empties its old day, week and month
+        inspection.date = datetime.date(2024, 3, 5)
+        inspection.school = self.other
+        inspection.save()
+        self.assertEqual(self.trend(ComplianceRollup.Period.MONTH, school=self.school), [])
+        self.assertEqual(
+            self.trend(ComplianceRollup.Period.MONTH, school=self.other),
+            [(datetime.date(2024, 3, 1), 3, 1)],
+        )
+        self.assertMatchesBackfill()
+
+        inspection.delete()
+        self.assertFalse(ComplianceRollup.objects.exists())
+        self.assertFalse(ComplianceTotal.objects.exists())
+
+    def test_refreshing_a_school_only_adds_its_own_change(self):
+        self.make_inspection(self.JAN_31, failing=1)
+        district = ComplianceTotal.objects.filter(
+            period=ComplianceRollup.Period.MONTH, level=ComplianceTotal.Level.DISTRICT,
+        )
+        # Stands in for another school's refresh committing in between: the
+        # shared totals are incremented, never re-summed over its rows
+        district.update(passed_items=F("passed_items") + 10)
+
+        self.make_inspection(self.JAN_31, failing=2, school=self.other)
+
+        self.assertEqual(district.values_list("passed_items", "failed_items").get(), (3 + 10 + 2, 1 + 2))
+
+    def test_totals_sum_the_rollups(self):
+        self.make_inspection(self.JAN_31, failing=1)
+        self.make_inspection(self.FEB_1, failing=2, school=self.other)
+        Level, week = ComplianceTotal.Level, datetime.date(2024, 1, 29)
+
+        def total(level, object_id):
+            return ComplianceTotal.objects.filter(
+                period=ComplianceRollup.Period.WEEK, level=level, object_id=object_id,
+            ).values_list("period_start", "passed_items", "failed_items").get()
+
+        self.assertEqual(total(Level.DISTRICT, 0), (week, 5, 3))
+        self.assertEqual(total(Level.CHECKLIST, self.checklist.pk), (week, 5, 3))
+        self.assertEqual(total(Level.ITEM, self.first_item.pk), (week, 0, 2))
+        self.assertEqual(total(Level.SCHOOL, self.other.pk), (week, 2, 2))
+        self.assertMatchesBackfill()
+
+        # Deleting a school takes its history out of the totals
+        self.other.delete()
+        self.assertEqual(total(Level.DISTRICT, 0), (week, 3, 1))
+        self.assertFalse(ComplianceTotal.objects.filter(level=Level.SCHOOL, object_id=self.other.pk))
+        self.assertMatchesBackfill()
+
+    def test_backfill_resumes_after_the_last_chunk(self):
+        self.make_inspection(datetime.date(2024, 1, 10), failing=1)
+        self.make_inspection(datetime.date(2024, 3, 10), failing=1)
+        ComplianceRollup.objects.all().delete()
+        ComplianceTotal.objects.all().delete()
+        RollupBackfill.objects.create(through_date=datetime.date(2024, 1, 31))
+
+        out = StringIO()
+        call_command("backfill_compliance_rollups", stdout=out)
+        self.assertIn("Resuming after 2024-01-31", out.getvalue())
+        self.assertNotIn("2024-01-10", out.getvalue())
+        # January was "done" by the interrupted run, so only March is back
+        self.assertEqual(
+            self.trend(ComplianceRollup.Period.MONTH),
+            [(datetime.date(2024, 3, 1), 3, 1)],
+        )
+        self.assertTrue(RollupBackfill.objects.get().finished_at)
+
+        # A finished run isn't resumed
+        call_command("backfill_compliance_rollups", stdout=StringIO())
+        self.assertEqual(RollupBackfill.objects.filter(finished_at__isnull=False).count(), 2)
+        self.assertEqual(len(self.trend(ComplianceRollup.Period.MONTH)), 2)
+
+        for months in (0, -1):
+            with self.assertRaises(CommandError):
+                call_command("backfill_compliance_rollups", months=months, stdout=StringIO())
+
+    def test_trend_matches_the_rollups_for_every_filter(self):
+        self.make_inspection(self.JAN_31, failing=1)
+        self.make_inspection(self.FEB_1, failing=3, school=self.other)
+        other_checklist = Checklist.objects.create(name="Other")
+        start, end = datetime.date(2024, 1, 1), datetime.date(2024, 12, 31)
+
+        filter_sets = [
+            {}, {"school": self.school.pk}, {"checklist": self.checklist.pk},
+            {"checklist": other_checklist.pk}, {"item": self.first_item.pk},
+            {"school": self.other.pk, "checklist": self.checklist.pk},
+            {"school": self.school.pk, "item": self.first_item.pk},
+        ]
+        columns = {"school": "school_id", "checklist": "checklist_id", "item": "checklist_item_id"}
+        for appuser in (self.admin, self.manager):
+            for filters in filter_sets:
+                for period in ComplianceRollup.Period.values:
+                    with self.subTest(role=appuser.role, filters=filters, period=period):
+                        expected = ComplianceRollup.objects.visible_to(appuser).filter(
+                            **{columns[name]: value for name, value in filters.items()}
+                        ).trend(period, start, end)
+                        self.assertEqual(
+                            compliance_trend(appuser, period, start, end, **filters), expected
+                        )
+
+    def test_trend_endpoint(self):
+        self.make_inspection(self.JAN_31, failing=1)
+        self.make_inspection(self.JAN_31, failing=4, school=self.other)
+        url = reverse("inspections:compliance_trend_data")
+        params = {"period": "MONTH", "start": "2023-12-15", "end": "2024-06-30"}
+
+        self.client.force_login(self.admin.user)
+        with self.assertNumQueries(4):  # session, user, appuser, district totals
+            data = self.client.get(url, params).json()
+        self.assertEqual(data["start"], "2023-12-01")
+        self.assertEqual(data["points"], [
+            {"period_start": "2024-01-01", "passed": 3, "failed": 5, "pass_rate": 37.5},
+        ])
+
+        data = self.client.get(url, {**params, "item": self.first_item.pk}).json()
+        self.assertEqual(data["points"][0]["pass_rate"], 0.0)
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(url, {**params, "checklist": self.checklist.pk})
+        self.assertNotIn(ComplianceRollup._meta.db_table, ctx.captured_queries[-1]["sql"])
+
+        # Managers only see their schools
+        self.client.force_login(self.manager.user)
+        data = self.client.get(url, params).json()
+        self.assertEqual(data["points"][0]["pass_rate"], 75.0)
+        self.assertEqual(self.client.get(url, {**params, "school": self.other.pk}).json()["points"], [])
+
+        for bad in ({"period": "YEAR"}, {"start": "2024-13-01"}, {"school": "x"},
+                    {"start": "2024-02-01", "end": "2024-01-01"}):
+            response = self.client.get(url, bad)
+            self.assertEqual(response.status_code, 400)
+            self.assertIn("error", response.json())
+
+        response = self.client.get(reverse("inspections:compliance_trends"), {"checklist": self.checklist.pk})
+        self.assertContains(response, "Check #3")
+        self.assertEqual(list(response.context["schools"]), [self.school])
+
+    def test_inspectors_see_district_trends(self):
+        # Pass / fail counts only; inspectors may inspect any school
+        inspector = make_appuser("inspector", AppUser.Role.INSPECTOR)
+        self.make_inspection(self.JAN_31, failing=1, school=self.other)
+        start, end = datetime.date(2024, 1, 1), datetime.date(2024, 1, 31)
+        self.assertEqual(
+            compliance_trend(inspector, "MONTH", start, end),
+            compliance_trend(self.admin, "MONTH", start, end),
+        )
+        self.client.force_login(inspector.user)
+        response = self.client.get(reverse("inspections:compliance_trends"))
+        self.assertEqual(set(response.context["schools"]), {self.school, self.other})
+
+
+class ExportTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create_user("manager", password="x")
+        cls.manager = user.appuser
+        cls.manager.role = AppUser.Role.MANAGER
+        cls.manager.save()
+
+        cls.school = School.objects.create(name="Own School")
+        cls.school.managers.add(cls.manager)
+        other_school = School.objects.create(name="Other School")
+
+        checklist = Checklist.objects.create(name="Checklist")
+        ChecklistItem.objects.bulk_create(
+            ChecklistItem(checklist=checklist, text=f"Check #{n}", order=n)
+            for n in range(4)
+        )
+        for school, passed in ((cls.school, True), (cls.school, False), (other_school, False)):
+            inspection = Inspection.objects.create(
+                school=school, checklist=checklist, date=datetime.date.today()
+            )
+            inspection.initialize_items()
+            inspection.inspection_items.update(passed=passed)
+            inspection.complete()
+        cls.other_action = CorrectiveAction.objects.filter(
+            inspection_item__inspection__school=other_school
+        ).first()
+
+    def setUp(self):
+        self.client.force_login(self.manager.user)
+
+    def export(self, kind, **params):
+        response = self.client.get(reverse("inspections:inspection_export", args=[kind]), params)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return b"".join(response.streaming_content)
+
+    def test_csv_is_scoped_and_filtered(self):
+        rows = self.export("items").decode().splitlines()
+        self.assertEqual(len(rows), 1 + 8)   # header + own school's items
+        self.assertNotIn("Other School", "".join(rows))
+
+        rows = self.export("actions", status=Inspection.Status.FAILED).decode().splitlines()
+        self.assertEqual(len(rows), 1 + 4)
+
+    def test_actions_export_includes_actions_assigned_elsewhere(self):
+        CorrectiveAction.objects.filter(pk=self.other_action.pk).update(assigned_to=self.manager)
+
+        rows = self.export("actions").decode().splitlines()
+        self.assertEqual(len(rows), 1 + 4 + 1)
+        self.assertEqual(sum("Other School" in row for row in rows), 1)
+
+    def test_formula_cells_are_quoted(self):
+        CorrectiveAction.objects.filter(pk=self.other_action.pk).update(
+            assigned_to=self.manager, description='=HYPERLINK("http://x")'
+        )
+
+        self.assertIn("'=HYPERLINK", self.export("actions").decode())
+        with zipfile.ZipFile(BytesIO(self.export("actions", format="xlsx"))) as zf:
+            sheet = zf.read("xl/worksheets/sheet1.xml").decode()
+        self.assertIn(">'=HYPERLINK", sheet)
+
+    def test_xlsx_is_a_workbook(self):
+        content = self.export("inspections", format="xlsx")
+        with zipfile.ZipFile(BytesIO(content)) as zf:
+            sheet = zf.read("xl/worksheets/sheet1.xml").decode()
+        self.assertEqual(sheet.count("<row>"), 1 + 2)
+        self.assertIn("Own School", sheet)
+
+    def test_malformed_filters_are_ignored(self):
+        bad = {"school": "abc", "date": "2024-13-45", "assignee": "x"}
+        rows = self.export("inspections", **bad).decode().splitlines()
+        self.assertEqual(len(rows), 1 + 2)
+
+        for name in ("inspections:inspection_list", "inspections:corrective_action_list"):
+            with self.subTest(view=name):
+                response = self.client.get(reverse(name), bad)
+                self.assertEqual(response.status_code, 200)
+
+    def test_unknown_export_is_404(self):
+        response = self.client.get(reverse("inspections:inspection_export", args=["users"]))
+        self.assertEqual(response.status_code, 404)
+
+
+class InspectionSubmitTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create_user("inspector", password="x")
+        cls.inspector = user.appuser
+        cls.inspector.role = AppUser.Role.INSPECTOR
+        cls.inspector.save()
+        cls.school = School.objects.create(name="Test School")
+        StatusRollup.objects.rebuild()   # every status row exists up front
+
+    def setUp(self):
+        self.client.force_login(self.inspector.user)
+
+    def make_inspection(self, size):
+        checklist = Checklist.objects.create(name=f"{size} items")
+        ChecklistItem.objects.bulk_create(
+            ChecklistItem(checklist=checklist, text=f"Check #{n}", order=n)
+            for n in range(size)
+        )
+        inspection = Inspection.objects.create(
+            school=self.school, inspector=self.inspector, checklist=checklist,
+            date=datetime.date.today(),
+        )
+        inspection.initialize_items()
+        return inspection
+
+    def submit(self, inspection, key, results, action="complete"):
+        return self.client.post(
+            reverse("inspections:inspection_submit", args=[inspection.pk]),
+            {"action": action, "results": results},
+            content_type="application/json",
+            headers={"Idempotency-Key": key},
+        )
+
+    def all_results(self, inspection, failed=()):
+        return [
+            {"id": pk, "passed": pk not in failed, "notes": "late" if pk in failed else None}
+            for pk in inspection.inspection_items.values_list("pk", flat=True)
+        ]
+
+    def test_complete_applies_results_in_one_request(self):
+        inspection = self.make_inspection(5)
+        first = inspection.inspection_items.order_by("pk").first()
+
+        response = self.submit(inspection, "k1", self.all_results(inspection, failed={first.pk}))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {
+            "inspection": inspection.pk,
+            "status": Inspection.Status.FAILED,
+            "updated_items": 5,
+            "total_items": 5,
+            "answered_items": 5,
+            "failed_items": 1,
+            "unresolved_actions": 1,
+        })
+        first.refresh_from_db()
+        self.assertEqual((first.passed, first.notes), (False, "late"))
+
+    def test_query_count_independent_of_item_count(self):
+        counts = []
+        for n, size in enumerate((10, 100)):
+            inspection = self.make_inspection(size)
+            results = self.all_results(inspection)
+            with CaptureQueriesContext(connection) as ctx:
+                self.assertEqual(self.submit(inspection, f"size-{n}", results).status_code, 200)
+            counts.append(len(ctx.captured_queries))
+        self.assertEqual(counts[0], counts[1])
+
+    def test_retry_with_same_key_replays_response(self):
+        inspection = self.make_inspection(3)
+        results = self.all_results(inspection, failed=set(
+            inspection.inspection_items.values_list("pk", flat=True)
+        ))
+
+        first = self.submit(inspection, "retry", results)
+        second = self.submit(inspection, "retry", results)
+
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second["Idempotent-Replayed"], "true")
+        self.assertEqual(second.json(), first.json())
+        self.assertEqual(
+            CorrectiveAction.objects.filter(inspection_item__inspection=inspection).count(), 3
+        )
+
+        changed = self.submit(inspection, "retry", self.all_results(inspection))
+        self.assertEqual(changed.status_code, 422)
+
+    def test_unknown_items_are_rejected_and_nothing_is_written(self):
+        inspection = self.make_inspection(2)
+        other = self.make_inspection(1)
+        results = self.all_results(inspection) + self.all_results(other)
+
+        response = self.submit(inspection, "bad", results)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["unknown_ids"], [results[-1]["id"]])
+        self.assertFalse(inspection.inspection_items.filter(passed__isnull=False).exists())
+
+        # Nothing was recorded under the key, so a corrected retry goes through
+        response = self.submit(inspection, "bad", self.all_results(inspection))
+        self.assertEqual(response.status_code, 200)
+
+    def test_reinspect_needs_a_failed_inspection(self):
+        inspection = self.make_inspection(3)
+        pks = set(inspection.inspection_items.values_list("pk", flat=True))
+
+        # Pending: failing everything must go through "complete"
+        response = self.submit(inspection, "pending", self.all_results(inspection, failed=pks), "reinspect")
+        self.assertEqual(response.status_code, 409)
+
+        # Passed and locked: its results can't be rewritten
+        self.submit(inspection, "done", self.all_results(inspection))
+        response = self.submit(inspection, "rewrite", self.all_results(inspection, failed=pks), "reinspect")
+        self.assertEqual(response.status_code, 409)
+
+        inspection.refresh_from_db()
+        self.assertEqual(inspection.status, Inspection.Status.PASSED)
+        self.assertFalse(inspection.inspection_items.filter(passed=False).exists())
+
+    def test_reinspect_only_items_with_unresolved_actions(self):
+        inspection = self.make_inspection(3)
+        first, *others = inspection.inspection_items.order_by("pk").values_list("pk", flat=True)
+        self.submit(inspection, "done", self.all_results(inspection, failed={first}))
+
+        response = self.submit(inspection, "all", self.all_results(inspection), "reinspect")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["item_ids"], others)
+
+        response = self.submit(inspection, "fixed", [{"id": first, "passed": True}], "reinspect")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["status"], Inspection.Status.PASSED)
+
+    def test_rejects_malformed_results(self):
+        inspection = self.make_inspection(1)
+        item = inspection.inspection_items.get()
+
+        for results in ([], [{"id": "x"}], [{"id": item.pk, "passed": "yes"}],
+                        [{"id": item.pk}, {"id": item.pk}]):
+            self.assertEqual(self.submit(inspection, "k", results).status_code, 400, results)
+
+
+class InspectionPerformTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create_user("inspector", password="x")
+        cls.inspector = user.appuser
+        cls.inspector.role = AppUser.Role.INSPECTOR
+        cls.inspector.save()
+        cls.school = School.objects.create(name="Test School")
+        StatusRollup.objects.rebuild()
+
+    def setUp(self):
+        self.client.force_login(self.inspector.user)
+
+    def make_inspection(self, size):
+        checklist = Checklist.objects.create(name=f"{size} items")
+        ChecklistItem.objects.bulk_create(
+            ChecklistItem(checklist=checklist, text=f"Check #{n}", order=n)
+            for n in range(size)
+        )
+        inspection = Inspection.objects.create(
+            school=self.school, inspector=self.inspector, checklist=checklist,
+            date=datetime.date.today(),
+        )
+        inspection.initialize_items()
+        return inspection
+
+    def post_form(self, inspection, pks, failed=(), **extra):
+        data = {"form-TOTAL_FORMS": len(pks), "form-INITIAL_FORMS": len(pks), **extra}
+        for n, pk in enumerate(pks):
+            data[f"form-{n}-id"] = pk
+            data[f"form-{n}-notes"] = "late" if pk in failed else ""
+            if pk not in failed:
+                data[f"form-{n}-passed"] = "on"
+        return self.client.post(
+            reverse("inspections:inspection_perform", args=[inspection.pk]), data
+        )
+
+    def item_pks(self, inspection):
+        return list(inspection.inspection_items.order_by("pk").values_list("pk", flat=True))
+
+    def test_get_query_count_independent_of_item_count(self):
+        counts = []
+        for size in (5, 50):
+            inspection = self.make_inspection(size)
+            url = reverse("inspections:inspection_perform", args=[inspection.pk])
+            with CaptureQueriesContext(connection) as ctx:
+                self.assertContains(self.client.get(url), "Check #4")
+            counts.append(len(ctx.captured_queries))
+        self.assertEqual(counts[0], counts[1])
+
+    def test_post_query_count_independent_of_item_count(self):
+        counts = []
+        for size in (5, 50):
+            inspection = self.make_inspection(size)
+            pks = self.item_pks(inspection)
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.post_form(inspection, pks, failed={pks[0]}, complete_inspection="1")
+            self.assertEqual(response.status_code, 302)
+            counts.append(len(ctx.captured_queries))
+        self.assertEqual(counts[0], counts[1])
+
+        inspection.refresh_from_db()
+        self.assertEqual(inspection.status, Inspection.Status.FAILED)
+        self.assertEqual((inspection.answered_items, inspection.failed_items), (50, 1))
+        self.assertEqual(inspection.inspection_items.get(pk=pks[0]).notes, "late")
+
+    def test_only_changed_rows_are_written(self):
+        inspection = self.make_inspection(3)
+        pks = self.item_pks(inspection)
+        inspection.inspection_items.filter(pk=pks[0]).update(passed=True)
+
+        with CaptureQueriesContext(connection) as ctx:
+            self.post_form(inspection, pks)
+        updates = [
+            q["sql"] for q in ctx.captured_queries
+            if q["sql"].startswith(f'UPDATE "{InspectionItem._meta.db_table}"')
+        ]
+        self.assertEqual(len(updates), 1)
+        self.assertNotIn(f'"id" = {pks[0]})', updates[0])
+
+    @override_settings(DATA_UPLOAD_MAX_NUMBER_FIELDS=20)
+    def test_forms_over_the_field_limit_submit_json(self):
+        # 3 items: 15 fields fit; 10 items: 36 don't
+        for size, as_json in ((3, False), (10, True)):
+            inspection = self.make_inspection(size)
+            response = self.client.get(reverse("inspections:inspection_perform", args=[inspection.pk]))
+            self.assertEqual(response.context["submit_as_json"], as_json)
+            submit = reverse("inspections:inspection_submit", args=[inspection.pk])
+            self.assertEqual(submit in response.content.decode(), as_json)
+
+        # The full form would be refused before reaching the view
+        pks = self.item_pks(inspection)
+        self.assertEqual(self.post_form(inspection, pks).status_code, 400)
+
+    def test_items_of_other_inspections_are_rejected(self):
+        inspection = self.make_inspection(1)
+        other = self.make_inspection(1)
+
+        response = self.post_form(inspection, self.item_pks(other), failed=set(self.item_pks(other)))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(other.inspection_items.filter(passed__isnull=False).exists())
+
+    def test_reinspect_all_fixes_failed_items(self):
+        inspection = self.make_inspection(3)
+        pks = self.item_pks(inspection)
+        self.post_form(inspection, pks, failed=set(pks[:2]), complete_inspection="1")
+
+        url = reverse("inspections:inspection_perform", args=[inspection.pk])
+        data = {"form-TOTAL_FORMS": 2, "form-INITIAL_FORMS": 2}
+        for n, pk in enumerate(pks[:2]):
+            data.update({f"form-{n}-id": pk, f"form-{n}-notes": "", f"form-{n}-passed": "on"})
+        self.assertEqual(self.client.post(f"{url}?reinspect_all=1", data).status_code, 302)
+
+        inspection.refresh_from_db()
+        self.assertEqual(inspection.status, Inspection.Status.PASSED)
+        self.assertEqual(
+            CorrectiveAction.objects.filter(
+                inspection_item__inspection=inspection,
+                status=CorrectiveAction.Status.REINSPECTED,
+            ).count(), 2
+        )
+        self.assertEqual(
+            StatusRollup.objects.get(
+                kind=StatusRollup.Kind.CORRECTIVE_ACTION,
+                status=CorrectiveAction.Status.REINSPECTED,
+            ).count, 2
+        )
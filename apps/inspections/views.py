@@ -1,13 +1,57 @@
+import datetime
+import hashlib
+import json
+import uuid
+
+from django.conf import settings
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
 from django.core.exceptions import PermissionDenied
+from django.http import Http404, JsonResponse, StreamingHttpResponse
+from django.db import IntegrityError, transaction
+from django.views.decorators.http import require_POST
+from django.db.models import Prefetch
+from . import exports
 from .forms import InspectionForm
 from apps.users.models import AppUser
-from django.core.paginator import Paginator
-from .models import Inspection, CorrectiveAction, InspectionItem
+from .models import (
+    ComplianceRollup, Inspection, CorrectiveAction, InspectionItem, InspectionSubmission,
+    UnknownItemsError, compliance_trend, period_start,
+)
+from .pagination import KeysetPaginator
+from apps.checklists.models import Checklist, ChecklistItem
 from apps.schools.models import School
 from .forms import InspectionItemFormSet
-from django.db import models
+
+
+INSPECTIONS_PER_PAGE = 25
+
+# Columns the inspection list may be ordered by (each paired with pk).
+# date and status pages walk an index (IndexCoverageTests), so each page
+# costs the same however deep it is. school__name doesn't: the sort key is
+# on the joined school and names aren't unique, so no index yields
+# (school name, pk) order and every page sorts the full filtered set.
+# The same holds for the corrective action list's school sort.
+INSPECTION_SORT_FIELDS = ("date", "school__name", "status")
+
+CORRECTIVE_ACTIONS_PER_PAGE = 25
+
+CORRECTIVE_ACTION_SORT_FIELDS = (
+    "created_at", "updated_at", "status", "inspection_item__inspection__school__name",
+)
+
+# Everything corrective_action_list.html renders; the rest stays deferred
+CORRECTIVE_ACTION_LIST_COLUMNS = (
+    "status",
+    "created_at",
+    "updated_at",
+    "inspection_item__checklist_item__text",
+    "inspection_item__inspection__date",
+    "inspection_item__inspection__school__name",
+    "assigned_to__user__first_name",
+    "assigned_to__user__last_name",
+    "assigned_to__user__username",
+)
 
 
 @login_required
@@ -31,16 +75,11 @@ def inspection_create(request):
             else:
                 inspection.manager = None
 
-            inspection.save()
+            with transaction.atomic():
+                inspection.save()
 
-            # 2. Create inspection items with None=True by default
-            if inspection.checklist:
-                for checklist_item in inspection.checklist.items.all():
-                    InspectionItem.objects.create(
-                        inspection=inspection,
-                        checklist_item=checklist_item,
-                        passed=None,  # <-- Now allowed
-                    )
+                # 2. Create inspection items (passed=None) in one batched insert
+                inspection.initialize_items()
 
             return redirect("inspections:inspection_detail", pk=inspection.pk)
 
@@ -54,43 +93,21 @@ def inspection_create(request):
 def inspection_list(request):
     user = request.user.appuser
 
-    inspections = Inspection.objects.select_related(
+    # Role scoping: Admin all, Manager/Kitchen their schools, Inspector own
+    inspections = Inspection.objects.visible_to(user).select_related(
         "school", "inspector", "manager", "checklist"
     )
 
-    # Restrict kitchen user visibility
-    if user.role == AppUser.Role.KITCHEN:
-        inspections = inspections.filter(
-            school__in=user.kitchen_schools.all()
-        )
-
-    # Manager only sees their schools
-    elif user.role == AppUser.Role.MANAGER:
-        inspections = inspections.filter(
-            school__in=user.managed_schools.all()
-        )
-
-    # Inspector only sees their inspections
-    elif user.role == AppUser.Role.INSPECTOR:
-        inspections = inspections.filter(inspector=user)
-
-    # Admin sees all → no filter
-
-    # Filters
+    # Filters (shared with the exports)
     school_id = request.GET.get("school")
     status = request.GET.get("status")
     date = request.GET.get("date")
-
-    if school_id:
-        inspections = inspections.filter(school_id=school_id)
-    if status:
-        inspections = inspections.filter(status=status)
-    if date:
-        inspections = inspections.filter(date=date)
+    inspections = inspections.filtered(request.GET)
 
     # Sorting
     sort_by = request.GET.get("sort", "-date")
-    inspections = inspections.order_by(sort_by)
+    if sort_by.lstrip("-") not in INSPECTION_SORT_FIELDS:
+        sort_by = "-date"
 
     # Current sort indicators
     if sort_by.startswith('-'):
@@ -100,18 +117,58 @@ def inspection_list(request):
         current_sort = sort_by
         sort_direction = 'asc'
 
+    # Keyset pagination: seek past the last (sort value, pk) seen
+    paginator = KeysetPaginator(
+        inspections,
+        current_sort,
+        descending=sort_direction == 'desc',
+        per_page=INSPECTIONS_PER_PAGE,
+    )
+    page_obj = paginator.page(
+        after=request.GET.get("after"),
+        before=request.GET.get("before"),
+    )
+
     return render(request, 'inspections/inspection_list.html', {
-        "inspections": inspections,
+        "inspections": page_obj.object_list,
+        "page_obj": page_obj,
+        "total": paginator.row_count,
+        "status_choices": Inspection.Status.choices,
+        "export_kinds": [("inspections", "Inspections"), ("items", "Items"), ("actions", "Actions")],
         "schools": School.objects.all(),
         "selected_school": school_id,
         "selected_status": status,
         "selected_date": date,
         "current_sort": current_sort,
         "sort_direction": sort_direction,
+        "sort_prefix": "-" if sort_direction == 'desc' else "",
     })
 
 
 
+@login_required
+def inspection_export(request, kind):
+    """Stream inspections, items or corrective actions as CSV / XLSX.
+
+    Scoped like the inspection / action lists, honouring the inspection
+    list filters; rows are
+    read with a chunked cursor so memory stays flat for any export size.
+    """
+    fmt = request.GET.get("format", "csv")
+    if kind not in exports.EXPORTS or fmt not in exports.FORMATS:
+        raise Http404("Unknown export.")
+
+    inspections = Inspection.objects.filtered(request.GET)
+
+    filename = f"{kind}-{datetime.date.today():%Y%m%d}.{fmt}"
+    response = StreamingHttpResponse(
+        exports.stream_export(kind, inspections, fmt, request.user.appuser),
+        content_type=exports.content_type(fmt),
+    )
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
+
+
 @login_required
 def inspection_detail(request, pk):
     inspection = get_object_or_404(
@@ -123,50 +180,54 @@ def inspection_detail(request, pk):
 
     user = request.user.appuser
 
-    # Admin: full access
-    if user.role == AppUser.Role.ADMIN:
-        pass
-
-    # Manager: must manage this school
-    elif user.role == AppUser.Role.MANAGER:
-        if inspection.school not in user.managed_schools.all():
-            raise PermissionDenied()
-
-    # Inspector: must be assigned to this inspection
-    elif user.role == AppUser.Role.INSPECTOR:
-        if inspection.inspector != user:
-            raise PermissionDenied()
-
-    # Kitchen: must belong to this school
-    elif user.role == AppUser.Role.KITCHEN:
-        if inspection.school not in user.kitchen_schools.all():
-            raise PermissionDenied()
-
-    else:
+    # Single EXISTS query against the role-scoped queryset
+    if not Inspection.objects.visible_to(user).filter(pk=inspection.pk).exists():
         raise PermissionDenied()
 
-    unresolved_actions = CorrectiveAction.objects.filter(
-        inspection_item__inspection=inspection,
-        status__in=["OPEN", "IN_PROGRESS", "AWAITING_REINSPECTION"]
-    )
-
     can_reinspect_all = user.role in [AppUser.Role.ADMIN, AppUser.Role.INSPECTOR]
 
+    # Items in one query, newest action per item in another; the text comes
+    # from the pinned checklist version
+    items = inspection.attach_texts(
+        inspection.inspection_items.prefetch_related(
+            Prefetch(
+                "corrective_actions",
+                queryset=CorrectiveAction.objects.latest_per_item(),
+                to_attr="latest_actions",
+            )
+        ).order_by("pk")
+    )
 
     return render(request, "inspections/inspection_detail.html", {
         "inspection": inspection,
-        "unresolved_actions": unresolved_actions,
+        "items": items,
         "can_reinspect_all": can_reinspect_all,
     })
 
 
 
 
+def check_can_perform(user, inspection):
+    """Admins, and the inspector an inspection is assigned to, may perform it."""
+    if user.role not in (AppUser.Role.ADMIN, AppUser.Role.INSPECTOR):
+        raise PermissionDenied("You do not have permission to perform this inspection.")
+
+    if user.role == AppUser.Role.INSPECTOR and inspection.inspector_id != user.pk:
+        raise PermissionDenied("This inspection is not assigned to you.")
+
+
+def is_locked(inspection):
+    """Completed = PASSED or COMPLETED, but inspector can redo failed inspections."""
+    return (
+        inspection.status in [Inspection.Status.PASSED, Inspection.Status.COMPLETED]
+        and not inspection.unresolved_actions
+    )
+
+
 @login_required
 def inspection_perform(request, pk):
     inspection = get_object_or_404(
-        Inspection.objects.select_related("school", "inspector", "manager", "checklist")
-        .prefetch_related("inspection_items__checklist_item"),
+        Inspection.objects.select_related("school", "inspector", "manager", "checklist"),
         pk=pk
     )
 
@@ -175,11 +236,7 @@ def inspection_perform(request, pk):
     # -------------------------------------------------
     # 1. PERMISSIONS
     # -------------------------------------------------
-    if user.role not in (AppUser.Role.ADMIN, AppUser.Role.INSPECTOR):
-        raise PermissionDenied("You do not have permission to perform this inspection.")
-
-    if user.role == AppUser.Role.INSPECTOR and inspection.inspector != user:
-        raise PermissionDenied("This inspection is not assigned to you.")
+    check_can_perform(user, inspection)
 
     # -------------------------------------------------
     # 2. Detect reinspection type
@@ -188,174 +245,293 @@ def inspection_perform(request, pk):
     reinspect_all = request.GET.get("reinspect_all")  # reinspect all failed items
 
     # Which items should appear in the form?
+    inspection_items_qs = InspectionItem.objects.filter(inspection=inspection).order_by("pk")
+
     if action_id:
-        inspection_items_qs = inspection.inspection_items.filter(
+        inspection_items_qs = inspection_items_qs.filter(
             corrective_actions__pk=action_id
         )
     elif reinspect_all:
         # Only items tied to unresolved corrective actions
-        inspection_items_qs = inspection.inspection_items.filter(
+        inspection_items_qs = inspection_items_qs.filter(
             corrective_actions__status__in=[
                 CorrectiveAction.Status.OPEN,
                 CorrectiveAction.Status.IN_PROGRESS,
                 CorrectiveAction.Status.AWAITING_REINSPECTION,
             ]
         )
-    else:
-        # Normal inspection mode
-        inspection_items_qs = inspection.inspection_items.all()
 
     # -------------------------------------------------
     # 3. Determine if inspection should be read-only
     # -------------------------------------------------
-    has_unresolved_actions = CorrectiveAction.objects.filter(
-        inspection_item__inspection=inspection,
-        status__in=[
-            CorrectiveAction.Status.OPEN,
-            CorrectiveAction.Status.IN_PROGRESS,
-            CorrectiveAction.Status.AWAITING_REINSPECTION,
-        ]
-    ).exists()
-
-    # Completed = PASSED or COMPLETED, but inspector can redo failed inspections
-    is_completed = (
-        inspection.status in [Inspection.Status.PASSED, Inspection.Status.COMPLETED]
-        and not has_unresolved_actions
-    )
-
     # NEVER lock in reinspection mode
-    if action_id or reinspect_all:
-        is_completed = False
+    is_completed = is_locked(inspection) and not (action_id or reinspect_all)
 
-    # Formset
-    ItemFormSet = InspectionItemFormSet(queryset=inspection_items_qs)
+    # One formset per request; its queryset is the only item fetch
+    formset = InspectionItemFormSet(
+        request.POST if request.method == "POST" else None,
+        queryset=inspection_items_qs,
+    )
 
     # -------------------------------------------------
     # 4. Process POST
     # -------------------------------------------------
-    if request.method == "POST":
-        formset = InspectionItemFormSet(request.POST, queryset=inspection_items_qs)
-
-        if formset.is_valid():
-            formset.save()
+    if request.method == "POST" and formset.is_valid():
+        # Item results, action statuses, inspection status and counters
+        # all land in one transaction
+        with transaction.atomic():
+            formset.save_changed()
 
-            # -----------------------------------------
+            # -------------------------------------
             # REINSPECTION (single or bulk)
-            # -----------------------------------------
+            # -------------------------------------
             if action_id or reinspect_all:
+                # REINSPECTED / OPEN from each item's new result, then
+                # FAILED / PASSED from whatever is still unresolved
+                inspection.apply_reinspection(InspectionItem.objects.filter(
+                    pk__in=[form.instance.pk for form in formset.forms]
+                ))
 
-                actions = CorrectiveAction.objects.filter(
-                    inspection_item__in=inspection_items_qs
-                )
-
-                for action in actions:
-                    # Update action based on pass/fail result
-                    if action.inspection_item.passed:
-                        action.status = CorrectiveAction.Status.REINSPECTED
-                    else:
-                        action.status = CorrectiveAction.Status.OPEN
-                    action.save()
-
-                # Reevaluate inspection status
-                still_unresolved = CorrectiveAction.objects.filter(
-                    inspection_item__inspection=inspection,
-                    status__in=[
-                        CorrectiveAction.Status.OPEN,
-                        CorrectiveAction.Status.IN_PROGRESS,
-                        CorrectiveAction.Status.AWAITING_REINSPECTION,
-                    ]
-                ).exists()
-
-                inspection.status = (
-                    Inspection.Status.FAILED if still_unresolved
-                    else Inspection.Status.PASSED
-                )
-                inspection.save()
-
-                return redirect("inspections:inspection_detail", pk=inspection.pk)
-
-            # -----------------------------------------
+            # -------------------------------------
             # NORMAL INSPECTION FLOW
-            # -----------------------------------------
-            if "complete_inspection" in request.POST:
-                failed_items = inspection.inspection_items.filter(passed=False)
-
-                if failed_items.exists():
-                    inspection.status = Inspection.Status.FAILED
-
-                    school = inspection.school
-
-                    # Create corrective actions
-                    for item in failed_items:
-                        assigned_user = (
-                            school.kitchen_staff.first()
-                            or school.managers.first()
-                            or None
-                        )
-
-                        CorrectiveAction.objects.create(
-                            inspection_item=item,
-                            assigned_to=assigned_user,
-                            description=f"Correct issue: {item.checklist_item.text}",
-                        )
-                else:
-                    inspection.status = Inspection.Status.PASSED
+            # -------------------------------------
+            elif "complete_inspection" in request.POST:
+                # FAILED + one corrective action per failed item, else PASSED
+                inspection.complete()
+
             else:
                 inspection.status = Inspection.Status.PENDING
+                inspection.save()
+                inspection.refresh_counters()
 
-            inspection.save()
-            return redirect("inspections:inspection_detail", pk=inspection.pk)
-
-    else:
-        formset = ItemFormSet
+        return redirect("inspections:inspection_detail", pk=inspection.pk)
 
     # -------------------------------------------------
     # 5. Render Template
     # -------------------------------------------------
+    # Checklist text as of the version the inspection was created from
+    inspection.attach_texts(form.instance for form in formset.forms)
+
     return render(request, "inspections/inspection_perform.html", {
         "inspection": inspection,
         "formset": formset,
         "is_completed": is_completed,
         "action_id": action_id,
         "reinspect_all": reinspect_all,
+        "submit_as_json": exceeds_field_limit(len(formset.forms)),
+        # One key per rendered page, so a repeated click doesn't apply twice
+        "idempotency_key": uuid.uuid4().hex,
     })
 
 
+# The perform form posts three fields per item, plus the CSRF token, the
+# management form and the clicked button
+PERFORM_FIELDS_PER_ITEM = 3
+PERFORM_EXTRA_FIELDS = 6
+
+
+def exceeds_field_limit(items):
+    """Whether the perform form for ``items`` would be over DATA_UPLOAD_MAX_NUMBER_FIELDS.
+
+    Such a form is sent to inspection_submit as JSON instead, so the
+    site-wide limit stays at Django's default.
+    """
+    limit = settings.DATA_UPLOAD_MAX_NUMBER_FIELDS
+    return limit is not None and PERFORM_FIELDS_PER_ITEM * items + PERFORM_EXTRA_FIELDS > limit
+
+
+
+SUBMIT_ACTIONS = ("save", "complete", "reinspect")
+
+
+def _submission_error(message, status=400, **extra):
+    return JsonResponse({"error": message, **extra}, status=status)
+
+
+def _parse_results(results):
+    """``[{"id", "passed", "notes"}, ...]`` -> ``{id: {field: value}}``, or raise ValueError."""
+    if not isinstance(results, list) or not results:
+        raise ValueError("'results' must be a non-empty list.")
+
+    parsed = {}
+    for n, result in enumerate(results):
+        if not isinstance(result, dict) or type(result.get("id")) is not int:
+            raise ValueError(f"results[{n}]: an object with an integer 'id' is required.")
+        if result["id"] in parsed:
+            raise ValueError(f"results[{n}]: item {result['id']} appears more than once.")
+        if "passed" in result and result["passed"] not in (True, False, None):
+            raise ValueError(f"results[{n}]: 'passed' must be true, false or null.")
+        if "notes" in result and not isinstance(result["notes"], (str, type(None))):
+            raise ValueError(f"results[{n}]: 'notes' must be a string or null.")
+
+        parsed[result["id"]] = {
+            name: result[name] for name in InspectionItem.RESULT_FIELDS if name in result
+        }
+    return parsed
+
 
 @login_required
-def corrective_action_list(request):
+@require_POST
+def inspection_submit(request, pk):
+    """Apply all item results of an inspection from one JSON request.
+
+    Body::
+
+        {"idempotency_key": "...",            # or an Idempotency-Key header
+         "action": "save" | "complete" | "reinspect",
+         "results": [{"id": 12, "passed": false, "notes": "..."}, ...]}
+
+    Results are checked against the inspection's item ids and written with
+    one bulk update; completion / reinspection runs in the same transaction.
+    A repeated key replays the first response instead of applying again.
+    ``reinspect`` takes only a FAILED inspection's items with unresolved
+    corrective actions.
+    """
+    inspection = get_object_or_404(Inspection, pk=pk)
     user = request.user.appuser
+    check_can_perform(user, inspection)
+
+    try:
+        payload = json.loads(request.body)
+        if not isinstance(payload, dict):
+            raise ValueError("The request body must be a JSON object.")
+        results = _parse_results(payload.get("results"))
+    except ValueError as e:
+        return _submission_error(str(e))
+
+    key = request.headers.get("Idempotency-Key") or payload.get("idempotency_key")
+    if not isinstance(key, str) or not 0 < len(key) <= 100:
+        return _submission_error("An idempotency key of up to 100 characters is required.")
+
+    action = payload.get("action", "save")
+    if action not in SUBMIT_ACTIONS:
+        return _submission_error(f"'action' must be one of {', '.join(SUBMIT_ACTIONS)}.")
+    if action != "reinspect" and is_locked(inspection):
+        return _submission_error("This inspection is completed.", status=409)
+
+    # Like the perform view: only a FAILED inspection is reinspected, and
+    # only the items tied to unresolved corrective actions
+    if action == "reinspect":
+        if inspection.status != Inspection.Status.FAILED:
+            return _submission_error("Only a failed inspection can be reinspected.", status=409)
+        reinspectable = set(inspection.inspection_items.filter(
+            corrective_actions__status__in=CorrectiveAction.UNRESOLVED_STATUSES
+        ).values_list("pk", flat=True))
+        not_reinspectable = sorted(set(results) - reinspectable)
+        if not_reinspectable:
+            return _submission_error(
+                "Only items with unresolved corrective actions can be reinspected.",
+                item_ids=not_reinspectable,
+            )
+
+    payload_hash = hashlib.sha256(
+        json.dumps([action, payload["results"]], sort_keys=True).encode()
+    ).hexdigest()
+
+    try:
+        with transaction.atomic():
+            # The receipt goes in first: a concurrent request with the same
+            # key blocks on the unique index, then replays this response.
+            try:
+                with transaction.atomic():
+                    receipt = InspectionSubmission.objects.create(
+                        inspection=inspection, key=key, submitted_by=user,
+                        payload_hash=payload_hash, response={},
+                    )
+            except IntegrityError:
+                receipt = InspectionSubmission.objects.get(inspection=inspection, key=key)
+                if receipt.payload_hash != payload_hash:
+                    return _submission_error(
+                        "This idempotency key was already used with a different payload.",
+                        status=422,
+                    )
+                response = JsonResponse(receipt.response)
+                response["Idempotent-Replayed"] = "true"
+                return response
+
+            updated = inspection.apply_results(results)
 
-    # ADMIN – sees all actions
-    if user.role == AppUser.Role.ADMIN:
-        actions = CorrectiveAction.objects.all()
-
-    # MANAGER – actions in their schools OR assigned to them
-    elif user.role == AppUser.Role.MANAGER:
-        manager_schools = user.managed_schools.all()
-        actions = CorrectiveAction.objects.filter(
-            models.Q(assigned_to=user) |
-            models.Q(inspection_item__inspection__school__in=manager_schools)
-        ).distinct()
-
-    # INSPECTOR – actions from inspections they performed
-    elif user.role == AppUser.Role.INSPECTOR:
-        actions = CorrectiveAction.objects.filter(
-            inspection_item__inspection__inspector=user
+            if action == "reinspect":
+                inspection.apply_reinspection(InspectionItem.objects.filter(pk__in=list(results)))
+            elif action == "complete":
+                inspection.complete()
+            else:
+                inspection.status = Inspection.Status.PENDING
+                inspection.save()
+                inspection.refresh_counters()
+
+            receipt.response = {
+                "inspection": inspection.pk,
+                "status": inspection.status,
+                "updated_items": updated,
+                **{name: getattr(inspection, name) for name in Inspection.COUNTER_FIELDS},
+            }
+            receipt.save(update_fields=["response"])
+
+    except UnknownItemsError as e:
+        # Rolled back, receipt included, so the key can be retried
+        return _submission_error("Unknown item ids.", unknown_ids=e.ids)
+
+    return JsonResponse(receipt.response)
+
+
+@login_required
+def corrective_action_list(request, inspection_id=None):
+    user = request.user.appuser
+
+    # Admin: all. Manager: their schools or assigned to them.
+    # Inspector: from inspections they performed. Kitchen: their schools.
+    # Role filters are EXISTS subqueries, so no DISTINCT is needed.
+    actions = CorrectiveAction.objects.visible_to(user).select_related(
+        "inspection_item__checklist_item",
+        "inspection_item__inspection__school",
+        "assigned_to__user",
+    ).only(*CORRECTIVE_ACTION_LIST_COLUMNS)
+
+    inspection = None
+    if inspection_id is not None:
+        inspection = get_object_or_404(
+            Inspection.objects.visible_to(user).select_related("school"), pk=inspection_id
         )
+        actions = actions.filter(inspection_item__inspection=inspection)
 
-    # KITCHEN – assigned to them OR tied to their schools
-    elif user.role == AppUser.Role.KITCHEN:
-        kitchen_schools = user.kitchen_schools.all()
-        actions = CorrectiveAction.objects.filter(
-            inspection_item__inspection__school__in=kitchen_schools
-        ).distinct()
+    # Filters
+    school_id = request.GET.get("school")
+    status = request.GET.get("status")
+    assignee = request.GET.get("assignee")
 
-    else:
-        actions = CorrectiveAction.objects.none()
+    actions = actions.filtered(request.GET, user)
+
+    # Sorting
+    sort_by = request.GET.get("sort", "-created_at")
+    if sort_by.lstrip("-") not in CORRECTIVE_ACTION_SORT_FIELDS:
+        sort_by = "-created_at"
+    current_sort = sort_by.lstrip("-")
+    sort_direction = "desc" if sort_by.startswith("-") else "asc"
+
+    paginator = KeysetPaginator(
+        actions,
+        current_sort,
+        descending=sort_direction == "desc",
+        per_page=CORRECTIVE_ACTIONS_PER_PAGE,
+    )
+    page_obj = paginator.page(
+        after=request.GET.get("after"),
+        before=request.GET.get("before"),
+    )
 
     return render(request, "inspections/corrective_action_list.html", {
-        "actions": actions,
+        "actions": page_obj.object_list,
+        "page_obj": page_obj,
+        "total": paginator.row_count,
+        "inspection": inspection,
+        "status_choices": CorrectiveAction.Status.choices,
+        "schools": School.objects.only("pk", "name").order_by("name"),
+        "selected_school": school_id,
+        "selected_status": status,
+        "selected_assignee": assignee,
+        "current_sort": current_sort,
+        "sort_direction": sort_direction,
     })
 
 
@@ -395,6 +571,7 @@ def corrective_action_detail(request, pk):
 
 
 @login_required
+@require_POST
 def corrective_action_assign(request, pk):
     action = get_object_or_404(CorrectiveAction, pk=pk)
 
@@ -405,18 +582,17 @@ def corrective_action_assign(request, pk):
     elif user.role not in (AppUser.Role.ADMIN, AppUser.Role.MANAGER):
         raise PermissionDenied("Only admins and managers can reassign corrective actions.")
 
-    if request.method == "POST":
-        new_assigned_id = request.POST.get("assigned_to")
+    new_assigned_id = request.POST.get("assigned_to")
 
-        if new_assigned_id:
-            try:
-                new_assigned_user = AppUser.objects.get(id=new_assigned_id)
-                action.assigned_to = new_assigned_user
-                action.save()
-            except AppUser.DoesNotExist:
-                pass  # ignore invalid input, shouldn't happen
+    if new_assigned_id:
+        try:
+            new_assigned_user = AppUser.objects.get(id=new_assigned_id)
+            action.assigned_to = new_assigned_user
+            action.save()
+        except AppUser.DoesNotExist:
+            pass  # ignore invalid input, shouldn't happen
 
-        return redirect("inspections:corrective_action_list")
+    return redirect("inspections:corrective_action_list")
 
 
 @login_required
@@ -447,3 +623,111 @@ def reinspect_action(request, pk):
         "inspections:inspection_perform",
         pk=inspection.pk
     )
+
+
+# ============================================================
+#   COMPLIANCE TRENDS
+# ============================================================
+
+# Range shown when the query string gives no start date
+TREND_DEFAULT_SPANS = {
+    ComplianceRollup.Period.DAY: datetime.timedelta(days=90),
+    ComplianceRollup.Period.WEEK: datetime.timedelta(weeks=52),
+    ComplianceRollup.Period.MONTH: datetime.timedelta(days=5 * 365),
+}
+
+# Query string parameters that filter a trend (ids)
+TREND_FILTERS = ("school", "checklist", "item")
+
+
+def _parse_date(params, name):
+    try:
+        return datetime.date.fromisoformat(params[name]) if params.get(name) else None
+    except ValueError:
+        raise ValueError(f"'{name}' must be a date (YYYY-MM-DD).")
+
+
+def _trend_query(params):
+    """``(period, start, end, filters)`` from the query string, or raise ValueError."""
+    period = params.get("period") or ComplianceRollup.Period.MONTH
+    if period not in ComplianceRollup.Period.values:
+        raise ValueError(f"'period' must be one of {', '.join(ComplianceRollup.Period.values)}.")
+
+    end = _parse_date(params, "end") or datetime.date.today()
+    start = _parse_date(params, "start") or end - TREND_DEFAULT_SPANS[period]
+    if start > end:
+        raise ValueError("'start' must not be after 'end'.")
+
+    filters = {}
+    for name in TREND_FILTERS:
+        value = params.get(name)
+        if value:
+            if not value.isdigit():
+                raise ValueError(f"'{name}' must be an id.")
+            filters[name] = int(value)
+
+    return period, period_start(period, start), end, filters
+
+
+@login_required
+def compliance_trends(request):
+    """Trend charts; the data comes from compliance_trend_data."""
+    checklist_id = request.GET.get("checklist")
+    items = ChecklistItem.objects.none()
+    if checklist_id and checklist_id.isdigit():
+        items = ChecklistItem.objects.filter(checklist_id=checklist_id)
+
+    # Same school scoping as the trend data (ComplianceRollup.visible_to)
+    appuser = request.user.appuser
+    if appuser.role == AppUser.Role.MANAGER:
+        schools = appuser.managed_schools.all()
+    elif appuser.role == AppUser.Role.KITCHEN:
+        schools = appuser.kitchen_schools.all()
+    elif appuser.role in (AppUser.Role.ADMIN, AppUser.Role.INSPECTOR):
+        schools = School.objects.all()
+    else:
+        schools = School.objects.none()
+
+    return render(request, "inspections/compliance_trends.html", {
+        "periods": ComplianceRollup.Period.choices,
+        "schools": schools,
+        "checklists": Checklist.objects.all(),
+        "items": items,
+        "selected_period": request.GET.get("period") or ComplianceRollup.Period.MONTH,
+        "selected_school": request.GET.get("school"),
+        "selected_checklist": checklist_id,
+        "selected_item": request.GET.get("item"),
+        "selected_start": request.GET.get("start"),
+        "selected_end": request.GET.get("end"),
+    })
+
+
+@login_required
+def compliance_trend_data(request):
+    """Item pass rate per period as JSON, read from the rollups / totals only.
+
+    Query string: ``period`` (DAY / WEEK / MONTH, default MONTH), ``start``
+    and ``end`` dates, and optional ``school``, ``checklist``, ``item`` ids.
+    """
+    try:
+        period, start, end, filters = _trend_query(request.GET)
+    except ValueError as error:
+        return JsonResponse({"error": str(error)}, status=400)
+
+    points = []
+    for row in compliance_trend(request.user.appuser, period, start, end, **filters):
+        answered = row["passed"] + row["failed"]
+        points.append({
+            "period_start": row["period_start"].isoformat(),
+            "passed": row["passed"],
+            "failed": row["failed"],
+            "pass_rate": round(100 * row["passed"] / answered, 1) if answered else None,
+        })
+
+    return JsonResponse({
+        "period": period,
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "points": points,
+    })
+
@@ -1,9 +1,12 @@
 from django.contrib import admin
+from apps.core.admin import ImportAdminMixin
+from .importers import SchoolImporter
 from .models import School
 
 @admin.register(School)
-class SchoolAdmin(admin.ModelAdmin):
+class SchoolAdmin(ImportAdminMixin, admin.ModelAdmin):
     list_display = ('name', 'city', 'state', 'phone_number')
     search_fields = ('name', 'city', 'state')
     list_filter = ('state',)
     filter_horizontal = ('managers', 'kitchen_staff', 'inspectors')
+    importer_class = SchoolImporter
@@ -0,0 +1,139 @@
+from django.core.exceptions import ValidationError
+
+from apps.core.imports import Importer, split_list
+from apps.inspections.models import Inspection
+from apps.search import index as search_index
+from apps.users import cache as dashboard_cache
+from apps.users.models import AppUser
+from .models import School
+
+
+SCHOOL_FIELDS = ("name", "address", "city", "state", "postal_code", "phone_number")
+
+# M2M column -> role its users must have
+MEMBERSHIP_COLUMNS = {
+    "managers": AppUser.Role.MANAGER,
+    "kitchen_staff": AppUser.Role.KITCHEN,
+    "inspectors": AppUser.Role.INSPECTOR,
+}
+
+
+def school_key(name, city, state):
+    """Schools are matched on name + city + state."""
+    return (name, city or "", state or "")
+
+
+class SchoolImporter(Importer):
+    """Upsert schools and add their manager / kitchen / inspector links.
+
+    Columns: name, address, city, state, postal_code, phone_number, and
+    managers / kitchen_staff / inspectors as usernames (";"-separated in
+    CSV, lists in JSON). Existing links are kept.
+    """
+
+    label = "schools"
+
+    def __init__(self, dry_run=False):
+        super().__init__(dry_run)
+        self.updated_pks = []
+
+    def clean(self, line, record):
+        fields = {}
+        for name in SCHOOL_FIELDS:
+            value = record.get(name)
+            fields[name] = str(value).strip() if value not in (None, "") else None
+
+        try:
+            School(**fields).clean_fields(exclude=["created_at"])
+        except ValidationError as e:
+            raise ValidationError([
+                f"{field}: {message}"
+                for field, messages in e.message_dict.items() for message in messages
+            ])
+
+        return [{
+            "line": line,
+            "key": school_key(fields["name"], fields["city"], fields["state"]),
+            "fields": fields,
+            "members": {
+                column: split_list(record.get(column)) for column in MEMBERSHIP_COLUMNS
+            },
+        }]
+
+    def resolve(self, rows):
+        usernames = {u for row in rows for names in row["members"].values() for u in names}
+        users = {
+            username: (pk, role)
+            for pk, username, role in AppUser.objects.filter(
+                user__username__in=usernames
+            ).values_list("pk", "user__username", "role")
+        }
+
+        # A later row for the same school replaces an earlier one
+        resolved = {}
+        for row in rows:
+            problems = []
+            for column, role in MEMBERSHIP_COLUMNS.items():
+                ids = []
+                for username in row["members"][column]:
+                    if username not in users:
+                        problems.append(f"{column}: unknown user '{username}'")
+                    elif users[username][1] != role:
+                        problems.append(f"{column}: '{username}' is not a {role.label}")
+                    else:
+                        ids.append(users[username][0])
+                row["members"][column] = ids
+
+            if problems:
+                self.report.error(row["line"], "; ".join(problems))
+            else:
+                resolved[row["key"]] = row
+        return list(resolved.values())
+
+    def save_batch(self, rows):
+        existing = {
+            school_key(s.name, s.city, s.state): s
+            for s in School.objects.filter(name__in={row["fields"]["name"] for row in rows})
+        }
+
+        created, updated, changed_fields = [], [], set()
+        for row in rows:
+            school = existing.get(row["key"])
+            if school is None:
+                school = School(**row["fields"])
+                created.append(school)
+            else:
+                changed = {
+                    name for name, value in row["fields"].items()
+                    if getattr(school, name) != value
+                }
+                if changed:
+                    for name in changed:
+                        setattr(school, name, row["fields"][name])
+                    updated.append(school)
+                    changed_fields |= changed
+            row["school"] = school
+
+        School.objects.bulk_create(created)
+        # bulk_update builds a CASE per column, so only send changed columns
+        if updated:
+            School.objects.bulk_update(updated, sorted(changed_fields), batch_size=200)
+        self.report.created += len(created)
+        self.report.updated += len(updated)
+        self.updated_pks += [school.pk for school in updated]
+
+        for column in MEMBERSHIP_COLUMNS:
+            through = getattr(School, column).through
+            links = [
+                through(school_id=row["school"].pk, appuser_id=appuser_id)
+                for row in rows for appuser_id in row["members"][column]
+            ]
+            through.objects.bulk_create(links, ignore_conflicts=True)
+            self.report.linked += len(links)
+
+    def finish(self):
+        # Bulk writes skip the invalidation and search signals
+        dashboard_cache.bump("all", *(f"school:{pk}" for pk in self.updated_pks))
+        search_index.index_inspections(
+            Inspection.objects.filter(school_id__in=self.updated_pks).values_list("pk", flat=True)
+        )
@@ -1,3 +1,162 @@
+import datetime
+from io import BytesIO
+
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from apps.checklists.models import Checklist, ChecklistItem
+from apps.inspections.models import CorrectiveAction, Inspection
+from apps.users.models import AppUser
+from .importers import SchoolImporter
+from .models import School
+
+
+def make_appuser(username, role):
+    user = User.objects.create_user(username, password="x")
+    user.appuser.role = role
+    user.appuser.save()
+    return user.appuser
+
+
+SCHOOLS_CSV = b"""name,city,state,postal_code,managers,kitchen_staff,inspectors
+North Elementary,Springfield,IL,62701,manager,cook1; cook2,inspector
+South Elementary,Springfield,IL,62702,,cook1,
+,Springfield,IL,,,,
+Bad Links,Springfield,IL,,cook1,ghost,
+"""
+
+
+class SchoolImportTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.manager = make_appuser("manager", AppUser.Role.MANAGER)
+        cls.cook1 = make_appuser("cook1", AppUser.Role.KITCHEN)
+        cls.cook2 = make_appuser("cook2", AppUser.Role.KITCHEN)
+        cls.inspector = make_appuser("inspector", AppUser.Role.INSPECTOR)
+
+    def run_import(self, content, **kwargs):
+        return SchoolImporter(**kwargs).run(BytesIO(content), "csv")
+
+    def test_creates_schools_and_links(self):
+        report = self.run_import(SCHOOLS_CSV)
+
+        self.assertEqual(report.created, 2)
+        north = School.objects.get(name="North Elementary")
+        self.assertEqual(list(north.managers.all()), [self.manager])
+        self.assertEqual(set(north.kitchen_staff.all()), {self.cook1, self.cook2})
+        self.assertEqual(list(north.inspectors.all()), [self.inspector])
+
+    def test_reports_invalid_rows_and_skips_them(self):
+        report = self.run_import(SCHOOLS_CSV)
+
+        self.assertEqual([line for line, _ in report.errors], [4, 5])
+        self.assertIn("'cook1' is not a Manager", report.errors[1][1])
+        self.assertIn("unknown user 'ghost'", report.errors[1][1])
+        self.assertFalse(School.objects.filter(name="Bad Links").exists())
+
+    def test_reimport_updates_in_place(self):
+        self.run_import(SCHOOLS_CSV)
+        report = self.run_import(SCHOOLS_CSV.replace(b"62701", b"62799"))
+
+        self.assertEqual((report.created, report.updated), (0, 1))
+        self.assertEqual(School.objects.count(), 2)
+        self.assertEqual(School.objects.get(name="North Elementary").postal_code, "62799")
+
+    def test_dry_run_writes_nothing(self):
+        report = self.run_import(SCHOOLS_CSV, dry_run=True)
+        self.assertEqual(len(report.errors), 2)
+        self.assertFalse(School.objects.exists())
+
+    def test_admin_import_view(self):
+        admin = User.objects.create_superuser("admin", password="x")
+        self.client.force_login(admin)
+
+        response = self.client.post(reverse("admin:schools_school_import"), {
+            "file": SimpleUploadedFile("schools.csv", SCHOOLS_CSV, content_type="text/csv"),
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "unknown user")
+        self.assertEqual(School.objects.count(), 2)
+
+
+class SchoolDetailTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.viewer = make_appuser("viewer", AppUser.Role.ADMIN)
+        cls.school = School.objects.create(name="Detail School")
+        cls.checklist = Checklist.objects.create(name="Checklist")
+        ChecklistItem.objects.bulk_create(
+            ChecklistItem(checklist=cls.checklist, text=f"Check #{n}", order=n)
+            for n in range(4)
+        )
+
+    def setUp(self):
+        self.client.force_login(self.viewer.user)
+
+    def add(self, count):
+        for n in range(count):
+            staff = [
+                make_appuser(f"{role.lower()}{AppUser.objects.count()}", role)
+                for role in (AppUser.Role.MANAGER, AppUser.Role.KITCHEN, AppUser.Role.INSPECTOR)
+            ]
+            self.school.managers.add(staff[0])
+            self.school.kitchen_staff.add(staff[1])
+            self.school.inspectors.add(staff[2])
+
+            inspection = Inspection.objects.create(
+                school=self.school, checklist=self.checklist,
+                date=datetime.date.today() - datetime.timedelta(days=Inspection.objects.count()),
+            )
+            inspection.initialize_items()
+            inspection.inspection_items.update(passed=False)
+            inspection.complete()
+
+    def get(self, **params):
+        return self.client.get(reverse("schools:school_detail", args=[self.school.pk]), params)
+
+    def test_query_count_independent_of_staff_and_history(self):
+        self.add(1)
+        with CaptureQueriesContext(connection) as ctx:
+            self.get()
+        self.add(12)
+        with self.assertNumQueries(len(ctx.captured_queries)):
+            response = self.get()
+
+        self.assertEqual(len(response.context["inspections"]), 10)
+        self.assertEqual(len(response.context["corrective_actions"]), 10)
+        self.assertEqual(len(response.context["school"].managers.all()), 13)
+        self.assertContains(response, "52")  # open actions: 13 inspections x 4 items
+
+    def test_pages_through_inspections(self):
+        self.add(12)
+        first = self.get()
+        second = self.get(inspections_after=first.context["inspections"].next_cursor)
+
+        seen = [i.pk for page in (first, second) for i in page.context["inspections"]]
+        expected = Inspection.objects.filter(school=self.school).order_by("-date", "-pk")
+        self.assertEqual(seen, list(expected.values_list("pk", flat=True)))
+        # The other list keeps its own position
+        self.assertEqual(
+            [a.pk for a in second.context["corrective_actions"]],
+            [a.pk for a in first.context["corrective_actions"]],
+        )
+
+    def test_summary_header(self):
+        response = self.get()
+        self.assertIsNone(response.context["summary"])
+        self.assertContains(response, "Pass Rate")
+
+        self.add(1)
+        summary = self.get().context["summary"]
+        self.assertEqual((summary.pass_rate, summary.open_actions), (0, 4))
+        self.assertEqual(
+            summary.open_actions,
+            CorrectiveAction.objects.filter(inspection_item__inspection__school=self.school).count(),
+        )
 
-# Create your tests here.
@@ -1,26 +1,57 @@
 from django.shortcuts import render, get_object_or_404
 from django.contrib.auth.decorators import login_required
+from django.db.models import Prefetch
 from .models import School
 from apps.inspections.models import Inspection, CorrectiveAction
+from apps.inspections.pagination import KeysetPaginator
+from apps.users.models import AppUser
+
+
+SCHOOL_INSPECTIONS_PER_PAGE = 10
+SCHOOL_ACTIONS_PER_PAGE = 10
+
+STAFF_FIELDS = ("managers", "kitchen_staff", "inspectors")
 
 
 @login_required
 def school_detail(request, pk):
-    school = get_object_or_404(School, pk=pk)
+    # Staff lists with their users: one query per list, not per person
+    staff = AppUser.objects.select_related("user").order_by("user__first_name", "user__last_name")
+    school = get_object_or_404(
+        School.objects.select_related("summary").prefetch_related(
+            *(Prefetch(field, queryset=staff) for field in STAFF_FIELDS)
+        ),
+        pk=pk,
+    )
 
-    # Recent inspections for this school
-    inspections = Inspection.objects.filter(school=school).order_by("-date")[:10]
+    # Inspection history, newest first (keyset pages)
+    inspections = KeysetPaginator(
+        Inspection.objects.filter(school=school),
+        "date",
+        descending=True,
+        per_page=SCHOOL_INSPECTIONS_PER_PAGE,
+    ).page(
+        after=request.GET.get("inspections_after"),
+        before=request.GET.get("inspections_before"),
+    )
 
-    # Corrective actions tied to this school
-    corrective_actions = CorrectiveAction.objects.filter(
-        inspection_item__inspection__school=school
-    ).select_related(
-        "inspection_item__inspection",
-        "assigned_to"
+    # Corrective actions tied to this school, newest first
+    corrective_actions = KeysetPaginator(
+        CorrectiveAction.objects.filter(
+            inspection_item__inspection__school=school
+        ).select_related("inspection_item__checklist_item"),
+        "created_at",
+        descending=True,
+        per_page=SCHOOL_ACTIONS_PER_PAGE,
+    ).page(
+        after=request.GET.get("actions_after"),
+        before=request.GET.get("actions_before"),
     )
 
     context = {
         "school": school,
+        # Maintained by signals; None until the school's first inspection
+        "summary": getattr(school, "summary", None),
         "inspections": inspections,
         "corrective_actions": corrective_actions,
     }
@@ -0,0 +1,28 @@
+from django.db.models import Q
+
+from .models import SearchEntry
+
+
+# ============================================================
+#   CHANGELIST SEARCH FROM THE INDEX
+# ============================================================
+
+class IndexedSearchAdminMixin:
+    """Answers the changelist search box from the full-text index.
+
+    ``search_index_fields`` maps a SearchEntry kind to the field of this
+    model that holds the indexed object's id; a row matches if any of them
+    does. ``search_fields`` only has to be non-empty to show the box.
+    """
+
+    search_index_fields = {}
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term.strip():
+            return super().get_search_results(request, queryset, search_term)
+
+        matches = SearchEntry.objects.matching(search_term)
+        condition = Q()
+        for kind, field in self.search_index_fields.items():
+            condition |= Q(**{f"{field}__in": matches.filter(kind=kind).values("object_id")})
+        return queryset.filter(condition), False
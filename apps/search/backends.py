@@ -0,0 +1,156 @@
+import re
+
+from django.db import connection
+from django.db.models import BooleanField, F, FloatField, Func, Q, Value
+
+
+# ============================================================
+#   FULL-TEXT BACKENDS
+# ============================================================
+#
+# SearchEntry is a plain table; each backend adds its own full-text index
+# on top of it (from the 0002 migration) and knows how to match and rank:
+#
+#   sqlite      FTS5 external-content table kept in sync by triggers
+#   postgresql  generated tsvector column with a GIN index
+#   (other)     icontains over the single, narrow SearchEntry table
+#
+# The user's query is reduced to word tokens, each matched as a prefix and
+# all required (AND), so no query syntax reaches the database.
+
+TABLE = "search_searchentry"
+MAX_TERMS = 10
+
+
+def terms(query):
+    return re.findall(r"\w+", (query or "").lower())[:MAX_TERMS]
+
+
+class IndexSQL(Func):
+    """Backend SQL around the entry's row, safe inside subqueries.
+
+    ``sql`` may use {alias} (the entry table's alias in this query), {pk}
+    (its id column) and {query} (the bound search expression).
+    """
+
+    def __init__(self, sql, query, output_field):
+        super().__init__(F("pk"), Value(query), output_field=output_field)
+        self.sql = sql
+
+    def as_sql(self, compiler, connection, **extra_context):
+        pk, _ = compiler.compile(self.source_expressions[0])
+        query, params = compiler.compile(self.source_expressions[1])
+        alias = pk.rsplit(".", 1)[0]
+        return self.sql.format(alias=alias, pk=pk, query=query), params
+
+
+class LikeBackend:
+    vendor = None
+
+    def install(self, schema_editor):
+        pass
+
+    def uninstall(self, schema_editor):
+        pass
+
+    def matching(self, queryset, words):
+        for word in words:
+            queryset = queryset.filter(Q(title__icontains=word) | Q(text__icontains=word))
+        return queryset
+
+    def rank(self, words):
+        return Value(0.0, output_field=FloatField())
+
+
+class SQLiteBackend(LikeBackend):
+    vendor = "sqlite"
+    fts = f"{TABLE}_fts"
+
+    def install(self, schema_editor):
+        fts, execute = self.fts, schema_editor.execute
+        execute(
+            f"CREATE VIRTUAL TABLE {fts} USING fts5(title, text, content='{TABLE}', "
+            f"content_rowid='id', tokenize='porter unicode61 remove_diacritics 2')"
+        )
+        execute(
+            f"CREATE TRIGGER {fts}_ai AFTER INSERT ON {TABLE} BEGIN "
+            f"INSERT INTO {fts}(rowid, title, text) VALUES (new.id, new.title, new.text); END"
+        )
+        execute(
+            f"CREATE TRIGGER {fts}_ad AFTER DELETE ON {TABLE} BEGIN "
+            f"INSERT INTO {fts}({fts}, rowid, title, text) VALUES ('delete', old.id, old.title, old.text); END"
+        )
+        execute(
+            f"CREATE TRIGGER {fts}_au AFTER UPDATE ON {TABLE} BEGIN "
+            f"INSERT INTO {fts}({fts}, rowid, title, text) VALUES ('delete', old.id, old.title, old.text); "
+            f"INSERT INTO {fts}(rowid, title, text) VALUES (new.id, new.title, new.text); END"
+        )
+        # Entries written before the index existed
+        execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+    def uninstall(self, schema_editor):
+        for suffix in ("_ai", "_ad", "_au"):
+            schema_editor.execute(f"DROP TRIGGER IF EXISTS {self.fts}{suffix}")
+        schema_editor.execute(f"DROP TABLE IF EXISTS {self.fts}")
+
+    def expression(self, words):
+        return " ".join(f'"{word}"*' for word in words)
+
+    def matching(self, queryset, words):
+        return queryset.filter(IndexSQL(
+            f"{{pk}} IN (SELECT rowid FROM {self.fts} WHERE {self.fts} MATCH {{query}})",
+            self.expression(words),
+            output_field=BooleanField(),
+        ))
+
+    def rank(self, words):
+        # bm25 is lower for better matches; title hits weigh double
+        return IndexSQL(
+            f"(SELECT -bm25({self.fts}, 2.0, 1.0) FROM {self.fts} "
+            f"WHERE {self.fts} MATCH {{query}} AND rowid = {{pk}})",
+            self.expression(words),
+            output_field=FloatField(),
+        )
+
+
+class PostgresBackend(LikeBackend):
+    vendor = "postgresql"
+    config = "english"
+
+    def install(self, schema_editor):
+        schema_editor.execute(
+            f"ALTER TABLE {TABLE} ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+            f"setweight(to_tsvector('{self.config}', coalesce(title, '')), 'A') || "
+            f"setweight(to_tsvector('{self.config}', coalesce(text, '')), 'B')) STORED"
+        )
+        schema_editor.execute(
+            f"CREATE INDEX {TABLE}_vector_idx ON {TABLE} USING GIN (search_vector)"
+        )
+
+    def uninstall(self, schema_editor):
+        schema_editor.execute(f"DROP INDEX IF EXISTS {TABLE}_vector_idx")
+        schema_editor.execute(f"ALTER TABLE {TABLE} DROP COLUMN IF EXISTS search_vector")
+
+    def expression(self, words):
+        return " & ".join(f"{word}:*" for word in words)
+
+    def matching(self, queryset, words):
+        return queryset.filter(IndexSQL(
+            f"{{alias}}.search_vector @@ to_tsquery('{self.config}', {{query}})",
+            self.expression(words),
+            output_field=BooleanField(),
+        ))
+
+    def rank(self, words):
+        return IndexSQL(
+            f"ts_rank({{alias}}.search_vector, to_tsquery('{self.config}', {{query}}))",
+            self.expression(words),
+            output_field=FloatField(),
+        )
+
+
+BACKENDS = {backend.vendor: backend for backend in (SQLiteBackend(), PostgresBackend())}
+
+
+def get_backend(conn=None):
+    return BACKENDS.get((conn or connection).vendor, LikeBackend())
@@ -0,0 +1,214 @@
+from django.db.models import Q
+
+from apps.checklists import cache as checklist_cache
+from apps.checklists.models import ChecklistItem
+from apps.core.imports import batched
+from apps.inspections.models import CorrectiveAction, Inspection, InspectionItem
+from .models import SearchEntry
+
+
+# ============================================================
+#   INDEXING
+# ============================================================
+#
+# Each index_* function (re)builds the entries of the given objects with one
+# SELECT and one upsert per batch; objects that no longer qualify (deleted,
+# or an item whose notes were cleared) lose their entry. Single-row saves
+# reach these through apps.search.signals; bulk writes call them directly.
+#
+#   inspection      school, checklist, inspector, manager and notes
+#   item            only items with notes: checklist text + notes
+#   action          description, checklist text, assignee and school
+#   checklist_item  checklist item text + checklist name (visible to all)
+
+BATCH_SIZE = 1000
+
+UPDATE_FIELDS = (
+    "inspection_id", "school_id", "inspector_id", "assignee_id",
+    "title", "text", "updated_at",
+)
+
+
+def _join(*parts):
+    return " ".join(str(part) for part in parts if part)
+
+
+def _write(kind, pks, entries):
+    SearchEntry.objects.bulk_create(
+        entries,
+        batch_size=BATCH_SIZE,
+        update_conflicts=True,
+        unique_fields=("kind", "object_id"),
+        update_fields=UPDATE_FIELDS,
+    )
+    stale = set(pks) - {entry.object_id for entry in entries}
+    if stale:
+        SearchEntry.objects.filter(kind=kind, object_id__in=stale).delete()
+    return len(entries)
+
+
+def index_inspections(pks):
+    written = 0
+    for batch in batched(pks, BATCH_SIZE):
+        rows = Inspection.objects.filter(pk__in=batch).order_by().values_list(
+            "pk", "school_id", "inspector_id", "school__name", "checklist__name",
+            "inspector__user__first_name", "inspector__user__last_name",
+            "manager__user__first_name", "manager__user__last_name",
+            "date", "notes",
+        )
+        entries = [
+            SearchEntry(
+                kind=SearchEntry.Kind.INSPECTION, object_id=pk,
+                inspection_id=pk, school_id=school_id, inspector_id=inspector_id,
+                title=f"{school} - {date}"[:255],
+                text=_join(school, checklist, *names, notes),
+            )
+            for (pk, school_id, inspector_id, school, checklist, *names, date, notes) in rows
+        ]
+        written += _write(SearchEntry.Kind.INSPECTION, batch, entries)
+    return written
+
+
+def _checklist_texts(rows):
+    """``{checklist_item_id: text}`` from each row's pinned version, else live."""
+    texts = {}
+    for version in {version for _, version in rows if version}:
+        texts.update(checklist_cache.compiled(version).texts)
+
+    missing = {item_id for item_id, _ in rows} - texts.keys()
+    if missing:
+        texts.update(ChecklistItem.objects.filter(pk__in=missing).values_list("pk", "text"))
+    return texts
+
+
+def index_items(pks):
+    written = 0
+    for batch in batched(pks, BATCH_SIZE):
+        rows = list(
+            InspectionItem.objects.filter(pk__in=batch)
+            .exclude(notes__isnull=True).exclude(notes="")
+            .values_list(
+                "pk", "inspection_id", "inspection__school_id",
+                "inspection__inspector_id", "checklist_item_id",
+                "inspection__checklist_version_id", "notes",
+            )
+        )
+        texts = _checklist_texts([(row[4], row[5]) for row in rows])
+        entries = [
+            SearchEntry(
+                kind=SearchEntry.Kind.ITEM, object_id=pk,
+                inspection_id=inspection_id, school_id=school_id, inspector_id=inspector_id,
+                title=texts.get(checklist_item_id, "")[:255],
+                text=notes,
+            )
+            for (pk, inspection_id, school_id, inspector_id,
+                 checklist_item_id, _, notes) in rows
+        ]
+        written += _write(SearchEntry.Kind.ITEM, batch, entries)
+    return written
+
+
+def index_actions(pks):
+    written = 0
+    for batch in batched(pks, BATCH_SIZE):
+        rows = list(
+            CorrectiveAction.objects.filter(pk__in=batch).order_by().values_list(
+                "pk", "inspection_item__inspection_id",
+                "inspection_item__inspection__school_id",
+                "inspection_item__inspection__inspector_id",
+                "assigned_to_id", "description",
+                "inspection_item__checklist_item_id",
+                "inspection_item__inspection__checklist_version_id",
+                "assigned_to__user__first_name", "assigned_to__user__last_name",
+                "inspection_item__inspection__school__name",
+            )
+        )
+        texts = _checklist_texts([(row[6], row[7]) for row in rows])
+        entries = [
+            SearchEntry(
+                kind=SearchEntry.Kind.ACTION, object_id=pk,
+                inspection_id=inspection_id, school_id=school_id,
+                inspector_id=inspector_id, assignee_id=assignee_id,
+                title=description[:255],
+                text=_join(description, texts.get(checklist_item_id), first_name, last_name, school),
+            )
+            for (pk, inspection_id, school_id, inspector_id, assignee_id, description,
+                 checklist_item_id, _, first_name, last_name, school) in rows
+        ]
+        written += _write(SearchEntry.Kind.ACTION, batch, entries)
+    return written
+
+
+def index_checklist_items(pks):
+    written = 0
+    for batch in batched(pks, BATCH_SIZE):
+        rows = ChecklistItem.objects.filter(pk__in=batch).order_by().values_list(
+            "pk", "text", "checklist__name"
+        )
+        entries = [
+            SearchEntry(
+                kind=SearchEntry.Kind.CHECKLIST_ITEM, object_id=pk,
+                title=text[:255], text=checklist,
+            )
+            for pk, text, checklist in rows
+        ]
+        written += _write(SearchEntry.Kind.CHECKLIST_ITEM, batch, entries)
+    return written
+
+
+def index_inspection_actions(inspection_pks):
+    """Re-index the actions of ``inspection_pks`` (their school name is in the text)."""
+    return index_actions(
+        CorrectiveAction.objects.filter(inspection_item__inspection__in=inspection_pks)
+        .values_list("pk", flat=True)
+    )
+
+
+def index_people(appuser_pks):
+    """Re-index the inspections and actions that carry these users' names."""
+    index_inspections(
+        Inspection.objects.filter(Q(inspector__in=appuser_pks) | Q(manager__in=appuser_pks))
+        .values_list("pk", flat=True)
+    )
+    index_actions(
+        CorrectiveAction.objects.filter(assigned_to__in=appuser_pks).values_list("pk", flat=True)
+    )
+
+
+def remove(kind, pks):
+    SearchEntry.objects.filter(kind=kind, object_id__in=list(pks)).delete()
+
+
+def remove_inspection(pk):
+    """Drop an inspection's entry and those of its items and actions."""
+    SearchEntry.objects.filter(inspection_id=pk).delete()
+
+
+def rescope_inspection(inspection):
+    """Copy a changed school / inspector onto the inspection's entries."""
+    SearchEntry.objects.filter(inspection_id=inspection.pk).update(
+        school_id=inspection.school_id, inspector_id=inspection.inspector_id
+    )
+
+
+# Kind -> (indexer, queryset of everything that belongs in the index)
+INDEXERS = {
+    SearchEntry.Kind.INSPECTION: (index_inspections, lambda: Inspection.objects.all()),
+    SearchEntry.Kind.ITEM: (
+        index_items,
+        lambda: InspectionItem.objects.exclude(notes__isnull=True).exclude(notes=""),
+    ),
+    SearchEntry.Kind.ACTION: (index_actions, lambda: CorrectiveAction.objects.all()),
+    SearchEntry.Kind.CHECKLIST_ITEM: (index_checklist_items, lambda: ChecklistItem.objects.all()),
+}
+
+
+def rebuild(kinds=None):
+    """Re-index everything (or ``kinds``) from scratch; ``{kind: entries}``."""
+    counts = {}
+    for kind in kinds or SearchEntry.Kind.values:
+        indexer, queryset = INDEXERS[kind]
+        SearchEntry.objects.filter(kind=kind).delete()
+        pks = queryset().order_by("pk").values_list("pk", flat=True).iterator(chunk_size=BATCH_SIZE)
+        counts[kind] = indexer(pks)
+    return counts
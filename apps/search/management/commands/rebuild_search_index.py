@@ -0,0 +1,29 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.search import index
+from apps.search.models import SearchEntry
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the full-text search index from inspections, inspection item "
+        "notes, corrective actions and checklist items. Run once after "
+        "migrating, and after bulk loads that bypass the save signals."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--kind", choices=SearchEntry.Kind.values, action="append",
+            help="Only rebuild these kinds (repeatable; default: all).",
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        counts = index.rebuild(options["kind"])
+
+        for kind, count in counts.items():
+            self.stdout.write(f"{SearchEntry.Kind(kind).label}: {count} entries")
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f"Search index rebuilt in {elapsed:.1f}s."))
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.8 on 2026-10-18 12:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('inspection', 'Inspection'), ('item', 'Inspection item'), ('action', 'Corrective action'), ('checklist_item', 'Checklist item')], max_length=20)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('inspection_id', models.PositiveBigIntegerField(blank=True, null=True)),
+                ('school_id', models.PositiveBigIntegerField(blank=True, null=True)),
+                ('inspector_id', models.PositiveBigIntegerField(blank=True, null=True)),
+                ('assignee_id', models.PositiveBigIntegerField(blank=True, null=True)),
+                ('title', models.CharField(max_length=255)),
+                ('text', models.TextField(blank=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Search Entry',
+                'verbose_name_plural': 'Search Entries',
+                'indexes': [models.Index(fields=['inspection_id'], name='search_inspection_idx'), models.Index(fields=['school_id'], name='search_school_idx'), models.Index(fields=['inspector_id'], name='search_inspector_idx')],
+                'constraints': [models.UniqueConstraint(fields=('kind', 'object_id'), name='unique_search_entry')],
+            },
+        ),
+    ]
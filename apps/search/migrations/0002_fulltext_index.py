@@ -0,0 +1,24 @@
+from django.db import migrations
+
+from apps.search.backends import get_backend
+
+
+def install(apps, schema_editor):
+    get_backend(schema_editor.connection).install(schema_editor)
+
+
+def uninstall(apps, schema_editor):
+    get_backend(schema_editor.connection).uninstall(schema_editor)
+
+
+class Migration(migrations.Migration):
+    # FTS5 table + triggers on SQLite, tsvector column + GIN index on
+    # PostgreSQL, nothing elsewhere (see apps.search.backends)
+
+    dependencies = [
+        ('search', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(install, uninstall),
+    ]
@@ -0,0 +1,105 @@
+from django.db import connections, models
+from django.db.models import Q
+from django.urls import reverse
+
+from apps.schools.models import School
+from apps.users.models import AppUser
+from .backends import get_backend, terms
+
+
+class SearchEntryQuerySet(models.QuerySet):
+
+    def visible_to(self, appuser):
+        """Entries the given AppUser may see, mirroring the models' visible_to.
+
+        Admin: all. Inspector: their inspections. Manager / Kitchen: their
+        schools (managers also actions assigned to them). Checklist items
+        are visible to everyone.
+        """
+        if appuser.role == AppUser.Role.ADMIN:
+            return self
+
+        shared = Q(kind=SearchEntry.Kind.CHECKLIST_ITEM)
+
+        if appuser.role == AppUser.Role.INSPECTOR:
+            return self.filter(shared | Q(inspector_id=appuser.pk))
+
+        through = {
+            AppUser.Role.MANAGER: School.managers.through,
+            AppUser.Role.KITCHEN: School.kitchen_staff.through,
+        }.get(appuser.role)
+        if through is None:
+            return self.filter(shared)
+
+        scope = shared | Q(school_id__in=through.objects.filter(
+            appuser_id=appuser.pk
+        ).values("school_id"))
+        if appuser.role == AppUser.Role.MANAGER:
+            scope |= Q(kind=SearchEntry.Kind.ACTION, assignee_id=appuser.pk)
+        return self.filter(scope)
+
+    def matching(self, query):
+        """Entries matching every word of ``query`` (as prefixes); unranked."""
+        words = terms(query)
+        if not words:
+            return self.none()
+        return get_backend(connections[self.db]).matching(self, words)
+
+    def search(self, query):
+        """matching(), annotated with ``rank`` and best match first."""
+        backend = get_backend(connections[self.db])
+        return self.matching(query).annotate(
+            rank=backend.rank(terms(query))
+        ).order_by("-rank", "-pk")
+
+
+class SearchEntry(models.Model):
+    """One searchable document; the full-text index is kept by the backend.
+
+    Rows are written by apps.search.index (from save signals and the bulk
+    paths). The scoping columns are copied from the indexed object so role
+    filtering needs no join to the large tables.
+    """
+
+    class Kind(models.TextChoices):
+        INSPECTION = "inspection", "Inspection"
+        ITEM = "item", "Inspection item"
+        ACTION = "action", "Corrective action"
+        CHECKLIST_ITEM = "checklist_item", "Checklist item"
+
+    kind = models.CharField(max_length=20, choices=Kind.choices)
+    object_id = models.PositiveBigIntegerField()
+
+    # Role scoping
+    inspection_id = models.PositiveBigIntegerField(null=True, blank=True)
+    school_id = models.PositiveBigIntegerField(null=True, blank=True)
+    inspector_id = models.PositiveBigIntegerField(null=True, blank=True)
+    assignee_id = models.PositiveBigIntegerField(null=True, blank=True)
+
+    title = models.CharField(max_length=255)
+    text = models.TextField(blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = SearchEntryQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = "Search Entry"
+        verbose_name_plural = "Search Entries"
+        constraints = [
+            models.UniqueConstraint(fields=["kind", "object_id"], name="unique_search_entry"),
+        ]
+        indexes = [
+            models.Index(fields=["inspection_id"], name="search_inspection_idx"),
+            models.Index(fields=["school_id"], name="search_school_idx"),
+            models.Index(fields=["inspector_id"], name="search_inspector_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.get_kind_display()}: {self.title}"
+
+    def get_absolute_url(self):
+        if self.kind == self.Kind.ACTION:
+            return reverse("inspections:corrective_action_detail", args=[self.object_id])
+        if self.inspection_id:
+            return reverse("inspections:inspection_detail", args=[self.inspection_id])
+        return None
@@ -0,0 +1,110 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from apps.checklists.models import Checklist, ChecklistItem
+from apps.inspections.models import CorrectiveAction, Inspection, InspectionItem
+from apps.schools.models import School
+from apps.users.models import AppUser
+from . import index
+from .models import SearchEntry
+
+
+# Single-row saves (views, admin). Bulk paths call apps.search.index
+# themselves; rebuild_search_index repairs anything else.
+
+
+# Inspection fields that feed its entry (status saves happen all the time
+# and aren't searched, so they don't re-index)
+INSPECTION_FIELDS = ("school_id", "inspector_id", "manager_id", "checklist_id", "date", "notes")
+
+
+def _indexed_values(instance):
+    # __dict__ lookups so deferred fields aren't fetched
+    return {name: instance.__dict__.get(name) for name in INSPECTION_FIELDS}
+
+
+@receiver(post_init, sender=Inspection)
+def remember_indexed_values(sender, instance, **kwargs):
+    instance._search_values = _indexed_values(instance)
+
+
+@receiver(post_save, sender=Inspection)
+def index_inspection(sender, instance, created, **kwargs):
+    old, new = instance._search_values, _indexed_values(instance)
+    instance._search_values = new
+
+    if created or old != new:
+        index.index_inspections([instance.pk])
+    if not created and (old["school_id"], old["inspector_id"]) != (new["school_id"], new["inspector_id"]):
+        index.rescope_inspection(instance)
+    if not created and old["school_id"] != new["school_id"]:
+        index.index_inspection_actions([instance.pk])
+
+
+@receiver(post_delete, sender=Inspection)
+def unindex_inspection(sender, instance, **kwargs):
+    index.remove_inspection(instance.pk)
+
+
+@receiver(post_save, sender=InspectionItem)
+def index_item(sender, instance, **kwargs):
+    index.index_items([instance.pk])
+
+
+@receiver(post_save, sender=CorrectiveAction)
+def index_action(sender, instance, **kwargs):
+    index.index_actions([instance.pk])
+
+
+@receiver(post_save, sender=ChecklistItem)
+def index_checklist_item(sender, instance, **kwargs):
+    index.index_checklist_items([instance.pk])
+
+
+@receiver(post_save, sender=Checklist)
+def index_checklist(sender, instance, created, **kwargs):
+    # The checklist name is part of its items' text
+    if not created:
+        index.index_checklist_items(instance.items.values_list("pk", flat=True))
+
+
+@receiver(post_save, sender=School)
+def index_school(sender, instance, created, **kwargs):
+    # The school name is part of its inspections' and actions' text
+    if not created:
+        pks = list(instance.inspections.values_list("pk", flat=True))
+        index.index_inspections(pks)
+        index.index_inspection_actions(pks)
+
+
+# User fields that feed inspection and action entries (last_login is saved on
+# every login and isn't searched)
+NAME_FIELDS = ("first_name", "last_name")
+
+
+@receiver(post_init, sender=User)
+def remember_names(sender, instance, **kwargs):
+    instance._search_names = tuple(instance.__dict__.get(name) for name in NAME_FIELDS)
+
+
+@receiver(post_save, sender=User)
+def index_user(sender, instance, created, **kwargs):
+    names = tuple(instance.__dict__.get(name) for name in NAME_FIELDS)
+    if not created and names != instance._search_names:
+        index.index_people(AppUser.objects.filter(user=instance).values_list("pk", flat=True))
+    instance._search_names = names
+
+
+KINDS = {
+    InspectionItem: SearchEntry.Kind.ITEM,
+    CorrectiveAction: SearchEntry.Kind.ACTION,
+    ChecklistItem: SearchEntry.Kind.CHECKLIST_ITEM,
+}
+
+
+@receiver(post_delete, sender=InspectionItem)
+@receiver(post_delete, sender=CorrectiveAction)
+@receiver(post_delete, sender=ChecklistItem)
+def unindex(sender, instance, **kwargs):
+    index.remove(KINDS[sender], [instance.pk])
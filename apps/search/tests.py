@@ -0,0 +1,183 @@
+import datetime
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from apps.checklists.models import Checklist, ChecklistItem
+from apps.inspections.models import CorrectiveAction, Inspection, InspectionItem
+from apps.schools.models import School
+from apps.users.models import AppUser
+from .models import SearchEntry
+
+
+def make_appuser(username, role):
+    appuser = User.objects.create_user(username, password="x").appuser
+    appuser.role = role
+    appuser.save()
+    return appuser
+
+
+class SearchIndexTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = make_appuser("admin", AppUser.Role.ADMIN)
+        cls.inspector = make_appuser("inspector", AppUser.Role.INSPECTOR)
+        cls.manager = make_appuser("manager", AppUser.Role.MANAGER)
+        cls.kitchen = make_appuser("kitchen", AppUser.Role.KITCHEN)
+
+        cls.north = School.objects.create(name="North High")
+        cls.south = School.objects.create(name="South High")
+        cls.north.managers.add(cls.manager)
+        cls.south.kitchen_staff.add(cls.kitchen)
+
+        cls.checklist = Checklist.objects.create(name="HACCP")
+        ChecklistItem.objects.create(checklist=cls.checklist, text="Walk-in cooler temperature", order=1)
+        ChecklistItem.objects.create(checklist=cls.checklist, text="Hand sink stocked", order=2)
+
+        cls.north_inspection = cls.make_inspection(cls.north, notes="Mice droppings near pantry")
+        cls.south_inspection = cls.make_inspection(cls.south)
+
+    @classmethod
+    def make_inspection(cls, school, **fields):
+        inspection = Inspection.objects.create(
+            school=school, inspector=cls.inspector, checklist=cls.checklist,
+            date=datetime.date.today(), **fields,
+        )
+        inspection.initialize_items()
+        return inspection
+
+    def search(self, query, appuser=None):
+        entries = SearchEntry.objects.all()
+        if appuser:
+            entries = entries.visible_to(appuser)
+        return [(entry.kind, entry.object_id) for entry in entries.search(query)]
+
+    def test_saves_are_indexed_and_prefixes_match(self):
+        self.assertEqual(
+            self.search("dropping pant"),
+            [(SearchEntry.Kind.INSPECTION, self.north_inspection.pk)],
+        )
+
+        item = self.south_inspection.inspection_items.order_by("pk").first()
+        item.notes = "Cooler reading 45F"
+        item.save()
+        self.assertIn((SearchEntry.Kind.ITEM, item.pk), self.search("cooler 45f"))
+
+        # Cleared notes drop the entry, deleting removes the rest
+        item.notes = ""
+        item.save()
+        self.assertNotIn((SearchEntry.Kind.ITEM, item.pk), self.search("cooler"))
+        self.north_inspection.delete()
+        self.assertEqual(self.search("droppings"), [])
+
+    def test_bulk_paths_are_indexed(self):
+        item = self.north_inspection.inspection_items.order_by("pk").first()
+        self.north_inspection.apply_results({item.pk: {"passed": False, "notes": "Broken seal"}})
+        self.north_inspection.complete()
+
+        action = CorrectiveAction.objects.get(inspection_item=item)
+        self.assertEqual(self.search("broken seal"), [(SearchEntry.Kind.ITEM, item.pk)])
+        self.assertEqual(self.search("correct walk"), [(SearchEntry.Kind.ACTION, action.pk)])
+
+    def test_title_matches_rank_first(self):
+        cooler = self.checklist.items.get(order=1)
+        item = self.north_inspection.inspection_items.get(checklist_item__order=2)
+        item.notes = "cooler"
+        item.save()
+        # Title "Hand sink stocked" + notes "cooler" ranks below a title hit
+        self.assertEqual(self.search("cooler"), [
+            (SearchEntry.Kind.CHECKLIST_ITEM, cooler.pk),
+            (SearchEntry.Kind.ITEM, item.pk),
+        ])
+
+    def test_role_scoping(self):
+        north = (SearchEntry.Kind.INSPECTION, self.north_inspection.pk)
+        south = (SearchEntry.Kind.INSPECTION, self.south_inspection.pk)
+
+        self.assertEqual(set(self.search("high", self.admin)), {north, south})
+        self.assertEqual(set(self.search("high", self.inspector)), {north, south})
+        self.assertEqual(self.search("high", self.manager), [north])
+        self.assertEqual(self.search("high", self.kitchen), [south])
+        # Checklist items are shared
+        self.assertTrue(self.search("sink", self.kitchen))
+
+        other = make_appuser("other", AppUser.Role.INSPECTOR)
+        self.north_inspection.inspector = other
+        self.north_inspection.save()
+        self.assertEqual(self.search("high", other), [north])
+
+    def test_rename_reindexes(self):
+        self.north.name = "Northwood Academy"
+        self.north.save()
+        self.assertEqual(self.search("northwood"), [(SearchEntry.Kind.INSPECTION, self.north_inspection.pk)])
+
+    def test_actions_and_inspections_match_related_names(self):
+        item = self.north_inspection.inspection_items.get(checklist_item__order=2)
+        action = CorrectiveAction.objects.create(
+            inspection_item=item, assigned_to=self.kitchen, description="Restock soap"
+        )
+        action_entry = (SearchEntry.Kind.ACTION, action.pk)
+        self.kitchen.user.first_name = "Dana"
+        self.kitchen.user.save()
+        for query in ("restock", "hand sink", "dana", "north"):
+            with self.subTest(query=query):
+                self.assertIn(action_entry, self.search(query))
+
+        self.north.name = "Northwood Academy"
+        self.north.save()
+        self.assertIn(action_entry, self.search("northwood"))
+
+        self.manager.user.last_name = "Okafor"
+        self.manager.user.save()
+        self.north_inspection.manager = self.manager
+        self.north_inspection.save()
+        self.assertEqual(self.search("okafor"), [(SearchEntry.Kind.INSPECTION, self.north_inspection.pk)])
+
+    def test_query_syntax_is_not_passed_through(self):
+        for query in ('"', "NEAR(", "*", "a OR", "-", "col:x"):
+            self.search(query)
+        self.assertEqual(self.search("  "), [])
+
+    def test_rebuild_command(self):
+        SearchEntry.objects.all().delete()
+        call_command("rebuild_search_index", stdout=StringIO())
+        self.assertEqual(self.search("droppings"), [(SearchEntry.Kind.INSPECTION, self.north_inspection.pk)])
+        self.assertEqual(SearchEntry.objects.filter(kind=SearchEntry.Kind.CHECKLIST_ITEM).count(), 2)
+
+
+class SearchViewTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.manager = make_appuser("manager", AppUser.Role.MANAGER)
+        school = School.objects.create(name="North High")
+        school.managers.add(cls.manager)
+        other = School.objects.create(name="South High")
+        for s in (school, other):
+            Inspection.objects.create(school=s, date=datetime.date.today(), notes="Grease trap overflow")
+
+        cls.superuser = User.objects.create_superuser("root", password="x")
+
+    def test_app_search_is_scoped(self):
+        self.client.force_login(self.manager.user)
+        response = self.client.get(reverse("search:search"), {"q": "grease"})
+        self.assertContains(response, "North High")
+        self.assertNotContains(response, "South High")
+
+    def test_admin_changelists_search_the_index(self):
+        self.client.force_login(self.superuser)
+        response = self.client.get(reverse("admin:inspections_inspection_changelist"), {"q": "south"})
+        self.assertContains(response, "1 result")
+
+        item = InspectionItem.objects.create(
+            inspection=Inspection.objects.first(),
+            checklist_item=ChecklistItem.objects.create(
+                checklist=Checklist.objects.create(name="Pest"), text="Traps checked"
+            ),
+        )
+        response = self.client.get(reverse("admin:inspections_inspectionitem_changelist"), {"q": "traps"})
+        self.assertEqual(list(response.context["cl"].result_list), [item])
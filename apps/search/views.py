@@ -0,0 +1,33 @@
+from django.contrib.auth.decorators import login_required
+from django.shortcuts import render
+
+from .models import SearchEntry
+
+
+SEARCH_RESULTS = 50
+
+
+@login_required
+def search(request):
+    """Ranked full-text search over what the user's role may see."""
+    query = request.GET.get("q", "").strip()
+    kind = request.GET.get("kind")
+    if kind not in SearchEntry.Kind.values:
+        kind = None
+
+    results = []
+    if query:
+        entries = SearchEntry.objects.visible_to(request.user.appuser)
+        if kind:
+            entries = entries.filter(kind=kind)
+        results = entries.search(query).only(
+            "kind", "object_id", "inspection_id", "title", "text"
+        )[:SEARCH_RESULTS]
+
+    return render(request, "search/search_results.html", {
+        "query": query,
+        "selected_kind": kind,
+        "kind_choices": SearchEntry.Kind.choices,
+        "results": results,
+        "limit": SEARCH_RESULTS,
+    })
@@ -61,6 +61,10 @@ class AppUserAdmin(admin.ModelAdmin):
 
     ordering = ("user__first_name", "user__last_name")
 
+    # Also used by the autocomplete view, whose results are str(appuser)
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related("user")
+
     # Prevent accidental creation of orphaned AppUsers
     def has_add_permission(self, request):
         return False
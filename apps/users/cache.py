@@ -0,0 +1,123 @@
+import hashlib
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import AppUser
+
+
+# ============================================================
+#   DASHBOARD CACHE
+# ============================================================
+#
+# A dashboard is cached under a key built from the version tokens of every
+# "scope" it depends on:
+#
+#   all              any inspection / action / school / user change (admins)
+#   school:<id>      inspections and actions of one school
+#   inspector:<id>   inspections performed by one inspector
+#   user:<id>        actions assigned to / memberships of one AppUser
+#
+# Signals bump a scope's token when something in it changes, which changes
+# the key of exactly the dashboards that read it. Old entries simply expire.
+
+PREFIX = "dashboard"
+
+
+def _version_key(scope):
+    return f"{PREFIX}:v:{scope}"
+
+
+def bump(*scopes):
+    """Invalidate every dashboard that depends on any of ``scopes``."""
+    tokens = {_version_key(scope): uuid.uuid4().hex for scope in scopes if scope}
+    if tokens:
+        cache.set_many(tokens, timeout=None)
+
+
+def _versions(scopes):
+    keys = [_version_key(scope) for scope in scopes]
+    found = cache.get_many(keys)
+
+    # An evicted token must not come back as a value seen before, so a
+    # missing one is replaced by a fresh token rather than a default.
+    missing = [key for key in keys if key not in found]
+    for key in missing:
+        cache.add(key, uuid.uuid4().hex, timeout=None)
+    if missing:
+        found.update(cache.get_many(missing))
+
+    return [found.get(key, "") for key in keys]
+
+
+def scopes_for(appuser):
+    """Scopes the given AppUser's dashboard reads from."""
+    if appuser.role == AppUser.Role.ADMIN:
+        return ["all"]
+
+    if appuser.role == AppUser.Role.INSPECTOR:
+        return [f"inspector:{appuser.pk}", f"user:{appuser.pk}"]
+
+    if appuser.role == AppUser.Role.MANAGER:
+        school_ids = appuser.managed_schools.values_list("pk", flat=True)
+    else:
+        school_ids = appuser.kitchen_schools.values_list("pk", flat=True)
+
+    # Membership is part of the key, so joining/leaving a school is a miss
+    return [f"school:{pk}" for pk in sorted(school_ids)] + [f"user:{appuser.pk}"]
+
+
+def dashboard_key(appuser):
+    scopes = scopes_for(appuser)
+    versions = _versions(scopes)
+    digest = hashlib.md5(
+        "|".join(f"{s}={v}" for s, v in zip(scopes, versions)).encode()
+    ).hexdigest()
+    return f"{PREFIX}:{appuser.role}:{appuser.pk}:{digest}"
+
+
+def get_or_build(appuser, build):
+    """Return the cached dashboard data for ``appuser`` or ``build()`` it."""
+    key = dashboard_key(appuser)
+
+    data = cache.get(key)
+    if data is not None:
+        _record("hit")
+        return data
+
+    _record("miss")
+    data = build()
+    cache.set(key, data, timeout=settings.DASHBOARD_CACHE_TIMEOUT)
+    return data
+
+
+# ============================================================
+#   HIT / MISS COUNTERS
+# ============================================================
+
+def _stats_key(name):
+    return f"{PREFIX}:stats:{name}"
+
+
+def _record(name):
+    key = _stats_key(name)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # First event (or evicted): start the counter
+        if not cache.add(key, 1, timeout=None):
+            cache.incr(key)
+
+
+def stats():
+    """``{"hit": n, "miss": n, "hit_rate": float}`` since the last reset."""
+    counts = cache.get_many([_stats_key("hit"), _stats_key("miss")])
+    hit = counts.get(_stats_key("hit"), 0)
+    miss = counts.get(_stats_key("miss"), 0)
+    total = hit + miss
+    return {"hit": hit, "miss": miss, "hit_rate": hit / total if total else 0.0}
+
+
+def reset_stats():
+    cache.delete_many([_stats_key("hit"), _stats_key("miss")])
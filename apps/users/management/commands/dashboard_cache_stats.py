@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from apps.users import cache as dashboard_cache
+
+
+class Command(BaseCommand):
+    help = "Show (and optionally reset) the role dashboard cache hit/miss counters."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--reset", action="store_true",
+            help="Zero the counters after printing them.",
+        )
+
+    def handle(self, *args, **options):
+        stats = dashboard_cache.stats()
+        self.stdout.write(
+            f"hits: {stats['hit']}  misses: {stats['miss']}  "
+            f"hit rate: {stats['hit_rate']:.1%}"
+        )
+
+        if options["reset"]:
+            dashboard_cache.reset_stats()
+            self.stdout.write("Counters reset.")
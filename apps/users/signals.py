@@ -1,7 +1,10 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import m2m_changed, post_delete, post_init, post_save
 from django.dispatch import receiver
 from django.contrib.auth.models import User
+from apps.schools.models import School
+from apps.inspections.models import CorrectiveAction, Inspection, InspectionItem
 from .models import AppUser
+from . import cache as dashboard_cache
 
 @receiver(post_save, sender=User)
 def create_appuser_profile(sender, instance, created, **kwargs):
@@ -9,3 +12,101 @@ def create_appuser_profile(sender, instance, created, **kwargs):
         # Only create profile if one doesn't exist
         if not hasattr(instance, 'appuser'):
             AppUser.objects.create(user=instance)
+
+
+# ============================================================
+#   DASHBOARD CACHE INVALIDATION
+# ============================================================
+
+@receiver(post_init, sender=Inspection)
+def remember_inspection_scopes(sender, instance, **kwargs):
+    # __dict__ lookups so deferred fields aren't fetched
+    instance._dashboard_scopes = (
+        instance.__dict__.get("school_id"), instance.__dict__.get("inspector_id")
+    )
+
+
+def _inspection_scopes(school_id, inspector_id):
+    return (
+        school_id and f"school:{school_id}",
+        inspector_id and f"inspector:{inspector_id}",
+    )
+
+
+@receiver([post_save, post_delete], sender=Inspection)
+def invalidate_inspection_dashboards(sender, instance, **kwargs):
+    dashboard_cache.bump(
+        "all",
+        *_inspection_scopes(instance.school_id, instance.inspector_id),
+        # Moved to another school / inspector: the old ones listed it too
+        *_inspection_scopes(*instance._dashboard_scopes),
+    )
+    instance._dashboard_scopes = (instance.school_id, instance.inspector_id)
+
+
+@receiver([post_save, post_delete], sender=InspectionItem)
+def invalidate_item_dashboards(sender, instance, origin=None, **kwargs):
+    # Admin item edits change the inspection's counters. Items going with
+    # their inspection or school are covered by those deletes.
+    if isinstance(origin, (Inspection, School)) or getattr(origin, "model", None) in (Inspection, School):
+        return
+    scopes = (
+        Inspection.objects.filter(pk=instance.inspection_id)
+        .values_list("school_id", "inspector_id")
+        .first()
+    )
+    if scopes:
+        dashboard_cache.bump("all", *_inspection_scopes(*scopes))
+
+
+@receiver(post_init, sender=CorrectiveAction)
+def remember_assignee(sender, instance, **kwargs):
+    # __dict__ lookup so a deferred field isn't fetched
+    instance._dashboard_assignee_id = instance.__dict__.get("assigned_to_id")
+
+
+@receiver([post_save, post_delete], sender=CorrectiveAction)
+def invalidate_action_dashboards(sender, instance, **kwargs):
+    school_id, inspector_id = (
+        Inspection.objects.filter(inspection_items=instance.inspection_item_id)
+        .values_list("school_id", "inspector_id")
+        .first()
+    ) or (None, None)
+
+    dashboard_cache.bump(
+        "all",
+        school_id and f"school:{school_id}",
+        inspector_id and f"inspector:{inspector_id}",
+        instance.assigned_to_id and f"user:{instance.assigned_to_id}",
+        # Reassigned: the previous assignee's dashboard lists it too
+        instance._dashboard_assignee_id and f"user:{instance._dashboard_assignee_id}",
+    )
+    instance._dashboard_assignee_id = instance.assigned_to_id
+
+
+@receiver([post_save, post_delete], sender=School)
+def invalidate_school_dashboards(sender, instance, **kwargs):
+    # Admin dashboards show school totals; member dashboards list the school
+    dashboard_cache.bump("all", f"school:{instance.pk}")
+
+
+@receiver([post_save, post_delete], sender=AppUser)
+def invalidate_admin_dashboards(sender, instance, **kwargs):
+    # Admin dashboards show user totals
+    dashboard_cache.bump("all")
+
+
+@receiver(m2m_changed, sender=School.managers.through)
+@receiver(m2m_changed, sender=School.kitchen_staff.through)
+@receiver(m2m_changed, sender=School.inspectors.through)
+def invalidate_membership_dashboards(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+
+    # Forward: instance is a School, pk_set AppUsers. Reverse: the opposite.
+    if reverse:
+        scopes = [f"user:{instance.pk}"] + [f"school:{pk}" for pk in pk_set or ()]
+    else:
+        scopes = [f"school:{instance.pk}"] + [f"user:{pk}" for pk in pk_set or ()]
+
+    dashboard_cache.bump("all", *scopes)
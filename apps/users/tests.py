@@ -1,3 +1,175 @@
-from django.test import TestCase
+import datetime
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from apps.checklists.models import Checklist, ChecklistItem
+from apps.inspections.models import CorrectiveAction, Inspection, StatusRollup, admin_totals
+from apps.schools.models import School
+from . import cache as dashboard_cache
+from .models import AppUser
+
+
+def make_appuser(username, role):
+    appuser = User.objects.create_user(username, password="x").appuser
+    appuser.role = role
+    appuser.save()
+    return appuser
+
+
+class DashboardCacheTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.manager = make_appuser("manager", AppUser.Role.MANAGER)
+        cls.assignee = make_appuser("assignee", AppUser.Role.MANAGER)
+        cls.other_assignee = make_appuser("other", AppUser.Role.MANAGER)
+
+        cls.school = School.objects.create(name="Own School")
+        cls.school.managers.add(cls.manager)
+        # The assignees see the action only because it's assigned to them
+        other_school = School.objects.create(name="Other School")
+
+        checklist = Checklist.objects.create(name="Checklist")
+        ChecklistItem.objects.create(checklist=checklist, text="Sink", order=1)
+        inspection = Inspection.objects.create(
+            school=other_school, checklist=checklist, date=datetime.date.today()
+        )
+        inspection.initialize_items()
+        cls.action = CorrectiveAction.objects.create(
+            inspection_item=inspection.inspection_items.get(),
+            assigned_to=cls.assignee,
+            description="Clean the sink",
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def dashboard(self, appuser):
+        self.client.force_login(appuser.user)
+        return self.client.get(reverse("users:dashboard"))
+
+    def test_repeat_visit_is_a_hit(self):
+        first = self.dashboard(self.manager)
+        second = self.dashboard(self.manager)
+
+        self.assertEqual(
+            [s.pk for s in second.context["schools"]],
+            [s.pk for s in first.context["schools"]],
+        )
+        self.assertEqual(dashboard_cache.stats(), {"hit": 1, "miss": 1, "hit_rate": 0.5})
+
+    def test_reassigning_an_action_invalidates_the_previous_assignee(self):
+        self.assertEqual(self.dashboard(self.assignee).context["action_count"], 1)
+
+        action = CorrectiveAction.objects.get(pk=self.action.pk)
+        action.assigned_to = self.other_assignee
+        action.save()
+
+        self.assertEqual(self.dashboard(self.assignee).context["action_count"], 0)
+        self.assertEqual(self.dashboard(self.other_assignee).context["action_count"], 1)
+        self.assertEqual(dashboard_cache.stats()["hit"], 0)
+
+    def test_school_edit_invalidates_member_dashboards(self):
+        self.dashboard(self.manager)
+
+        self.school.name = "Renamed School"
+        self.school.save()
+
+        response = self.dashboard(self.manager)
+        self.assertEqual([s.name for s in response.context["schools"]], ["Renamed School"])
+        self.assertEqual(dashboard_cache.stats(), {"hit": 0, "miss": 2, "hit_rate": 0.0})
+
+    def test_moving_an_inspection_invalidates_the_old_school(self):
+        inspection = Inspection.objects.create(
+            school=self.school, checklist=Checklist.objects.get(), date=datetime.date.today()
+        )
+        shown = self.dashboard(self.manager).context["recent_inspections"]
+        self.assertIn(inspection, shown)
+
+        inspection = Inspection.objects.get(pk=inspection.pk)
+        inspection.school = School.objects.get(name="Other School")
+        inspection.save()
+
+        self.assertNotIn(inspection, self.dashboard(self.manager).context["recent_inspections"])
+
+    def test_item_edits_invalidate_the_inspection_dashboards(self):
+        inspection = Inspection.objects.create(
+            school=self.school, checklist=Checklist.objects.get(), date=datetime.date.today()
+        )
+        inspection.initialize_items()
+        key = dashboard_cache.dashboard_key(self.manager)
+
+        item = inspection.inspection_items.get()
+        item.passed = False
+        item.save()
+
+        self.assertNotEqual(dashboard_cache.dashboard_key(self.manager), key)
+
+    def test_reset_stats(self):
+        self.dashboard(self.manager)
+        self.dashboard(self.manager)
+        dashboard_cache.reset_stats()
+
+        self.assertEqual(dashboard_cache.stats(), {"hit": 0, "miss": 0, "hit_rate": 0.0})
+
+
+class AdminDashboardTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = make_appuser("admin", AppUser.Role.ADMIN)
+        school = School.objects.create(name="School")
+        checklist = Checklist.objects.create(name="Checklist")
+        ChecklistItem.objects.bulk_create(
+            ChecklistItem(checklist=checklist, text=f"Check #{n}", order=n) for n in range(3)
+        )
+        for _ in range(2):
+            inspection = Inspection.objects.create(
+                school=school, checklist=checklist, date=datetime.date.today()
+            )
+            inspection.initialize_items()
+            inspection.inspection_items.update(passed=False)
+            inspection.complete()
+        CorrectiveAction.objects.filter(pk=CorrectiveAction.objects.first().pk).update(
+            status=CorrectiveAction.Status.RESOLVED
+        )
+        StatusRollup.objects.rebuild()
+
+    def setUp(self):
+        cache.clear()
+
+    def test_totals_in_one_query(self):
+        expected = {
+            "total_schools": 1,
+            "total_users": 1,
+            "total_inspections": 2,
+            "total_actions": 6,
+            CorrectiveAction.Status.OPEN: 5,
+            CorrectiveAction.Status.RESOLVED: 1,
+        }
+        for use_rollups in (False, True):
+            with self.subTest(use_rollups=use_rollups):
+                with CaptureQueriesContext(connection) as ctx:
+                    counts = admin_totals(use_rollups=use_rollups)
+                self.assertEqual({key: counts[key] for key in expected}, expected)
+                self.assertEqual(len(ctx.captured_queries), 1)
+
+        # The action counts are one conditional aggregate: one read of the table
+        table = connection.ops.quote_name(CorrectiveAction._meta.db_table)
+        with CaptureQueriesContext(connection) as ctx:
+            admin_totals()
+        self.assertEqual(ctx.captured_queries[0]["sql"].count(f"FROM {table}"), 1)
+
+    @override_settings(DASHBOARD_USE_ROLLUPS=True)
+    def test_dashboard_reads_rollups(self):
+        self.client.force_login(self.admin.user)
+        response = self.client.get(reverse("users:dashboard"))
+
+        self.assertEqual(response.context["total_inspections"], 2)
+        self.assertEqual(response.context["open_actions"], 5)
+        self.assertEqual(response.context["resolved_actions"], 1)
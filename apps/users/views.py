@@ -1,11 +1,12 @@
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import render, redirect
 from apps.users.models import AppUser
-from apps.schools.models import School
 from apps.inspections.models import Inspection
 from django.contrib.auth.views import LoginView
 from django.contrib.auth.forms import AuthenticationForm
-from apps.inspections.models import CorrectiveAction
+from apps.inspections.models import CorrectiveAction, admin_totals
+from django.conf import settings
+from . import cache as dashboard_cache
 from django.db import models
 
 
@@ -25,40 +26,49 @@ class CustomLoginView(LoginView):
         return form
 
 
+# Longest action list rendered on a dashboard (counts stay exact)
+DASHBOARD_LIST_LIMIT = 50
+
+
 @login_required
 def dashboard(request):
     user = request.user.appuser
+
+    # Cached per user, keyed by the schools / inspector / assignee scopes it
+    # reads; signals in apps.users.signals invalidate those scopes.
+    template, data = dashboard_cache.get_or_build(user, lambda: build_dashboard(user))
+
+    return render(request, template, {"user": user, **data})
+
+
+def build_dashboard(user):
+    """Template name and (picklable) context for the user's role dashboard."""
     role = user.role
 
-    context = {"user": user}
+    context = {}
 
     # ========== ADMIN DASHBOARD ==========
     if role == AppUser.Role.ADMIN:
-        total_schools = School.objects.count()
-        total_users = AppUser.objects.count()
-        total_inspections = Inspection.objects.count()
-
-        recent_inspections = Inspection.objects.order_by("-date")[:5]
-        total_actions = CorrectiveAction.objects.count()
-        open_actions = CorrectiveAction.objects.filter(status=CorrectiveAction.Status.OPEN).count()
-        in_progress_actions = CorrectiveAction.objects.filter(status=CorrectiveAction.Status.IN_PROGRESS).count()
-        resolved_actions = CorrectiveAction.objects.filter(status=CorrectiveAction.Status.RESOLVED).count()
+        # One query: maintained rollup rows, or one conditional aggregate
+        counts = admin_totals(use_rollups=settings.DASHBOARD_USE_ROLLUPS)
 
+        recent_inspections = Inspection.objects.select_related("school").order_by("-date")[:5]
         recent_actions = CorrectiveAction.objects.select_related(
             "inspection_item__inspection__school",
+            "inspection_item__checklist_item",
             "assigned_to"
         ).order_by("-created_at")[:5]
 
         context.update({
-            "total_schools": total_schools,
-            "total_users": total_users,
-            "total_inspections": total_inspections,
-            "recent_inspections": recent_inspections,
-            "total_actions": total_actions,
-            "open_actions": open_actions,
-            "in_progress_actions": in_progress_actions,
-            "resolved_actions": resolved_actions,
-            "recent_actions": recent_actions,
+            "total_schools": counts["total_schools"],
+            "total_users": counts["total_users"],
+            "total_inspections": counts["total_inspections"],
+            "recent_inspections": list(recent_inspections),
+            "total_actions": counts["total_actions"],
+            "open_actions": counts[CorrectiveAction.Status.OPEN],
+            "in_progress_actions": counts[CorrectiveAction.Status.IN_PROGRESS],
+            "resolved_actions": counts[CorrectiveAction.Status.RESOLVED],
+            "recent_actions": list(recent_actions),
         })
 
         template = "users/admin_dashboard.html"
@@ -68,25 +78,25 @@ def dashboard(request):
         # CORRECT school relationship
         manager_schools = user.managed_schools.all()
 
-        recent_inspections = Inspection.objects.filter(
-            school__in=manager_schools
+        recent_inspections = Inspection.objects.visible_to(user).select_related(
+            "school"
         ).order_by("-date")[:5]
 
-        actions_requiring_oversight = CorrectiveAction.objects.filter(
-            inspection_item__inspection__school__in=manager_schools,
+        actions_requiring_oversight = CorrectiveAction.objects.visible_to(user).filter(
             status__in=[
                 CorrectiveAction.Status.OPEN,
                 CorrectiveAction.Status.IN_PROGRESS
             ]
         ).select_related(
             "inspection_item__inspection__school",
+            "inspection_item__checklist_item",
             "assigned_to"
-        )
+        ).order_by("-created_at")
 
         context.update({
-            "schools": manager_schools,
-            "recent_inspections": recent_inspections,
-            "actions_requiring_oversight": actions_requiring_oversight,
+            "schools": list(manager_schools),
+            "recent_inspections": list(recent_inspections),
+            "actions_requiring_oversight": list(actions_requiring_oversight[:DASHBOARD_LIST_LIMIT]),
             "action_count": actions_requiring_oversight.count(),
         })
 
@@ -99,22 +109,21 @@ def dashboard(request):
         assigned_schools = user.inspection_schools.all()
 
         # Inspections this inspector has performed
-        recent_inspections = Inspection.objects.filter(
-            inspector=user
+        recent_inspections = Inspection.objects.visible_to(user).select_related(
+            "school"
         ).order_by("-date")[:5]
 
         # Corrective actions created by inspections this inspector performed
-        actions_created = CorrectiveAction.objects.filter(
-            inspection_item__inspection__inspector=user
-        ).select_related(
+        actions_created = CorrectiveAction.objects.visible_to(user).select_related(
             "inspection_item__inspection__school",
+            "inspection_item__checklist_item",
             "assigned_to"
         ).order_by("-created_at")
 
         context.update({
-            "assigned_schools": assigned_schools,
-            "recent_inspections": recent_inspections,
-            "actions_created": actions_created,
+            "assigned_schools": list(assigned_schools),
+            "recent_inspections": list(recent_inspections),
+            "actions_created": list(actions_created[:DASHBOARD_LIST_LIMIT]),
             "action_count": actions_created.count(),
         })
 
@@ -127,25 +136,23 @@ def dashboard(request):
         kitchen_schools = user.kitchen_schools.all()
 
         # Inspections for those schools
-        recent_inspections = Inspection.objects.filter(
-            school__in=kitchen_schools
+        recent_inspections = Inspection.objects.visible_to(user).select_related(
+            "school"
         ).order_by("-date")[:5]
 
         # Strict corrective action filtering: ONLY actions tied to their schools
-        actions = CorrectiveAction.objects.filter(
-            inspection_item__inspection__school__in=kitchen_schools
-        ).select_related(
+        actions = CorrectiveAction.objects.visible_to(user).select_related(
             "inspection_item__inspection__school",
             "inspection_item__checklist_item"
-        ).distinct()
+        ).order_by("-created_at")
 
         context.update({
-            "schools": kitchen_schools,
-            "recent_inspections": recent_inspections,
-            "actions": actions,
+            "schools": list(kitchen_schools),
+            "recent_inspections": list(recent_inspections),
+            "actions": list(actions[:DASHBOARD_LIST_LIMIT]),
             "action_count": actions.count(),
         })
 
         template = "users/kitchen_dashboard.html"
 
-    return render(request, template, context)
+    return template, context
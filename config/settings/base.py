@@ -26,9 +26,11 @@ INSTALLED_APPS = [
     'apps.schools',
     'apps.inspections',
     'apps.checklists',
+    'apps.search',
 ]
 
 MIDDLEWARE = [
+    'apps.core.middleware.RequestProfilingMiddleware',  # no-op unless REQUEST_PROFILING
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -60,6 +62,18 @@ WSGI_APPLICATION = 'config.wsgi.application'
 
 DATABASES = {}
 
+# Local memory by default; point CACHE_URL at Redis/Memcached in production
+# so every worker shares dashboard entries and invalidations
+CACHES = {
+    'default': env.cache('CACHE_URL', default='locmemcache://'),
+}
+
+# Seconds a role dashboard stays cached (signals invalidate it sooner)
+DASHBOARD_CACHE_TIMEOUT = env.int('DASHBOARD_CACHE_TIMEOUT', default=300)
+
+# Seconds a filtered list's row count is reused (apps.core.pagination)
+COUNT_CACHE_TIMEOUT = env.int('COUNT_CACHE_TIMEOUT', default=60)
+
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
     {'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator'},
@@ -84,6 +98,14 @@ LOGIN_REDIRECT_URL = '/users/dashboard/'
 LOGOUT_REDIRECT_URL = "/accounts/login/"
 LOGIN_URL = "/accounts/login/"
 
+# Loggers write to a queue handler (apps.core.logs); a background thread
+# drains it into the JSON, size-rotated files below. Each logger may emit
+# LOG_RATE_LIMIT records per LOG_RATE_PERIOD seconds, the rest are dropped
+# and counted, so an error storm can't tie up request threads or the disk.
+LOG_DIR = os.path.join(BASE_DIR, "config/logs")
+LOG_MAX_BYTES = env.int("LOG_MAX_BYTES", default=10 * 1024 * 1024)
+LOG_BACKUP_COUNT = env.int("LOG_BACKUP_COUNT", default=5)
+
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
@@ -93,32 +115,85 @@ LOGGING = {
             "format": "[{levelname}] {asctime} | {name} | {message}",
             "style": "{",
         },
+        "json": {
+            "()": "apps.core.logs.JSONFormatter",
+        },
+    },
+
+    "filters": {
+        "rate_limit": {
+            "()": "apps.core.logs.RateLimitFilter",
+            "rate": env.int("LOG_RATE_LIMIT", default=50),
+            "period": env.float("LOG_RATE_PERIOD", default=10.0),
+        },
     },
 
     "handlers": {
+        # Written to by the listener threads only
         "error_file": {
             "level": "ERROR",
-            "class": "logging.FileHandler",
-            "filename": os.path.join(BASE_DIR, "config/logs", "errors.log"),
-            "formatter": "verbose",
+            "class": "logging.handlers.RotatingFileHandler",
+            "filename": os.path.join(LOG_DIR, "errors.log"),
+            "maxBytes": LOG_MAX_BYTES,
+            "backupCount": LOG_BACKUP_COUNT,
+            "formatter": "json",
+            "delay": True,
+        },
+        "profiling_file": {
+            "level": "WARNING",
+            "class": "logging.handlers.RotatingFileHandler",
+            "filename": os.path.join(LOG_DIR, "slow_requests.log"),
+            "maxBytes": LOG_MAX_BYTES,
+            "backupCount": LOG_BACKUP_COUNT,
+            "formatter": "json",
+            "delay": True,
         },
         "console": {
             "level": "ERROR",
             "class": "logging.StreamHandler",
             "formatter": "verbose",
         },
+
+        # Attached to loggers
+        "queue_errors": {
+            "()": "apps.core.logs.QueueListenerHandler",
+            "handlers": ["error_file", "console"],
+            "filters": ["rate_limit"],
+        },
+        "queue_profiling": {
+            "()": "apps.core.logs.QueueListenerHandler",
+            "handlers": ["profiling_file"],
+            "filters": ["rate_limit"],
+        },
     },
 
     "loggers": {
         "django.request": {        # logs 500 errors automatically
-            "handlers": ["error_file", "console"],
+            "handlers": ["queue_errors"],
             "level": "ERROR",
             "propagate": False,
         },
         "core.errors": {           # custom logger
-            "handlers": ["error_file", "console"],
+            "handlers": ["queue_errors"],
             "level": "ERROR",
             "propagate": False,
-        }
+        },
+        "core.profiling": {        # slow requests from RequestProfilingMiddleware
+            "handlers": ["queue_profiling"],
+            "level": "WARNING",
+            "propagate": False,
+        },
     },
-}
\ No newline at end of file
+}
+
+# Read admin dashboard status counts from the StatusRollup table instead of
+# aggregating Inspection / CorrectiveAction (run rebuild_status_rollups first)
+DASHBOARD_USE_ROLLUPS = env.bool("DASHBOARD_USE_ROLLUPS", default=False)
+
+# Per-request SQL / template timing (apps.core.middleware). Off by default;
+# when on, SAMPLE_RATE of requests get a Server-Timing header and those
+# slower than SLOW_MS are written to config/logs/slow_requests.log
+REQUEST_PROFILING = env.bool("REQUEST_PROFILING", default=False)
+REQUEST_PROFILING_SAMPLE_RATE = env.float("REQUEST_PROFILING_SAMPLE_RATE", default=0.01)
+REQUEST_PROFILING_SLOW_MS = env.int("REQUEST_PROFILING_SLOW_MS", default=500)
+REQUEST_PROFILING_DUPLICATE_THRESHOLD = env.int("REQUEST_PROFILING_DUPLICATE_THRESHOLD", default=3)
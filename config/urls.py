@@ -25,6 +25,7 @@ urlpatterns = [
     path("users/", include("apps.users.urls")),
     path("inspections/", include("apps.inspections.urls")),
     path("schools/", include("apps.schools.urls")),
+    path("search/", include("apps.search.urls")),
     # path("checklists/", include("apps.checklists.urls")),
 ]
 
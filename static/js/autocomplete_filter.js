@@ -0,0 +1,16 @@
+'use strict';
+// Changelist AutocompleteFilter: picking (or clearing) a value reloads the
+// changelist with the filter's lookup set.
+{
+    const $ = django.jQuery;
+
+    $(document).on('change', 'select[data-filter-url]', function() {
+        const url = this.dataset.filterUrl;
+        if (!this.value) {
+            window.location.search = url;
+            return;
+        }
+        const param = encodeURIComponent(this.name) + '=' + encodeURIComponent(this.value);
+        window.location.search = url === '?' ? '?' + param : url + '&' + param;
+    });
+}